@@ -1,92 +1,1003 @@
 # plug_and_play.py – Neural AI Plug-and-Play Control Hub
 # By ObeyX for Super_OS – سلاح ذكاء صناعي مطلق
 
+import ast
+import hashlib
 import importlib
+import importlib.util
 import traceback
 import os
 import json
 import threading
 import time
 import timeit
+import types
 import psutil
-from collections import defaultdict, deque
+import sys
+import tempfile
+import atexit
+import multiprocessing
+from multiprocessing import shared_memory
+from array import array
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# ⚙️ إعدادات كاش النتائج (اختياري لكل action - الافتراضي عدم التخزين)
+MEMO_MAX_ENTRIES_PER_MODULE = 256  # حد عناصر الكاش لكل موديل
+DEFAULT_MEMO_TTL = 60  # صلاحية النتائج لسياسة ttl (ثواني)
+CACHE_POLICIES = ("pure", "ttl", "never")
+
+# ⚙️ إعدادات تحميل الإضافات
+PLUGIN_LOAD_WORKERS = 8  # عدد الإضافات التي تُحمّل بالتوازي
+PLUGIN_INDEX_PATH = "plugin_index.json"  # فهرس الإضافات المحفوظ بين التشغيلات
+PLUGIN_INDEX_VERSION = 1
+PLUGIN_STARTUP_MODE = "lazy"  # lazy: لا تُنفذ أي إضافة قبل أول استخدام | eager: تحميل كل الإضافات غير المؤجلة
+
+# ⚙️ إعدادات التنفيذ المعزول للـ actions الثقيلة (cpu_bound)
+PROCESS_POOL_SIZE = max(1, (os.cpu_count() or 2) - 1)  # عدد العمليات العاملة
+PROCESS_MAX_TASKS_PER_WORKER = 200  # إعادة تدوير العملية بعد هذا العدد من المهام
+CPU_ACTION_TIMEOUT = 30  # المهلة الافتراضية لكل استدعاء (ثواني)
+SHARED_MEMORY_THRESHOLD = 64 * 1024  # البايتات/مصفوفات NumPy الأكبر من هذا تُمرر عبر ذاكرة مشتركة
+
+# ⚙️ التتبع والطباعة
+VERBOSE = False  # طباعة سطر لكل استدعاء (مكلفة تحت الحمل) - الأخطاء تُطبع دائماً
+TRACING_ENABLED = True  # تسجيل زمن وحالة كل استدعاء في الهيستوغرامات ومخزن الـ spans
+TRACE_SPAN_BUFFER = 4096  # عدد آخر الـ spans المحفوظة في الذاكرة
+
+# ⚙️ حدود معدل الاستدعاء (token bucket): (معدل التعبئة بالثانية، السعة القصوى للدفعة)
+ACTION_RATE_LIMIT = (5.0, 10)  # لكل module.action
+MODULE_RATE_LIMIT = (50.0, 100)  # لكل موديل (مجموع كل الـ actions)
+RATE_LIMIT_MAX_KEYS = 4096  # أقصى عدد دلاء/عدادات محفوظة - الأقدم استخداماً يُحذف أولاً
+RATE_LIMITS = {}  # تخصيص: {"module.action": (rate, burst), "module": (rate, burst)} - None = بدون حد
 
 # 🔥 قاعدة بيانات الذاكرة العصبية الفورية
 neural_registry = {}
-neural_cache = {}  # كاش داخلي للنتائج المتكررة
+neural_cache = {}  # كاش النتائج: اسم الموديل -> ActionMemo
 neural_activity_log = defaultdict(list)  # سجل النشاط العصبي
 
 # ⏱️ سجل التوقيتات والتنفيذ
 execution_times = {}
+memo_stats = defaultdict(lambda: {"hits": 0, "misses": 0})  # "module.action" -> إصابات/إخفاقات الكاش
+memo_stats_lock = threading.Lock()  # الـ actions تُنفَّذ من خيوط العمال
+plugin_manifest = {}  # اسم الإضافة -> {path, mtime, size, hash, actions, heartbeat, depends, lazy}
+plugin_load_times = {}  # اسم الإضافة -> {status, load_time, error}
+
+def _log(message):
+    if VERBOSE:
+        print(message)
+
+
+# 📈 التتبع: هيستوغرام زمن لكل action (بأسلوب HDR) + عدادات الحالة + مخزن spans حديث
+class LatencyHistogram:
+    """
+    هيستوغرام log-linear بالميكروثانية: خطي حتى 64µs ثم 32 قسماً لكل ضعف (دقة ~3%).
+    عدد الخانات ثابت، لذا التسجيل O(1) ودمج هيستوغرامين مجرد جمع للخانات.
+    """
+    LINEAR = 64
+    SUB_BUCKETS = 32
+    SIZE = LINEAR + SUB_BUCKETS * 28  # حتى 2^33 µs (أكثر من ساعتين)
+
+    def __init__(self):
+        self.counts = array("Q", bytes(8 * self.SIZE))
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+
+    @classmethod
+    def index_of(cls, micros):
+        if micros < cls.LINEAR:
+            return micros
+        shift = micros.bit_length() - 6
+        return min(cls.LINEAR + (shift - 1) * cls.SUB_BUCKETS + (micros >> shift) - cls.SUB_BUCKETS, cls.SIZE - 1)
+
+    @classmethod
+    def upper_bound(cls, index):
+        """أعلى قيمة (بالثواني) تقع في الخانة"""
+        if index < cls.LINEAR:
+            return (index + 1) / 1e6
+        shift, sub = divmod(index - cls.LINEAR, cls.SUB_BUCKETS)
+        return ((sub + cls.SUB_BUCKETS + 1) << (shift + 1)) / 1e6
+
+    def record(self, seconds):
+        self.counts[self.index_of(int(seconds * 1e6))] += 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other):
+        for index, value in enumerate(other.counts):
+            if value:
+                self.counts[index] += value
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+        return self
+
+    def percentile(self, p):
+        if not self.count:
+            return 0.0
+        target = max(1, int(round(p / 100 * self.count)))
+        seen = 0
+        for index, value in enumerate(self.counts):
+            seen += value
+            if seen >= target:
+                return min(self.upper_bound(index), self.max)
+        return self.max
+
+    def cumulative(self, bounds):
+        """عدد القيم <= كل حد (لتصدير Prometheus)"""
+        result, seen, index = [], 0, 0
+        for bound in bounds:
+            while index < self.SIZE and self.upper_bound(index) <= bound:
+                seen += self.counts[index]
+                index += 1
+            result.append(seen)
+        return result
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 4) if self.count else 0.0,
+            "min_ms": round((self.min or 0.0) * 1000, 4),
+            "p50_ms": round(self.percentile(50) * 1000, 4),
+            "p90_ms": round(self.percentile(90) * 1000, 4),
+            "p99_ms": round(self.percentile(99) * 1000, 4),
+            "max_ms": round(self.max * 1000, 4)
+        }
+
+
+class ActionTracer:
+    """الحالات: ok | error | cached | throttled | not_found - الزمن يُسجل للاستدعاءات المنفذة فقط"""
+
+    PROMETHEUS_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+    def __init__(self, span_buffer=TRACE_SPAN_BUFFER):
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.counts = defaultdict(lambda: defaultdict(int))
+        self.spans = deque(maxlen=span_buffer)  # (بداية، المدة، الموديل، الـ action، الحالة، نمط التنفيذ)
+
+    def record(self, module_name, action, duration, status, mode="inline"):
+        key = (module_name, action)
+        with self.lock:
+            self.counts[key][status] += 1
+            if status in ("ok", "error"):
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    histogram = self.histograms[key] = LatencyHistogram()
+                histogram.record(duration)
+            self.spans.append((time.time() - duration, duration, module_name, action, status, mode))
+
+    def stats(self, module_name=None):
+        with self.lock:
+            result = {}
+            for key, counts in self.counts.items():
+                if module_name is not None and key[0] != module_name:
+                    continue
+                histogram = self.histograms.get(key)
+                result[f"{key[0]}.{key[1]}"] = {
+                    "calls": sum(counts.values()),
+                    "errors": counts.get("error", 0),
+                    "statuses": dict(counts),
+                    "latency": histogram.summary() if histogram else None
+                }
+            return result
+
+    def merged_histogram(self, module_name=None):
+        merged = LatencyHistogram()
+        with self.lock:
+            for key, histogram in self.histograms.items():
+                if module_name is None or key[0] == module_name:
+                    merged.merge(histogram)
+        return merged
+
+    def recent_spans(self, limit=100, module_name=None, status=None):
+        with self.lock:
+            spans = list(self.spans)
+        rows = [{"start": start, "duration_ms": round(duration * 1000, 4), "module": module, "action": action,
+                 "status": span_status, "mode": mode}
+                for start, duration, module, action, span_status, mode in spans
+                if (module_name is None or module == module_name) and (status is None or span_status == status)]
+        return rows[-limit:]
+
+    def export_json(self, spans=100):
+        return json.dumps({"actions": self.stats(), "spans": self.recent_spans(spans)}, ensure_ascii=False)
+
+    def export_prometheus(self):
+        def labels(module, action, **extra):
+            pairs = {"module": module, "action": action, **extra}
+            escaped = (f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34)).replace(chr(10), chr(92) + "n")}"'
+                       for k, v in pairs.items())
+            return "{" + ",".join(escaped) + "}"
+
+        lines = ["# HELP obeyx_plugin_action_calls_total Plugin action calls by status",
+                 "# TYPE obeyx_plugin_action_calls_total counter"]
+        with self.lock:
+            counts = {key: dict(value) for key, value in self.counts.items()}
+            histograms = dict(self.histograms)
+            for (module, action), statuses in sorted(counts.items()):
+                for status, value in sorted(statuses.items()):
+                    lines.append(f"obeyx_plugin_action_calls_total{labels(module, action, status=status)} {value}")
+            lines += ["# HELP obeyx_plugin_action_latency_seconds Plugin action execution time",
+                      "# TYPE obeyx_plugin_action_latency_seconds histogram"]
+            for (module, action), histogram in sorted(histograms.items()):
+                for bound, value in zip(self.PROMETHEUS_BUCKETS, histogram.cumulative(self.PROMETHEUS_BUCKETS)):
+                    lines.append(f"obeyx_plugin_action_latency_seconds_bucket{labels(module, action, le=bound)} {value}")
+                lines.append(f"obeyx_plugin_action_latency_seconds_bucket{labels(module, action, le='+Inf')} {histogram.count}")
+                lines.append(f"obeyx_plugin_action_latency_seconds_sum{labels(module, action)} {histogram.total}")
+                lines.append(f"obeyx_plugin_action_latency_seconds_count{labels(module, action)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+            self.counts.clear()
+            self.spans.clear()
+
+
+tracer = ActionTracer()
+resource_stats = {}  # آخر قراءة للموارد من neural_heartbeat
+
+
+def get_trace_stats(module_name=None):
+    """عدد الاستدعاءات والأخطاء ونسب الزمن (p50/p90/p99) لكل action"""
+    return tracer.stats(module_name)
+
+
+def export_traces(fmt="json"):
+    """تصدير التتبع: json (إحصائيات + آخر spans) أو prometheus (نص بصيغة exposition)"""
+    return tracer.export_prometheus() if fmt == "prometheus" else tracer.export_json()
+
+
+# 🛑 الحماية ضد التكرار الزائد (anti-spam): دلو رموز لكل action ولكل موديل
+class TokenBucket:
+    """السعة تسمح بدفعة قصيرة، والمعدل يحدد الاستدعاءات المستمرة - الفحص O(1)"""
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate, capacity, now):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
 
-# 🛑 سجل الحماية ضد التكرار الزائد (anti-spam)
-action_history = defaultdict(lambda: deque(maxlen=10))  # سجل آخر 10 مرات لكل موديل
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class RateLimiter:
+    def __init__(self, clock=time.monotonic, max_keys=RATE_LIMIT_MAX_KEYS):
+        self.clock = clock
+        self.max_keys = max_keys
+        self.buckets = OrderedDict()  # LRU: الأسماء القادمة من الخارج لا تنمي الذاكرة بلا حد
+        self.lock = threading.Lock()
+        self.metrics = OrderedDict()
+
+    def _limit(self, key, module, declared_name, default):
+        if key in RATE_LIMITS:
+            return RATE_LIMITS[key]
+        declared = getattr(module, "ACTION_RATE_LIMITS", {}).get(declared_name) if declared_name else None
+        return declared if declared is not None else default
+
+    def _touch(self, table, key, factory):
+        entry = table.get(key)
+        if entry is None:
+            entry = table[key] = factory()
+            if len(table) > self.max_keys:
+                table.popitem(last=False)
+        else:
+            table.move_to_end(key)
+        return entry
+
+    def _bucket(self, key, limit, now):
+        bucket = self._touch(self.buckets, key, lambda: TokenBucket(limit[0], limit[1], now))
+        if (bucket.rate, bucket.capacity) != tuple(limit):
+            bucket = self.buckets[key] = TokenBucket(limit[0], limit[1], now)
+        bucket.refill(now)
+        return bucket
+
+    def allow(self, module_name, action, module=None):
+        """استهلاك رمز من دلو الـ action ودلو الموديل معاً، أو رفض الاستدعاء دون استهلاك أي منهما"""
+        action_key = f"{module_name}.{action}"
+        action_limit = self._limit(action_key, module, action, ACTION_RATE_LIMIT)
+        module_limit = self._limit(module_name, module, None, MODULE_RATE_LIMIT)
+        with self.lock:
+            now = self.clock()
+            buckets = [self._bucket(key, limit, now)
+                       for key, limit in ((action_key, action_limit), (module_name, module_limit)) if limit]
+            metrics = self._touch(self.metrics, action_key,
+                                  lambda: {"allowed": 0, "throttled": 0, "last_throttled": None})
+            if any(bucket.tokens < 1 for bucket in buckets):
+                metrics["throttled"] += 1
+                metrics["last_throttled"] = time.time()
+                return False
+            for bucket in buckets:
+                bucket.tokens -= 1
+            metrics["allowed"] += 1
+            return True
+
+    def stats(self):
+        with self.lock:
+            return {key: dict(value, throttle_rate=round(value["throttled"] / (value["allowed"] + value["throttled"]), 4))
+                    for key, value in self.metrics.items()}
+
+    def reset(self):
+        with self.lock:
+            self.buckets.clear()
+            self.metrics.clear()
+
+
+rate_limiter = RateLimiter()
+
+
+def get_rate_limit_stats():
+    """عدد الاستدعاءات المسموحة والمرفوضة لكل action"""
+    return rate_limiter.stats()
 
 # 🚨 سجل الأخطاء المتكررة
 error_count = defaultdict(int)
 
 
+# 🧊 كاش النتائج الاختياري
+# الموديل يعلن سياسة كل action إما بقاموس على مستوى الملف:
+#     ACTION_CACHE = {"translate": "pure", "weather": ("ttl", 300), "play": "never"}
+# أو كخاصية على الدالة نفسها (أو بالـ decorator أدناه):
+#     translate.cache_policy = "pure"
+# pure: نفس المدخلات تعطي نفس النتيجة دائماً | ttl: صالحة لفترة محددة | never: بدون تخزين
+def cache_policy(policy, ttl=None):
+    if policy not in CACHE_POLICIES:
+        raise ValueError(f"Unknown cache policy: {policy}")
+
+    def decorator(func):
+        func.cache_policy = policy
+        if ttl is not None:
+            func.cache_ttl = ttl
+        return func
+    return decorator
+
+
+def resolve_cache_policy(module, action, func):
+    """إرجاع (السياسة، مدة الصلاحية) للـ action - never إذا لم يعلن الموديل شيئاً"""
+    declared = getattr(func, "cache_policy", None)
+    ttl = getattr(func, "cache_ttl", None)
+    if declared is None:
+        declared = getattr(module, "ACTION_CACHE", {}).get(action, "never")
+    if isinstance(declared, (tuple, list)):
+        declared, ttl = declared
+    elif isinstance(declared, (int, float)) and not isinstance(declared, bool):
+        declared, ttl = "ttl", declared
+    if declared not in CACHE_POLICIES:
+        return "never", None
+    if declared == "ttl":
+        return "ttl", DEFAULT_MEMO_TTL if ttl is None else ttl
+    return declared, None
+
+
+class ActionMemo:
+    """كاش LRU محدود لنتائج موديل واحد (آمن للخيوط)"""
+
+    _MISSING = object()
+
+    def __init__(self, max_entries=MEMO_MAX_ENTRIES_PER_MODULE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (result, expires_at أو None)
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return self._MISSING
+            result, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self.entries[key]
+                return self._MISSING
+            self.entries.move_to_end(key)
+            return result
+
+    def put(self, key, result, ttl=None):
+        with self.lock:
+            self.entries[key] = (result, None if ttl is None else time.monotonic() + ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+# 🧮 تنفيذ الـ actions الثقيلة في عمليات منفصلة
+# الـ action يعلن أنه cpu_bound إما في قاموس على مستوى الملف:
+#     ACTION_EXECUTION = {"transcode": "cpu_bound", "resize": ("cpu_bound", 120)}
+# أو بالـ decorator: @cpu_bound(timeout=120)
+# التنفيذ في عملية أخرى: لا يشارك حالة الموديل في العملية الرئيسية
+def cpu_bound(func=None, timeout=None):
+    def decorator(f):
+        f.cpu_bound = True
+        if timeout is not None:
+            f.cpu_timeout = timeout
+        return f
+    return decorator(func) if func is not None else decorator
+
+
+def resolve_execution_mode(module, action, func):
+    """إرجاع (inline أو cpu_bound، المهلة)"""
+    timeout = getattr(func, "cpu_timeout", None)
+    declared = "cpu_bound" if getattr(func, "cpu_bound", False) else \
+        getattr(module, "ACTION_EXECUTION", {}).get(action, "inline")
+    if isinstance(declared, (tuple, list)):
+        declared, timeout = declared
+    if declared != "cpu_bound" or not getattr(module, "__file__", None):
+        return "inline", None
+    return "cpu_bound", CPU_ACTION_TIMEOUT if timeout is None else timeout
+
+
+class _SharedArg:
+    """وصف وسيط مخزن في ذاكرة مشتركة - العملية العاملة تبني منه view بدون نسخ"""
+    __slots__ = ("name", "size", "dtype", "shape")
+
+    def __init__(self, name, size, dtype=None, shape=None):
+        self.name, self.size, self.dtype, self.shape = name, size, dtype, shape
+
+    def __getstate__(self):
+        return (self.name, self.size, self.dtype, self.shape)
+
+    def __setstate__(self, state):
+        self.name, self.size, self.dtype, self.shape = state
+
+
+def _share_value(value, segments):
+    numpy = sys.modules.get("numpy")  # إذا كانت القيمة مصفوفة NumPy فالمكتبة محملة أصلاً
+    is_array = numpy is not None and isinstance(value, numpy.ndarray) and value.dtype != object
+    if not (is_array or isinstance(value, (bytes, bytearray, memoryview))):
+        return value
+    size = value.nbytes if isinstance(value, memoryview) or is_array else len(value)
+    if size < SHARED_MEMORY_THRESHOLD:
+        return value
+    segment = shared_memory.SharedMemory(create=True, size=size)
+    segments.append(segment)
+    if is_array:
+        numpy.ndarray(value.shape, dtype=value.dtype, buffer=segment.buf)[...] = value
+        return _SharedArg(segment.name, size, value.dtype.str, value.shape)
+    segment.buf[:size] = value.cast("B") if isinstance(value, memoryview) else value
+    return _SharedArg(segment.name, size)
+
+
+def _attach_value(value, segments):
+    if not isinstance(value, _SharedArg):
+        return value
+    segment = shared_memory.SharedMemory(name=value.name)
+    segments.append(segment)
+    if value.dtype is not None:
+        import numpy
+        return numpy.ndarray(value.shape, dtype=numpy.dtype(value.dtype), buffer=segment.buf)
+    return segment.buf[:value.size]  # memoryview بدون نسخ
+
+
+def _process_worker_main(conn):
+    """حلقة العملية العاملة: تحميل الإضافة من مسارها (مع إعادة التحميل عند تغير الملف) ثم التنفيذ"""
+    modules = {}
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if task is None:
+            return
+        path, module_name, action, args, kwargs = task
+        segments = []
+        try:
+            mtime = os.stat(path).st_mtime
+            cached = modules.get(path)
+            if cached is None or cached[0] != mtime:
+                spec = importlib.util.spec_from_file_location(module_name, path)
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                modules[path] = cached = (mtime, module)
+            args = tuple(_attach_value(a, segments) for a in args)
+            kwargs = {k: _attach_value(v, segments) for k, v in kwargs.items()}
+            reply = ("ok", getattr(cached[1], action)(*args, **kwargs))
+        except BaseException as e:
+            reply = ("error", f"{type(e).__name__}: {e}", traceback.format_exc())
+        finally:
+            args = kwargs = None
+        try:
+            conn.send(reply)  # الإرسال ينسخ النتيجة، فلا حاجة بعده لأي view على الذاكرة المشتركة
+        except Exception as e:  # نتيجة غير قابلة للتسلسل
+            conn.send(("error", f"Unpicklable result from {module_name}.{action}: {e}", ""))
+        finally:
+            reply = None
+        for segment in segments:
+            try:
+                segment.close()
+            except BufferError:
+                # الإضافة احتفظت بمرجع للوسيط: يبقى الربط حتى إعادة تدوير العملية (المقطع نفسه يحذفه الأب)
+                print(f"[⚠️] {module_name}.{action} kept a reference to shared memory {segment.name}")
+
+
+class _ProcessWorker:
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_process_worker_main, args=(child_conn,), daemon=True,
+                                   name="plugin-cpu-worker")
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def close(self, timeout=1.0):
+        try:
+            self.conn.send(None)
+        except (OSError, BrokenPipeError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class PluginProcessPool:
+    """
+    مجموعة عمليات (spawn) لتنفيذ الـ actions الثقيلة خارج GIL العملية الرئيسية.
+    كل عملية تخدم استدعاءً واحداً في كل مرة؛ عند تجاوز المهلة أو انهيار العملية
+    تُستبدل بعملية جديدة، وتُعاد تدوير العمليات بعد عدد محدد من المهام.
+    """
+
+    def __init__(self, size=None, max_tasks_per_worker=None):
+        self.size = size or PROCESS_POOL_SIZE
+        self.max_tasks_per_worker = max_tasks_per_worker or PROCESS_MAX_TASKS_PER_WORKER
+        self._ctx = multiprocessing.get_context("spawn")
+        self._slots = threading.BoundedSemaphore(self.size)  # استدعاء واحد لكل عملية
+        self._idle = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = defaultdict(int)
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def _acquire(self, timeout=None):
+        # انتظار عملية متاحة جزء من مهلة الاستدعاء
+        if not self._slots.acquire(timeout=timeout):
+            self._count("queue_timeouts")
+            raise TimeoutError(f"No plugin worker process became free within {timeout}s")
+        with self._lock:
+            if self._closed:
+                self._slots.release()
+                raise RuntimeError("Plugin process pool is shut down")
+            if self._idle:
+                return self._idle.pop()
+            self.stats["spawned"] += 1
+        try:
+            return _ProcessWorker(self._ctx)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _release(self, worker, healthy):
+        if healthy and worker.tasks >= self.max_tasks_per_worker:
+            self._count("recycled")
+            healthy = False
+        if healthy:
+            with self._lock:
+                healthy = not self._closed
+                if healthy:
+                    self._idle.append(worker)
+        if not healthy:
+            worker.close(timeout=0.2)  # العملية التالية تُنشأ عند الحاجة
+        self._slots.release()
+
+    def run(self, path, module_name, action, args=(), kwargs=None, timeout=None):
+        timeout = CPU_ACTION_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        segments = []
+        worker = self._acquire(timeout)
+        healthy = False
+        try:
+            args = tuple(_share_value(a, segments) for a in args)
+            kwargs = {k: _share_value(v, segments) for k, v in (kwargs or {}).items()}
+            self._count("shared_segments", len(segments))
+            worker.conn.send((path, module_name, action, args, kwargs))
+            if not worker.conn.poll(None if deadline is None else max(0.0, deadline - time.monotonic())):
+                self._count("timeouts")
+                raise TimeoutError(f"{module_name}.{action} exceeded {timeout}s in worker process")
+            try:
+                reply = worker.conn.recv()
+            except EOFError:
+                self._count("crashes")
+                raise RuntimeError(f"Worker process crashed while running {module_name}.{action}") from None
+            worker.tasks += 1
+            healthy = True
+            self._count("tasks")
+            if reply[0] == "error":
+                self._count("errors")
+                raise RuntimeError(f"{module_name}.{action} failed in worker process: {reply[1]}")
+            return reply[1]
+        finally:
+            self._release(worker, healthy)
+            for segment in segments:
+                try:
+                    segment.close()
+                except BufferError:
+                    pass
+                finally:
+                    segment.unlink()
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.close()
+
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+
+def get_process_pool():
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = PluginProcessPool()
+            atexit.register(_process_pool.shutdown)
+        return _process_pool
+
+
+def _typed(value):
+    """يرفق نوع القيمة بها حتى لا تتشارك 1 و True و 1.0 نفس المدخل (تساويها في == و hash)"""
+    if type(value) is tuple:
+        return ("tuple", tuple(_typed(item) for item in value))
+    if type(value) is frozenset:
+        return ("frozenset", frozenset(_typed(item) for item in value))
+    return (type(value).__qualname__, value)
+
+
+def _memo_key(action, args, kwargs):
+    """مفتاح قابل للـ hash أو None إذا كانت المدخلات غير قابلة للتخزين (قوائم، قواميس...)"""
+    key = (action, _typed(args), tuple((name, _typed(value)) for name, value in sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def invalidate_module_cache(module_name):
+    """حذف كل النتائج المخزنة لموديل (تُستدعى تلقائياً عند إعادة تحميله)"""
+    neural_cache.pop(module_name, None)
+
+
+def _count_memo(name, outcome):
+    with memo_stats_lock:
+        memo_stats[name][outcome] += 1
+
+
+def get_action_stats():
+    """زمن آخر تنفيذ ومعدل إصابة الكاش لكل action"""
+    with memo_stats_lock:
+        memo = {name: dict(counts) for name, counts in memo_stats.items()}
+    stats = {}
+    for name in set(execution_times) | set(memo):
+        hits = memo[name]["hits"] if name in memo else 0
+        misses = memo[name]["misses"] if name in memo else 0
+        stats[name] = {
+            "last_execution_time": execution_times.get(name),
+            "cache_hits": hits,
+            "cache_misses": misses,
+            "cache_hit_rate": round(hits / (hits + misses), 4) if hits + misses else None
+        }
+    return stats
+
+
 # ⚡ مراكز تحميل الأعصاب (المكونات الذكية)
-def load_module(module_path, alias=None):
+def load_module(module_path, alias=None, quiet=False):
+    name = alias or os.path.basename(module_path).replace(".py", "")
+    load_start = timeit.default_timer()  # بداية قياس زمن التحميل
     try:
-        name = alias or os.path.basename(module_path).replace(".py", "")
-        load_start = timeit.default_timer()  # بداية قياس زمن التحميل
         spec = importlib.util.spec_from_file_location(name, module_path)
         module = importlib.util.module_from_spec(spec)
         spec.loader.exec_module(module)
         neural_registry[name] = module
+        invalidate_module_cache(name)  # النتائج القديمة قد لا تطابق الكود الجديد
         load_end = timeit.default_timer()
-        print(f"[✅] Loaded: {name}")
-        print(f"[📦] Module {name} loaded in {load_end - load_start:.3f} seconds")
+        plugin_load_times[name] = {"status": "loaded", "load_time": load_end - load_start, "error": None}
+        if not quiet:
+            print(f"[✅] Loaded: {name}")
+            print(f"[📦] Module {name} loaded in {load_end - load_start:.3f} seconds")
+        return module
     except Exception as e:
+        plugin_load_times[name] = {"status": "failed", "load_time": timeit.default_timer() - load_start,
+                                   "error": str(e)}
         print(f"[❌] Failed loading {module_path}: {e}")
-        traceback.print_exc()
+        if not quiet:
+            traceback.print_exc()
+        return None
 
 
-# 🔌 تحميل جميع الوحدات الإضافية تلقائيًا
-def auto_load_plugins(plugins_dir):
+# 💤 إضافة مؤجلة: تُسجل باسمها ولا تُنفذ حتى أول استخدام فعلي
+class LazyPlugin(types.ModuleType):
+    def __init__(self, name, path, actions=(), heartbeat=False):
+        super().__init__(name)
+        self.__dict__["_plugin_path"] = path
+        self.__dict__["_plugin_actions"] = list(actions)  # من الفهرس - بدون تنفيذ الملف
+        self.__dict__["_plugin_heartbeat"] = heartbeat
+        self.__dict__["_load_lock"] = threading.RLock()
+        self.__dict__["_loading"] = False
+
+    def load(self):
+        with self._load_lock:
+            module = neural_registry.get(self.__name__)
+            if (module is None or module is self) and not self._loading:
+                # التبعيات المؤجلة تُحمّل أولاً (العلامة تمنع الدوران في حال وجود حلقة)
+                self.__dict__["_loading"] = True
+                try:
+                    for dep in plugin_manifest.get(self.__name__, {}).get("depends", []):
+                        dep_module = neural_registry.get(dep)
+                        if isinstance(dep_module, LazyPlugin):
+                            dep_module.load()
+                finally:
+                    self.__dict__["_loading"] = False
+                # مع الحلقات قد تكون إحدى التبعيات قد حمّلت هذه الإضافة أثناء تحميلها
+                module = neural_registry.get(self.__name__)
+            if module is None or module is self:
+                module = load_module(self._plugin_path, alias=self.__name__, quiet=True)
+                if module is None:
+                    raise ImportError(f"Lazy plugin '{self.__name__}' failed to load")
+            return module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __dir__(self):
+        return list(self._plugin_actions)
+
+    def __repr__(self):
+        return f"<lazy plugin '{self.__name__}' from '{self._plugin_path}'>"
+
+
+# 📜 بيان الإضافات: يُقرأ من الملف دون تنفيذه
+# الإضافة تعلن تبعياتها وتأجيلها على مستوى الملف:
+#     PLUGIN_DEPENDS = ["audio_module"]
+#     PLUGIN_LAZY = True
+# والـ actions هي الدوال العامة المعرفة على مستوى الملف
+def _scan_plugin_source(source, path):
+    declarations = {"depends": [], "lazy": False, "actions": [], "heartbeat": False}
+    tree = ast.parse(source, filename=path)
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if node.name == "heartbeat":
+                declarations["heartbeat"] = True
+            elif not node.name.startswith("_"):
+                declarations["actions"].append(node.name)
+        elif isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            target = node.targets[0].id
+            if target in ("PLUGIN_DEPENDS", "PLUGIN_LAZY"):
+                try:
+                    value = ast.literal_eval(node.value)
+                except ValueError:
+                    continue
+                if target == "PLUGIN_DEPENDS":
+                    declarations["depends"] = [value] if isinstance(value, str) else list(value)
+                else:
+                    declarations["lazy"] = bool(value)
+    return declarations
+
+
+def _scan_plugin(path, stat, source=None, digest=None):
+    if source is None:
+        with open(path, "rb") as f:
+            source = f.read()
+    try:
+        declarations = _scan_plugin_source(source, path)
+    except SyntaxError as e:
+        declarations = {"depends": [], "lazy": False, "actions": [], "heartbeat": False}
+        print(f"[⚠️] Could not read declarations of {path}: {e}")
+    return {"name": os.path.basename(path)[:-3], "path": path, "mtime": stat.st_mtime, "size": stat.st_size,
+            "hash": digest or hashlib.blake2b(source, digest_size=16).hexdigest(), **declarations}
+
+
+# 🗂️ فهرس الإضافات المحفوظ: الملف الذي لم يتغير (نفس mtime والحجم، أو نفس المحتوى) لا يُعاد فحصه
+def load_plugin_index(path=PLUGIN_INDEX_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") == PLUGIN_INDEX_VERSION:
+            return data["plugins"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return {}
+
+
+def save_plugin_index(index, path=PLUGIN_INDEX_PATH):
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": PLUGIN_INDEX_VERSION, "plugins": index}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"[⚠️] Could not save plugin index {path}: {e}")
+
+
+def build_plugin_manifest(plugins_dir, index=None):
+    """
+    بناء بيان الإضافات. index: فهرس سابق (حسب المسار) يُعاد استخدامه للملفات التي لم تتغير.
+    يُرجع (البيان حسب الاسم، الفهرس المحدث حسب المسار، عدادات: reused / rehashed / scanned)
+    """
+    index = index or {}
+    manifest, new_index = {}, {}
+    counts = {"reused": 0, "rehashed": 0, "scanned": 0}
     for root, dirs, files in os.walk(plugins_dir):
-        for file in files:
-            if file.endswith(".py") and not file.startswith("__"):
-                load_module(os.path.join(root, file))
+        dirs.sort()
+        for file in sorted(files):
+            if not file.endswith(".py") or file.startswith("__"):
+                continue
+            path = os.path.join(root, file)
+            stat = os.stat(path)
+            entry = index.get(path)
+            if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+                counts["reused"] += 1
+            else:
+                with open(path, "rb") as f:
+                    source = f.read()
+                digest = hashlib.blake2b(source, digest_size=16).hexdigest()
+                if entry and entry["hash"] == digest:
+                    entry = dict(entry, mtime=stat.st_mtime, size=stat.st_size)  # لُمس الملف دون تغيير
+                    counts["rehashed"] += 1
+                else:
+                    entry = _scan_plugin(path, stat, source, digest)
+                    counts["scanned"] += 1
+            name = entry["name"]
+            if name in manifest:
+                print(f"[⚠️] Duplicate plugin name '{name}': {path} overrides {manifest[name]['path']}")
+            manifest[name] = entry
+            new_index[path] = entry
+    return manifest, new_index, counts
+
+
+# 🔌 تحميل جميع الوحدات الإضافية تلقائيًا
+# الإضافات المستقلة تُحمّل بالتوازي، وكل إضافة تنتظر تبعياتها فقط
+# في وضع lazy تُسجل كل الإضافات كبدائل من الفهرس ولا يُنفذ إلا ما يُستدعى فعلاً
+def auto_load_plugins(plugins_dir, workers=PLUGIN_LOAD_WORKERS, startup_mode=None, index_path=PLUGIN_INDEX_PATH):
+    startup_mode = startup_mode or PLUGIN_STARTUP_MODE
+    index = load_plugin_index(index_path) if index_path else {}
+    manifest, new_index, counts = build_plugin_manifest(plugins_dir, index)
+    if index_path and (counts["scanned"] or counts["rehashed"] or set(new_index) != set(index)):
+        save_plugin_index(new_index, index_path)
+    plugin_manifest.update(manifest)
+
+    # الإضافات المؤجلة تُسجل كبديل خفيف دون تنفيذ
+    eager = {}
+    for name, entry in manifest.items():
+        if entry["lazy"] or startup_mode == "lazy":
+            neural_registry[name] = LazyPlugin(name, entry["path"], entry["actions"], entry["heartbeat"])
+            plugin_load_times[name] = {"status": "lazy", "load_time": 0.0, "error": None}
+        else:
+            eager[name] = entry
+
+    # التبعيات على إضافات مؤجلة أو محملة مسبقاً تعتبر محققة
+    pending = {}
+    for name, entry in eager.items():
+        missing = [dep for dep in entry["depends"] if dep not in manifest and dep not in neural_registry]
+        if missing:
+            plugin_load_times[name] = {"status": "failed", "load_time": 0.0,
+                                       "error": f"missing dependencies: {', '.join(missing)}"}
+            continue
+        pending[name] = {dep for dep in entry["depends"] if dep in eager}
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="plugin-loader") as pool:
+        running = {}
+        while pending or running:
+            for name in [n for n, deps in pending.items() if not deps]:
+                del pending[name]
+                running[pool.submit(load_module, eager[name]["path"], name, True)] = name
+            if not running:
+                break  # الباقي ينتظر تبعيات لن تكتمل (فشل أو حلقة)
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                if future.result() is None:
+                    continue
+                for deps in pending.values():
+                    deps.discard(name)
+
+    for name, deps in pending.items():
+        plugin_load_times[name] = {"status": "failed", "load_time": 0.0,
+                                   "error": f"unresolved dependencies: {', '.join(sorted(deps))}"}
+    return plugin_load_report()
+
+
+# 📊 تقرير أزمنة تحميل الإضافات
+def plugin_load_report(sort_by="load_time", reverse=True):
+    rows = []
+    for name, info in plugin_load_times.items():
+        entry = plugin_manifest.get(name, {})
+        rows.append({"name": name, "status": info["status"], "load_time": info["load_time"],
+                     "depends": entry.get("depends", []), "path": entry.get("path", ""), "error": info["error"]})
+    return sorted(rows, key=lambda row: row[sort_by], reverse=reverse)
+
+
+def print_plugin_load_table(sort_by="load_time", reverse=True):
+    rows = plugin_load_report(sort_by, reverse)
+    print(f"{'plugin':<28} {'status':<8} {'load (ms)':>10}  depends")
+    for row in rows:
+        print(f"{row['name']:<28} {row['status']:<8} {row['load_time'] * 1000:>10.2f}  "
+              f"{', '.join(row['depends']) or '-'}{'  ⚠️ ' + row['error'] if row['error'] else ''}")
+    loaded = [row for row in rows if row["status"] == "loaded"]
+    print(f"[📦] {len(loaded)} loaded, {sum(row['status'] == 'lazy' for row in rows)} deferred, "
+          f"{sum(row['status'] == 'failed' for row in rows)} failed – "
+          f"total import time {sum(row['load_time'] for row in loaded):.3f}s")
 
 
 # 🎯 واجهة تنفيذ ذكية عالية الاستجابة مع قياس زمن التنفيذ وحماية ضد التكرار الزائد وإدارة الأخطاء
 def execute_action(module_name, action, *args, **kwargs):
+    started = time.perf_counter()
+    status, mode = "error", "inline"
     try:
-        cache_key = f"{module_name}:{action}:{args}:{kwargs}"
-        if cache_key in neural_cache:
-            print(f"[⚡] From cache: {module_name}.{action}")
-            return neural_cache[cache_key]
-
-        # حماية ضد التكرار الزائد
-        recent_actions = action_history[module_name]
-        if recent_actions.count(action) >= 3:
-            print(f"[🛑] Action '{action}' in module '{module_name}' is being spammed. Ignored.")
+        module = neural_registry.get(module_name)
+        if isinstance(module, LazyPlugin):
+            module = module.load()  # أول استخدام لإضافة مؤجلة
+        func = getattr(module, action, None) if module else None
+        policy, ttl = resolve_cache_policy(module, action, func) if func else ("never", None)
+        cache_key = _memo_key(action, args, kwargs) if policy != "never" else None
+        if cache_key is not None:
+            memo = neural_cache.get(module_name)
+            cached = memo.get(cache_key) if memo is not None else ActionMemo._MISSING
+            if cached is not ActionMemo._MISSING:
+                _count_memo(f"{module_name}.{action}", "hits")
+                status = "cached"
+                _log(f"[⚡] From cache: {module_name}.{action}")
+                return cached
+            _count_memo(f"{module_name}.{action}", "misses")
+
+        # حماية ضد التكرار الزائد (بعد الكاش: النتائج المخزنة لا تستهلك من الحد،
+        # والـ action غير الموجود لا يستهلك رموزاً ولا ينشئ دلواً)
+        if func is not None and not rate_limiter.allow(module_name, action, module):
+            status = "throttled"
+            _log(f"[🛑] Action '{action}' in module '{module_name}' is being spammed. Ignored.")
             return None
-        recent_actions.append(action)
 
-        module = neural_registry.get(module_name)
-        if module and hasattr(module, action):
+        if func is not None:
+            mode, timeout = resolve_execution_mode(module, action, func)
             start = timeit.default_timer()
-            result = getattr(module, action)(*args, **kwargs)
+            if mode == "cpu_bound":
+                result = get_process_pool().run(module.__file__, module_name, action, args, kwargs, timeout)
+            else:
+                result = func(*args, **kwargs)
             end = timeit.default_timer()
             execution_time = end - start
             execution_times[f"{module_name}.{action}"] = execution_time
-            print(f"[⏱️] Execution time for {module_name}.{action}: {execution_time:.4f} seconds")
+            _log(f"[⏱️] Execution time for {module_name}.{action}: {execution_time:.4f} seconds")
 
-            neural_cache[cache_key] = result
+            if cache_key is not None and neural_registry.get(module_name) is module:
+                memo = neural_cache.get(module_name)
+                if memo is None:
+                    memo = neural_cache.setdefault(module_name, ActionMemo())
+                memo.put(cache_key, result, ttl)
             neural_activity_log[module_name].append(action)
-            print(f"[⚡] Executed: {module_name}.{action} → {result}")
+            status = "ok"
+            _log(f"[⚡] Executed: {module_name}.{action} → {result}")
             return result
         else:
-            print(f"[!] Action '{action}' not found in module '{module_name}'")
+            status = "not_found"
+            _log(f"[!] Action '{action}' not found in module '{module_name}'")
     except Exception as e:
-        print(f"[🔥] Error during execution: {e}")
-        traceback.print_exc()
+        print(f"[🔥] Error during execution of {module_name}.{action}: {e}")
+        if VERBOSE:
+            traceback.print_exc()
         error_count[module_name] += 1
         if error_count[module_name] >= 3:
             print(f"[🚨] Multiple failures detected in module: {module_name} – Check health or reload.")
+    finally:
+        if TRACING_ENABLED:
+            tracer.record(module_name, action, time.perf_counter() - started, status, mode)
 
 
 # 🧠 نظام فحص أعصاب متكرر (للأعطال واستعادة التوازن) مع مراقبة الموارد
@@ -95,8 +1006,20 @@ def neural_heartbeat(interval=5):
         while True:
             for name, mod in list(neural_registry.items()):
                 try:
+                    if isinstance(mod, LazyPlugin):
+                        # لا نحمّل إضافة مؤجلة لمجرد فحصها، إلا إذا كانت تعلن heartbeat
+                        if not mod._plugin_heartbeat:
+                            continue
+                        mod = mod.load()
                     if hasattr(mod, "heartbeat"):
-                        mod.heartbeat()
+                        started = time.perf_counter()
+                        status = "error"
+                        try:
+                            mod.heartbeat()
+                            status = "ok"
+                        finally:
+                            if TRACING_ENABLED:
+                                tracer.record(name, "heartbeat", time.perf_counter() - started, status, "heartbeat")
                 except Exception as e:
                     print(f"[⚠️] Heartbeat failure in {name}: {e}")
             monitor_resources()  # مراقبة CPU وRAM
@@ -106,8 +1029,11 @@ def neural_heartbeat(interval=5):
 
 # 🧠 مراقبة حرارة الأعصاب (الموارد CPU و RAM)
 def monitor_resources():
-    print(f"[🧠] CPU Load: {psutil.cpu_percent()}%")
-    print(f"[🧠] RAM Usage: {psutil.virtual_memory().percent}%")
+    resource_stats.update({"time": time.time(), "cpu_percent": psutil.cpu_percent(),
+                           "ram_percent": psutil.virtual_memory().percent})
+    _log(f"[🧠] CPU Load: {resource_stats['cpu_percent']}%")
+    _log(f"[🧠] RAM Usage: {resource_stats['ram_percent']}%")
+    return dict(resource_stats)
 
 
 # 🧬 دعم مكتبات ضخمة ومكتبات تعلم ذاتي قيد الإدخال الذكي
@@ -156,9 +1082,96 @@ def display_neural_activity():
         print(f"  ▸ {module}: {actions[-5:]}")  # آخر 5 نشاطات
 
 
+# ⏱️ قياس زمن الإقلاع: بدون فهرس (بارد) مقابل مع فهرس (دافئ)
+def benchmark_plugin_startup(count=100, import_work=20000):
+    """
+    إنشاء count إضافة اصطناعية (كل منها تقوم بعمل عند الاستيراد) وقياس:
+    eager بدون فهرس، lazy بارد (بناء الفهرس)، lazy دافئ (قراءة الفهرس فقط)
+    """
+    def reset():
+        neural_registry.clear()
+        plugin_manifest.clear()
+        plugin_load_times.clear()
+        neural_cache.clear()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        plugins_dir = os.path.join(workdir, "plugins")
+        os.makedirs(plugins_dir)
+        for i in range(count):
+            with open(os.path.join(plugins_dir, f"synthetic_{i:03d}.py"), "w", encoding="utf-8") as f:
+                f.write(f"import json, decimal\n"
+                        f"TABLE = {{n: n * n for n in range({import_work})}}\n"
+                        f"def ping():\n    return {i}\n"
+                        f"def describe(x):\n    return json.dumps({{'plugin': {i}, 'x': x}})\n"
+                        f"def heartbeat():\n    pass\n")
+        index_path = os.path.join(workdir, "plugin_index.json")
+
+        runs = (("eager (no index)", "eager", None), ("lazy cold", "lazy", index_path), ("lazy warm", "lazy", index_path))
+        for label, mode, path in runs:
+            reset()
+            start = time.perf_counter()
+            auto_load_plugins(plugins_dir, startup_mode=mode, index_path=path)
+            startup = time.perf_counter() - start
+            start = time.perf_counter()
+            execute_action("synthetic_042", "ping")
+            first_call = time.perf_counter() - start
+            results[label] = {"startup_s": round(startup, 4), "first_call_s": round(first_call, 4),
+                              "executed_modules": sum(not isinstance(m, LazyPlugin) for m in neural_registry.values())}
+    reset()
+    return results
+
+
+# ⏱️ قياس كلفة التتبع لكل استدعاء
+def benchmark_tracing_overhead(calls=200000):
+    """زمن execute_action لـ action فارغ مع التتبع وبدونه، وكلفة tracer.record وحده
+    (يستخدم tracer و rate_limiter محليين طوال القياس فلا تدخل الاستدعاءات في إحصائيات النظام)"""
+    global TRACING_ENABLED, tracer, rate_limiter
+    module = types.ModuleType("bench_tracing")
+    module.noop = lambda: None
+    neural_registry["bench_tracing"] = module
+    RATE_LIMITS["bench_tracing"] = RATE_LIMITS["bench_tracing.noop"] = None
+    previous = TRACING_ENABLED, tracer, rate_limiter
+    tracer, rate_limiter = ActionTracer(), RateLimiter()
+    results = {}
+    try:
+        for enabled in (False, True):
+            TRACING_ENABLED = enabled
+            start = time.perf_counter()
+            for _ in range(calls):
+                execute_action("bench_tracing", "noop")
+            results["traced_ns" if enabled else "untraced_ns"] = (time.perf_counter() - start) / calls * 1e9
+        local = ActionTracer()
+        start = time.perf_counter()
+        for _ in range(calls):
+            local.record("bench_tracing", "noop", 0.000123, "ok")
+        results["record_ns"] = (time.perf_counter() - start) / calls * 1e9
+    finally:
+        TRACING_ENABLED, tracer, rate_limiter = previous
+        neural_registry.pop("bench_tracing", None)
+        RATE_LIMITS.pop("bench_tracing", None)
+        RATE_LIMITS.pop("bench_tracing.noop", None)
+        neural_activity_log.pop("bench_tracing", None)
+        execution_times.pop("bench_tracing.noop", None)
+        with memo_stats_lock:
+            memo_stats.pop("bench_tracing.noop", None)
+        error_count.pop("bench_tracing", None)
+    results["overhead_ns"] = results["traced_ns"] - results["untraced_ns"]
+    return {key: round(value, 1) for key, value in results.items()}
+
+
 # 🚀 إطلاق
 if __name__ == "__main__":
+    if "--bench-tracing" in sys.argv:
+        print(benchmark_tracing_overhead())
+        sys.exit(0)
+    if "--bench-startup" in sys.argv:
+        for label, row in benchmark_plugin_startup().items():
+            print(f"{label:<18} startup {row['startup_s'] * 1000:>9.1f} ms   first call {row['first_call_s'] * 1000:>7.2f} ms"
+                  f"   executed modules {row['executed_modules']}")
+        sys.exit(0)
     print("🤖 ObeyX Plug-and-Play System Activated")
     auto_load_plugins("ObeyX/plugins")  # تأكد من وجود مجلد plugins
+    print_plugin_load_table()
     neural_heartbeat()
     display_neural_activity()  # عرض واجهة النشاط المبدئي
@@ -1,29 +1,1175 @@
 # persistence/long_term_logger.py
 import os
 import json
+import time
 import hashlib
 import datetime
 import threading
 import random
+import re
+import queue
+import atexit
+import sqlite3
+import unicodedata
+import tempfile
+import zlib
+import functools
+from collections import OrderedDict
+from collections.abc import Mapping
+
+# NumPy مطلوبة للبحث الدلالي فقط - بقية الذاكرة تعمل بدونها
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # مسار التخزين
 STORAGE_PATH = "persistence/memcore_data"
+DB_FILENAME = "long_term_memory.db"
+LEGACY_JSON_FILENAME = "long_term_memory.json"
 
 # إنشاء المسار إذا غير موجود
 os.makedirs(STORAGE_PATH, exist_ok=True)
 
-# ذاكرة طويلة الأمد - ذاكرة عصبية متكاملة
-memory_graph = {}
-
 # إعدادات التخزين
-SAVE_INTERVAL = 30  # ثوانٍ بين كل تخزين تلقائي
+SAVE_INTERVAL = 30  # ثوانٍ بين كل لقطة (دمج سجل الكتابة المسبقة في ملف القاعدة)
 
-# دعم استعادة المحذوف والتعويض
-recovery_bin = {}
+# ==========================
+# المتانة: كل عملية كتابة تُسجَّل أولاً في سجل الكتابة المسبقة (WAL) الخاص بـ SQLite
+# sync  : معاملة + fsync لكل عملية (أبطأ، لا فقدان)
+# group : المستدعي ينتظر، وخيط الالتزام يجمع العمليات المتزامنة في معاملة واحدة + fsync واحد
+# async : المستدعي لا ينتظر، والالتزام على دفعات دون fsync (قد تُفقد آخر الدفعات عند انقطاع الطاقة)
+# ==========================
+DURABILITY_MODE = "group"
+DURABILITY_MODES = ("sync", "group", "async")
+GROUP_COMMIT_MAX_BATCH = 512   # أقصى عدد عمليات في معاملة واحدة
+GROUP_COMMIT_WINDOW = 0.0      # ثوانٍ انتظار إضافية لتجميع المزيد (0: ما تراكم أثناء الالتزام السابق فقط)
+ASYNC_COMMIT_WINDOW = 0.05     # نافذة التجميع في الوضع async
+
+# ==========================
+# البحث الدلالي: متجه لكل إدخال في مصفوفة float32 متصلة على القرص (mmap)
+# ==========================
+VECTORS_FILENAME = "long_term_memory.vec"
+EMBEDDING_DIM = 256
+SEMANTIC_TOP_K = 10
+SEMANTIC_OVERSAMPLE = 4        # مرشحون إضافيون لتعويض المحذوف والمُستبعد بالمرشحات
+SEMANTIC_INDEX = "auto"        # flat: بحث شامل | ivf: فهرس عناقيد | auto: ivf عند IVF_MIN_ROWS فأكثر
+IVF_MIN_ROWS = 200_000
+IVF_NPROBE = 8                 # عدد العناقيد التي تُفحص لكل استعلام
+EMBED_BATCH_SIZE = 1024
+SCORE_CHUNK_ROWS = 65_536      # صفوف المصفوفة في كل عملية ضرب (حد للذاكرة المؤقتة)
+
+# ==========================
+# التخزين المتدرج: hot (ذاكرة محدودة) -> warm (صفوف SQLite) -> cold (مقاطع مضغوطة على القرص)
+# ==========================
+HOT_MAX_ENTRIES = 2048         # أحدث الإدخالات والأكثر وصولاً في الذاكرة
+COLD_AFTER_DAYS = 30           # الإدخالات الأقدم من ذلك تُنقل إلى مقاطع مضغوطة
+COLD_SEGMENT_ENTRIES = 4096    # إدخالات لكل مقطع (ضغط دفعة كاملة أفضل من ضغط كل إدخال وحده)
+COLD_COMPRESSION_LEVEL = 6
+SEGMENT_CACHE_SIZE = 8         # مقاطع مفكوكة في الذاكرة (تحميل عند الطلب)
+SEGMENTS_DIRNAME = "segments"
+
+# سياسات الاحتفاظ لكل نوع (default لما لم يُذكر):
+# recovery_days: مدة بقاء المحذوف في سلة الاسترجاع قبل حذفه نهائياً
+# max_age_days : الإدخالات الأقدم من ذلك تُنقل إلى سلة الاسترجاع (None: بلا حد)
+RETENTION_POLICIES = {
+    "default": {"recovery_days": 30, "max_age_days": None},
+    "event": {"recovery_days": 7, "max_age_days": 365},
+    "behavior": {"recovery_days": 7, "max_age_days": 365},
+}
 
 # دعم تحليل أي نوع بيانات
 SUPPORTED_TYPES = ["text", "code", "audio", "image", "event", "thought", "behavior"]
 
+# ==========================
+# محرك التخزين (SQLite مع فهارس على النوع والوسوم والوقت)
+# كل إدخال يُكتب فوراً كصف واحد بدلاً من إعادة كتابة الذاكرة كاملة
+# ==========================
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    type TEXT NOT NULL,
+    content TEXT,
+    content_is_json INTEGER NOT NULL DEFAULT 0,
+    tags TEXT NOT NULL DEFAULT '[]',
+    metadata TEXT NOT NULL DEFAULT '{}',
+    timestamp TEXT NOT NULL,
+    deleted INTEGER NOT NULL DEFAULT 0,
+    deleted_at TEXT,
+    segment INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_entries_type_ts ON entries(type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_entries_ts ON entries(timestamp);
+CREATE INDEX IF NOT EXISTS idx_entries_deleted ON entries(deleted) WHERE deleted = 1;
+CREATE TABLE IF NOT EXISTS entry_tags (
+    tag TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (tag, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    entries INTEGER NOT NULL,
+    raw_bytes INTEGER NOT NULL,
+    stored_bytes INTEGER NOT NULL,
+    created TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entry_vectors (row INTEGER PRIMARY KEY, seq INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_entry_vectors_seq ON entry_vectors(seq);
+CREATE TABLE IF NOT EXISTS vector_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+# أعمدة أُضيفت بعد الإصدار الأول من الجدول (تُضاف لقواعد قديمة عند الفتح)
+ADDED_COLUMNS = {"deleted_at": "TEXT", "segment": "INTEGER"}
+TIER_SCHEMA = """
+CREATE INDEX IF NOT EXISTS idx_entries_warm_ts ON entries(timestamp) WHERE segment IS NULL;
+CREATE INDEX IF NOT EXISTS idx_entries_segment ON entries(segment) WHERE segment IS NOT NULL;
+"""
+
+ENTRY_COLUMNS = "seq, id, type, content, content_is_json, tags, metadata, timestamp, deleted, segment"
+_ENTRY_COLUMNS_E = ", ".join("e." + column.strip() for column in ENTRY_COLUMNS.split(","))
+
+# ==========================
+# الفهرس النصي المقلوب (FTS5) على المحتوى والوسوم مع ترتيب BM25
+# النص يُطبَّع قبل الفهرسة وقبل البحث حتى تتطابق صيغ الهمزة والتاء المربوطة والتشكيل
+# الفهرس بلا محتوى (content='') - الصفوف نفسها في entries، والفهرس يحمل المصطلحات فقط
+# ==========================
+FTS_INDEX_VERSION = 1
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    body, tags, content='', prefix='2 3',
+    tokenize="unicode61 remove_diacritics 2 tokenchars '_'"
+);
+"""
+FTS_WEIGHTS = (1.0, 2.0)  # وزن BM25 للمحتوى ثم الوسوم
+# None = ترتيب BM25 على كل التطابقات. عدد صحيح = حد حداثة صريح: يُرتَّب أحدث RANK_WINDOW تطابقاً فقط
+# (أسرع لكلمة شائعة جداً، لكن تطابقاً أقدم بدرجة أفضل خارج النافذة لن يظهر)
+RANK_WINDOW = None
+
+# التشكيل والتطويل يُحذفان، وصيغ الحروف المتقاربة تُوحَّد
+_ARABIC_DIACRITICS = re.compile("[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]")
+_ARABIC_LETTER_MAP = str.maketrans({
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ؤ": "و", "ئ": "ي", "ى": "ي", "ة": "ه"
+})
+# أداة التعريف وما يسبقها من حروف (وال/بال/كال/فال/لل) تُزال من بداية الكلمة: "الذاكرة" تطابق "ذاكرة"
+_ARABIC_ARTICLE = re.compile(r"\b(?:[وبكف]?ال|لل)(?=\w{2})")
+_TOKEN_PATTERN = re.compile(r"\w+\*?")
+
+
+def normalize_text(text):
+    """تطبيع نص عربي/لاتيني للفهرسة والبحث"""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = _ARABIC_DIACRITICS.sub("", text).translate(_ARABIC_LETTER_MAP)
+    return _ARABIC_ARTICLE.sub("", text)
+
+
+def parse_search_query(query):
+    """
+    تحويل استعلام المستخدم إلى تعبير FTS5:
+    الكلمات المتجاورة = AND، والكلمة OR أو الرمز | بين المجموعات = OR، واللاحقة * = بحث بالبادئة.
+    مثال: "ذاكره نظ* OR voice" -> ("ذاكره" AND "نظ"*) OR ("voice")
+    """
+    groups, current = [], []
+    for word in query.split():
+        if word in ("OR", "|"):
+            if current:
+                groups.append(current)
+            current = []
+            continue
+        if word == "AND":
+            continue
+        for token in _TOKEN_PATTERN.findall(normalize_text(word)):
+            prefix = token.endswith("*")
+            token = token.rstrip("*")
+            if token:
+                current.append(f'"{token}"' + ("*" if prefix else ""))
+    if current:
+        groups.append(current)
+    return " OR ".join("(" + " AND ".join(group) + ")" for group in groups)
+
+
+def _index_fields(content, tags):
+    """نص المحتوى والوسوم كما يُفهرس (من قيم الصف المخزنة)"""
+    body = normalize_text(content or "")
+    tag_text = normalize_text(" ".join(str(tag) for tag in json.loads(tags)))
+    return body, tag_text
+
+
+class _PendingWrite:
+    """عملية كتابة في طابور الالتزام الجماعي"""
+    __slots__ = ("func", "args", "done", "result", "error")
+
+    def __init__(self, func, args, wait):
+        self.func = func
+        self.args = args
+        self.done = threading.Event() if wait else None
+        self.result = None
+        self.error = None
+
+
+class MemoryStore:
+    """مخزن الذاكرة طويلة الأمد - اتصال SQLite واحد محمي بقفل (آمن للخيوط)"""
+
+    def __init__(self, path, durability=None):
+        self.path = path
+        self.lock = threading.RLock()
+        # وجود سجل WAL غير فارغ عند الفتح يعني أن العملية السابقة لم تُغلق بنظافة
+        wal_path = path + "-wal"
+        pending_log = os.path.exists(wal_path) and os.path.getsize(wal_path) > 0
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_info(entries)")}
+        for column, column_type in ADDED_COLUMNS.items():
+            if column not in existing:
+                self.conn.execute(f"ALTER TABLE entries ADD COLUMN {column} {column_type}")
+        if "deleted_at" not in existing:
+            # وقت الحذف غير معروف للمحذوف قبل هذا العمود: يُقدَّر بوقت الإدخال
+            self.conn.execute("UPDATE entries SET deleted_at = timestamp WHERE deleted = 1")
+        self.conn.executescript(TIER_SCHEMA)
+        self.conn.executescript(FTS_SCHEMA)
+
+        self.hot = OrderedDict()  # id -> entry (LRU)
+        self.segment_dir = os.path.join(os.path.dirname(os.path.abspath(path)), SEGMENTS_DIRNAME)
+        self._segment_cache = OrderedDict()
+        self._segment_lock = threading.Lock()
+        self.tier_counters = {"hot_hits": 0, "hot_misses": 0, "segment_loads": 0, "segment_hits": 0}
+
+        self.durability = None
+        self._queue = queue.Queue()
+        self._committer = None
+        self._queued = 0
+        self._flushed = threading.Condition()
+        self.commit_stats = {"batches": 0, "ops": 0, "max_batch": 0, "commit_seconds": 0.0, "errors": 0}
+        self.set_durability(durability or DURABILITY_MODE)
+        self.semantic = None
+
+        # قاعدة أُنشئت قبل الفهرس النصي: بناء الفهرس مرة واحدة من الصفوف الموجودة
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < FTS_INDEX_VERSION:
+            self.rebuild_index()
+        # الاسترجاع: SQLite يعيد تطبيق السجل تلقائياً، ثم تُدمج إطاراته في ملف القاعدة
+        self.recovered_frames = self.snapshot()["checkpointed"] if pending_log else 0
+
+    # ----- تحويل الصفوف -----
+    def _row_to_entry(self, row):
+        seq, entry_id, entry_type, content, content_is_json, tags, metadata, timestamp, deleted, segment = row
+        if segment is not None:
+            content, metadata = self._cold_fields(segment, seq)
+        return {
+            "id": entry_id,
+            "type": entry_type,
+            "content": json.loads(content) if content_is_json else content,
+            "tags": json.loads(tags),
+            "metadata": json.loads(metadata),
+            "timestamp": timestamp,
+            "deleted": bool(deleted)
+        }
+
+    @staticmethod
+    def _entry_params(entry):
+        content = entry["content"]
+        is_json = not isinstance(content, str)
+        return (entry["id"], entry["type"], json.dumps(content, ensure_ascii=False) if is_json else content,
+                int(is_json), json.dumps(list(entry["tags"]), ensure_ascii=False),
+                json.dumps(entry["metadata"], ensure_ascii=False), entry["timestamp"], int(entry["deleted"]))
+
+    # ----- الفهرس النصي -----
+    @staticmethod
+    def _index_add(cursor, seq, content, tags):
+        cursor.execute("INSERT INTO entries_fts (rowid, body, tags) VALUES (?, ?, ?)",
+                       (seq, *_index_fields(content, tags)))
+
+    @staticmethod
+    def _index_remove(cursor, seq, content, tags):
+        # الفهرس بلا محتوى: الحذف يتطلب نفس القيم التي فُهرست
+        cursor.execute("INSERT INTO entries_fts (entries_fts, rowid, body, tags) VALUES ('delete', ?, ?, ?)",
+                       (seq, *_index_fields(content, tags)))
+
+    def rebuild_index(self):
+        """إعادة بناء الفهرس النصي من كل الإدخالات غير المحذوفة"""
+        self._run_transaction(self._rebuild_index)
+
+    def _rebuild_index(self, cursor):
+        cursor.execute("INSERT INTO entries_fts (entries_fts) VALUES ('delete-all')")
+        rows = self.conn.execute("SELECT seq, content, tags, segment FROM entries WHERE deleted = 0")
+        for seq, content, tags, segment in rows:
+            self._index_add(cursor, seq, self._stored_content(seq, content, segment), tags)
+        cursor.execute(f"PRAGMA user_version = {FTS_INDEX_VERSION}")
+
+    # ----- المعاملات -----
+    def _run_transaction(self, func, *args):
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                result = func(cursor, *args)
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            return result
+
+    def _insert_rows(self, cursor, entries):
+        for entry in entries:
+            params = self._entry_params(entry)
+            # استبدال إدخال بنفس المعرّف: إزالة وسومه وفهرسه القديم أولاً
+            old = cursor.execute("SELECT seq, content, tags, deleted, segment FROM entries WHERE id = ?",
+                                 (entry["id"],)).fetchone()
+            if old:
+                old_seq, old_content, old_tags, old_deleted, old_segment = old
+                cursor.execute("DELETE FROM entry_tags WHERE seq = ?", (old_seq,))
+                if not old_deleted:
+                    self._index_remove(cursor, old_seq, self._stored_content(old_seq, old_content, old_segment),
+                                       old_tags)
+            cursor.execute("INSERT OR REPLACE INTO entries (id, type, content, content_is_json, tags, "
+                           "metadata, timestamp, deleted) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", params)
+            seq = cursor.lastrowid
+            cursor.executemany("INSERT OR IGNORE INTO entry_tags (tag, seq) VALUES (?, ?)",
+                               [(str(tag), seq) for tag in set(entry["tags"])])
+            if not entry["deleted"]:
+                self._index_add(cursor, seq, params[2], params[4])
+
+    def _update_deleted(self, cursor, entry_id, deleted):
+        row = cursor.execute("SELECT seq, content, tags, segment FROM entries WHERE id = ? AND deleted = ?",
+                             (entry_id, int(not deleted))).fetchone()
+        if row:
+            seq, content, tags, segment = row
+            deleted_at = datetime.datetime.utcnow().isoformat() if deleted else None
+            cursor.execute("UPDATE entries SET deleted = ?, deleted_at = ? WHERE seq = ?",
+                           (int(deleted), deleted_at, seq))
+            content = self._stored_content(seq, content, segment)
+            if deleted:
+                self._index_remove(cursor, seq, content, tags)
+            else:
+                self._index_add(cursor, seq, content, tags)
+        self._hot_discard(entry_id)
+        return row is not None
+
+    # ----- الالتزام الجماعي -----
+    def set_durability(self, mode):
+        """تغيير وضع المتانة (sync / group / async) بعد تفريغ الطابور"""
+        if mode not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode: {mode} (expected one of {DURABILITY_MODES})")
+        self.flush()
+        with self.lock:
+            # في وضع WAL: FULL يعمل fsync للسجل عند كل التزام، NORMAL يؤجله إلى اللقطة
+            self.conn.execute(f"PRAGMA synchronous={'NORMAL' if mode == 'async' else 'FULL'}")
+            self.durability = mode
+
+    def write(self, func, *args):
+        """
+        تنفيذ عملية كتابة حسب وضع المتانة.
+        func(cursor, *args) تُنفَّذ داخل معاملة؛ في الوضع async تُرجع None دون انتظار النتيجة.
+        """
+        if self.durability == "sync":
+            return self._run_transaction(func, *args)
+        pending = _PendingWrite(func, args, wait=self.durability == "group")
+        with self._flushed:
+            self._queued += 1
+            if self._committer is None or not self._committer.is_alive():
+                self._committer = threading.Thread(target=self._commit_loop, daemon=True,
+                                                   name="LongMemoryCommitter")
+                self._committer.start()
+        self._queue.put(pending)
+        if pending.done is None:
+            return None
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _commit_loop(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            window = ASYNC_COMMIT_WINDOW if self.durability == "async" else GROUP_COMMIT_WINDOW
+            deadline = time.monotonic() + window
+            batch, stop = [first], False
+            # ما تراكم أثناء الالتزام السابق يدخل في هذه الدفعة
+            while len(batch) < GROUP_COMMIT_MAX_BATCH:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._commit_batch(batch)
+            if stop:
+                return
+
+    def _commit_batch(self, batch):
+        start = time.perf_counter()
+        with self.lock:
+            cursor = self.conn.cursor()
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
+                for pending in batch:
+                    # نقطة حفظ لكل عملية: فشل عملية واحدة لا يُسقط بقية الدفعة
+                    cursor.execute("SAVEPOINT op")
+                    try:
+                        pending.result = pending.func(cursor, *pending.args)
+                    except Exception as e:
+                        cursor.execute("ROLLBACK TO op")
+                        pending.error = e
+                    cursor.execute("RELEASE op")
+                cursor.execute("COMMIT")
+            except Exception as e:
+                if self.conn.in_transaction:
+                    cursor.execute("ROLLBACK")
+                for pending in batch:
+                    pending.error = pending.error or e
+            stats = self.commit_stats
+            stats["batches"] += 1
+            stats["ops"] += len(batch)
+            stats["max_batch"] = max(stats["max_batch"], len(batch))
+            stats["commit_seconds"] += time.perf_counter() - start
+        for pending in batch:
+            if pending.error is not None:
+                self.commit_stats["errors"] += 1
+                if pending.done is None:
+                    print(f"[⚠️ LongMemory] Async write failed: {pending.error}")
+            if pending.done is not None:
+                pending.done.set()
+        with self._flushed:
+            self._queued -= len(batch)
+            self._flushed.notify_all()
+
+    def flush(self, timeout=None):
+        """انتظار التزام كل العمليات المعلقة في الطابور"""
+        if threading.current_thread() is self._committer:
+            return True
+        with self._flushed:
+            return self._flushed.wait_for(lambda: self._queued == 0, timeout)
+
+    def get_commit_stats(self):
+        stats = dict(self.commit_stats)
+        batches = stats["batches"]
+        stats.update({
+            "mode": self.durability,
+            "queued": self._queued,
+            "avg_batch": round(stats["ops"] / batches, 2) if batches else 0.0,
+            "avg_commit_ms": round(stats["commit_seconds"] / batches * 1000, 3) if batches else 0.0
+        })
+        return stats
+
+    def snapshot(self):
+        """لقطة: دمج سجل الكتابة المسبقة في ملف القاعدة واقتطاعه (ضغط السجل)"""
+        self.flush()
+        with self.lock:
+            # TRUNCATE يُبلغ عن سجل فارغ بعد نجاحه، لذلك تُقرأ أعداد الإطارات من PASSIVE أولاً
+            _, log_frames, checkpointed = self.conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+            busy = self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()[0]
+        return {"busy": bool(busy), "log_frames": log_frames, "checkpointed": checkpointed}
+
+    # ----- الكتابة -----
+    def insert_many(self, entries):
+        """إدراج دفعة إدخالات في معاملة واحدة مباشرة (للترحيل والإدخال الجماعي)"""
+        self.flush()
+        entries = list(entries)
+        self._run_transaction(self._insert_rows, entries)
+        for entry in entries:
+            self._hot_discard(entry["id"])
+
+    def insert(self, entry):
+        self.write(self._insert_rows, [entry])
+        # في الوضع async قد تفشل الكتابة لاحقاً، فلا يدخل الإدخال الطبقة الساخنة قبل التزامه
+        if self.durability != "async":
+            self._hot_put(entry)
+
+    def set_deleted(self, entry_id, deleted):
+        """
+        تحديث حالة الحذف - يُرجع True إذا تغيرت الحالة فعلاً (None في الوضع async).
+        المحذوف يُزال من الفهرس النصي ويعود إليه عند الاستعادة.
+        """
+        return self.write(self._update_deleted, entry_id, deleted)
+
+    # ----- الطبقات: hot / warm / cold -----
+    @staticmethod
+    def _copy_entry(entry):
+        return {**entry, "tags": list(entry["tags"]), "metadata": dict(entry["metadata"])}
+
+    def _hot_put(self, entry):
+        with self.lock:
+            self.hot[entry["id"]] = self._copy_entry(entry)
+            self.hot.move_to_end(entry["id"])
+            while len(self.hot) > HOT_MAX_ENTRIES:
+                self.hot.popitem(last=False)
+
+    def _hot_discard(self, entry_id):
+        with self.lock:
+            self.hot.pop(entry_id, None)
+
+    def _segment_path(self, segment):
+        return os.path.join(self.segment_dir, f"seg-{segment:06d}.zlib")
+
+    def _load_segment(self, segment):
+        """فك مقطع بارد عند الطلب (مع ذاكرة LRU لآخر SEGMENT_CACHE_SIZE مقاطع)"""
+        with self._segment_lock:
+            payload = self._segment_cache.get(segment)
+            if payload is not None:
+                self._segment_cache.move_to_end(segment)
+                self.tier_counters["segment_hits"] += 1
+                return payload
+        with open(self._segment_path(segment), "rb") as f:
+            payload = json.loads(zlib.decompress(f.read()))
+        with self._segment_lock:
+            self.tier_counters["segment_loads"] += 1
+            self._segment_cache[segment] = payload
+            while len(self._segment_cache) > SEGMENT_CACHE_SIZE:
+                self._segment_cache.popitem(last=False)
+        return payload
+
+    def _cold_fields(self, segment, seq):
+        """(المحتوى، البيانات الوصفية) كما خُزنت في الصف قبل نقله للمقطع"""
+        content, metadata = self._load_segment(segment)[str(seq)]
+        return content, metadata
+
+    def _stored_content(self, seq, content, segment):
+        return content if segment is None else self._cold_fields(segment, seq)[0]
+
+    def archive_cold(self, before=None, force=False):
+        """
+        نقل محتوى الإدخالات الأقدم من before (افتراضياً COLD_AFTER_DAYS) إلى مقاطع مضغوطة بـ zlib.
+        الصف يبقى (المعرّف والنوع والوسوم والوقت والفهارس) ويُفرَّغ المحتوى والبيانات الوصفية فقط.
+        تُكتب مقاطع كاملة فقط (COLD_SEGMENT_ENTRIES) إلا مع force=True.
+        """
+        if before is None:
+            before = (datetime.datetime.utcnow() - datetime.timedelta(days=COLD_AFTER_DAYS)).isoformat()
+        self.flush()
+        os.makedirs(self.segment_dir, exist_ok=True)
+        archived = 0
+        while True:
+            with self.lock:
+                rows = self.conn.execute("SELECT seq, content, metadata FROM entries WHERE segment IS NULL "
+                                         "AND timestamp < ? ORDER BY timestamp LIMIT ?",
+                                         (before, COLD_SEGMENT_ENTRIES)).fetchall()
+                if not rows or (len(rows) < COLD_SEGMENT_ENTRIES and not force):
+                    return archived
+                segment = self.conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM segments").fetchone()[0]
+                # الملف أولاً (كتابة ذرية) ثم الصفوف: ملف بلا صفوف يُستبدل في المحاولة التالية
+                raw_bytes, stored_bytes = self._write_segment_file(
+                    segment, {str(seq): [content, metadata] for seq, content, metadata in rows})
+                path = self._segment_path(segment)
+
+                def commit_segment(cursor):
+                    cursor.execute("INSERT INTO segments (id, path, entries, raw_bytes, stored_bytes, created) "
+                                   "VALUES (?, ?, ?, ?, ?, ?)", (segment, os.path.basename(path), len(rows),
+                                                                 raw_bytes, stored_bytes,
+                                                                 datetime.datetime.utcnow().isoformat()))
+                    cursor.executemany("UPDATE entries SET content = NULL, metadata = '{}', segment = ? "
+                                       "WHERE seq = ?", [(segment, row[0]) for row in rows])
+
+                self._run_transaction(commit_segment)
+                archived += len(rows)
+
+    def apply_retention(self, now=None):
+        """
+        تطبيق RETENTION_POLICIES: نقل الإدخالات المنتهية (max_age_days) إلى سلة الاسترجاع،
+        ثم الحذف النهائي لما بقي في السلة أكثر من recovery_days، وضغط المقاطع التي فقدت صفوفاً.
+        """
+        now = now or datetime.datetime.utcnow()
+        expired = purged = 0
+        with self._reader():
+            types = {row[0] for row in self.conn.execute("SELECT DISTINCT type FROM entries")}
+        for entry_type in types:
+            policy = {**RETENTION_POLICIES["default"], **RETENTION_POLICIES.get(entry_type, {})}
+            if policy["max_age_days"] is not None:
+                cutoff = (now - datetime.timedelta(days=policy["max_age_days"])).isoformat()
+                with self._reader():
+                    ids = [row[0] for row in self.conn.execute(
+                        "SELECT id FROM entries WHERE type = ? AND deleted = 0 AND timestamp < ?",
+                        (entry_type, cutoff))]
+                for start in range(0, len(ids), COLD_SEGMENT_ENTRIES):
+                    chunk = ids[start:start + COLD_SEGMENT_ENTRIES]
+                    expired += self._run_transaction(
+                        lambda cursor: sum(self._update_deleted(cursor, entry_id, True) for entry_id in chunk))
+
+            cutoff = (now - datetime.timedelta(days=policy["recovery_days"])).isoformat()
+            with self._reader():
+                seqs = [row[0] for row in self.conn.execute(
+                    "SELECT seq FROM entries WHERE deleted = 1 AND type = ? AND deleted_at < ?",
+                    (entry_type, cutoff))]
+            for start in range(0, len(seqs), COLD_SEGMENT_ENTRIES):
+                params = [(seq,) for seq in seqs[start:start + COLD_SEGMENT_ENTRIES]]
+
+                def purge(cursor):
+                    # المحذوف خرج من الفهرس النصي عند حذفه؛ تبقى الوسوم والصف نفسه.
+                    # صفوف entry_vectors تبقى عمداً: حذفها يترك فجوات في أرقام الصفوف، و _resolve
+                    # يستبعد الإدخالات غير الموجودة عبر JOIN
+                    cursor.executemany("DELETE FROM entry_tags WHERE seq = ?", params)
+                    cursor.executemany("DELETE FROM entries WHERE seq = ?", params)
+
+                self._run_transaction(purge)
+                purged += len(params)
+
+        return {"expired": expired, "purged": purged, **self.compact_segments()}
+
+    def _write_segment_file(self, segment, payload):
+        """كتابة ذرية لملف مقطع -> (البايتات الخام، البايتات المضغوطة)"""
+        raw = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        data = zlib.compress(raw, COLD_COMPRESSION_LEVEL)
+        path = self._segment_path(segment)
+        with open(path + ".tmp", "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+        return len(raw), len(data)
+
+    def compact_segments(self):
+        """
+        إعادة كتابة كل مقطع فقد صفوفاً (حذف نهائي أو استبدال) بحيث لا يبقى على القرص إلا محتوى
+        الصفوف الحية، وحذف المقاطع التي فرغت تماماً. تُحدَّث أحجام المقطع في جدول segments.
+        """
+        rewritten = removed = 0
+        with self.lock:
+            stale = self.conn.execute(
+                "SELECT id, entries, (SELECT COUNT(*) FROM entries e WHERE e.segment = s.id) FROM segments s"
+            ).fetchall()
+            for segment, stored_entries, live_entries in stale:
+                if live_entries == stored_entries:
+                    continue
+                if live_entries == 0:
+                    self.conn.execute("DELETE FROM segments WHERE id = ?", (segment,))
+                    if os.path.exists(self._segment_path(segment)):
+                        os.remove(self._segment_path(segment))
+                    removed += 1
+                else:
+                    payload = self._load_segment(segment)
+                    live = {str(row[0]): payload[str(row[0])] for row in self.conn.execute(
+                        "SELECT seq FROM entries WHERE segment = ?", (segment,))}
+                    raw_bytes, stored_bytes = self._write_segment_file(segment, live)
+                    self.conn.execute("UPDATE segments SET entries = ?, raw_bytes = ?, stored_bytes = ? WHERE id = ?",
+                                      (len(live), raw_bytes, stored_bytes, segment))
+                    rewritten += 1
+                with self._segment_lock:
+                    self._segment_cache.pop(segment, None)
+        return {"segments_rewritten": rewritten, "segments_removed": removed}
+
+    def tier_stats(self):
+        """أحجام كل طبقة (عدد الإدخالات والبايتات) وعدادات الوصول"""
+        with self._reader():
+            warm_entries, warm_bytes = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(CAST(content AS BLOB)) + LENGTH(CAST(metadata AS BLOB))), 0) "
+                "FROM entries WHERE segment IS NULL").fetchone()
+            cold_entries = self.conn.execute("SELECT COUNT(*) FROM entries WHERE segment IS NOT NULL").fetchone()[0]
+            segments, raw_bytes, stored_bytes = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(raw_bytes), 0), COALESCE(SUM(stored_bytes), 0) FROM segments").fetchone()
+            recovery = self.conn.execute("SELECT COUNT(*) FROM entries WHERE deleted = 1").fetchone()[0]
+            hot_entries = list(self.hot.values())
+        db_bytes = sum(os.path.getsize(self.path + suffix) for suffix in ("", "-wal")
+                       if os.path.exists(self.path + suffix))
+        return {
+            "hot": {"entries": len(hot_entries), "max_entries": HOT_MAX_ENTRIES,
+                    "approx_bytes": sum(len(json.dumps(e, ensure_ascii=False, default=str)) for e in hot_entries),
+                    "hits": self.tier_counters["hot_hits"], "misses": self.tier_counters["hot_misses"]},
+            "warm": {"entries": warm_entries, "bytes": warm_bytes, "db_file_bytes": db_bytes},
+            "cold": {"entries": cold_entries, "segments": segments, "raw_bytes": raw_bytes,
+                     "stored_bytes": stored_bytes,
+                     "compression_ratio": round(raw_bytes / stored_bytes, 2) if stored_bytes else 0.0,
+                     "cached_segments": len(self._segment_cache),
+                     "segment_loads": self.tier_counters["segment_loads"],
+                     "segment_hits": self.tier_counters["segment_hits"]},
+            "recovery_bin": {"entries": recovery}
+        }
+
+    # ----- القراءة -----
+    def _reader(self):
+        # قراءة ما كُتب: العمليات المعلقة في الطابور تُلتزم قبل أي قراءة
+        if self._queued:
+            self.flush()
+        return self.lock
+
+    def get(self, entry_id, deleted=None):
+        with self.lock:
+            entry = self.hot.get(entry_id)
+            if entry is not None:
+                self.hot.move_to_end(entry_id)
+        if entry is not None and (deleted is None or entry["deleted"] == deleted):
+            self.tier_counters["hot_hits"] += 1
+            return self._copy_entry(entry)
+        self.tier_counters["hot_misses"] += 1
+        entry = self._get_row(entry_id, deleted)
+        if entry is not None and not entry["deleted"]:
+            self._hot_put(entry)
+        return entry
+
+    def _get_row(self, entry_id, deleted=None):
+        sql = f"SELECT {ENTRY_COLUMNS} FROM entries WHERE id = ?"
+        params = [entry_id]
+        if deleted is not None:
+            sql += " AND deleted = ?"
+            params.append(int(deleted))
+        with self._reader():
+            row = self.conn.execute(sql, params).fetchone()
+        return self._row_to_entry(row) if row else None
+
+    def count(self, deleted=None):
+        with self._reader():
+            if deleted is None:
+                return self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            return self.conn.execute("SELECT COUNT(*) FROM entries WHERE deleted = ?", (int(deleted),)).fetchone()[0]
+
+    def iter_entries(self, deleted=None, batch_size=1000):
+        """مرور على الإدخالات بالترتيب على دفعات (بدون تحميل الكل في الذاكرة)"""
+        last_seq = 0
+        condition = "" if deleted is None else f" AND deleted = {int(deleted)}"
+        while True:
+            with self._reader():
+                rows = self.conn.execute(f"SELECT {ENTRY_COLUMNS} FROM entries WHERE seq > ?{condition} "
+                                         f"ORDER BY seq LIMIT ?", (last_seq, batch_size)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._row_to_entry(row)
+            last_seq = rows[-1][0]
+
+    def _filters(self, entry_type, tags, since, until):
+        conditions, params = [], []
+        if entry_type is not None:
+            conditions.append("e.type = ?")
+            params.append(entry_type)
+        if since is not None:
+            conditions.append("e.timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("e.timestamp <= ?")
+            params.append(until)
+        for tag in tags or []:
+            conditions.append("e.seq IN (SELECT seq FROM entry_tags WHERE tag = ?)")
+            params.append(str(tag))
+        return conditions, params
+
+    def _select(self, sql, params):
+        with self._reader():
+            rows = self.conn.execute(sql, params).fetchall()
+        return [self._row_to_entry(row) for row in rows]
+
+    def search(self, keyword=None, entry_type=None, tags=None, since=None, until=None,
+               include_deleted=False, limit=None, offset=0):
+        """
+        بحث نصي جزئي (السلوك القديم): keyword جزء من المحتوى أو وسم مطابق، بترتيب الإدراج.
+        tags: كل الوسوم المطلوبة يجب أن تكون موجودة (تستخدم فهرس الوسوم)
+        since/until: حدود الوقت بصيغة ISO (تستخدم فهرس الوقت)
+        """
+        conditions, params = self._filters(entry_type, tags, since, until)
+        if not include_deleted:
+            conditions.insert(0, "e.deleted = 0")
+        if keyword is not None:
+            conditions.append("(instr(e.content, ?) > 0 OR e.seq IN (SELECT seq FROM entry_tags WHERE tag = ?))")
+            params += [keyword, keyword]
+        sql = f"SELECT {_ENTRY_COLUMNS_E} FROM entries e"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY e.seq"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        return self._select(sql, params)
+
+    def search_text(self, query, entry_type=None, tags=None, since=None, until=None, limit=20, offset=0):
+        """
+        بحث عبر الفهرس النصي مرتب حسب BM25 (الأفضل أولاً) - المحذوف غير مفهرس.
+        عند ضبط RANK_WINDOW يقتصر الترتيب على أحدث max(RANK_WINDOW, offset + limit) تطابقاً.
+        """
+        expression = parse_search_query(query)
+        if not expression:
+            return []
+        conditions, params = self._filters(entry_type, tags, since, until)
+        weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+        where = f"WHERE entries_fts MATCH ?{''.join(' AND ' + c for c in conditions)}"
+        page = [-1 if limit is None else limit, offset]
+        if RANK_WINDOW is None or limit is None:
+            sql = (f"SELECT {_ENTRY_COLUMNS_E} FROM entries_fts JOIN entries e ON e.seq = entries_fts.rowid "
+                   f"{where} ORDER BY bm25(entries_fts, {weights}) LIMIT ? OFFSET ?")
+            return self._select(sql, [expression, *params, *page])
+        window = max(RANK_WINDOW, offset + limit)
+        candidates = (f"SELECT entries_fts.rowid AS seq, bm25(entries_fts, {weights}) AS score FROM entries_fts "
+                      f"{'JOIN entries e ON e.seq = entries_fts.rowid ' if conditions else ''}"
+                      f"{where} ORDER BY entries_fts.rowid DESC LIMIT ?")
+        sql = (f"SELECT {_ENTRY_COLUMNS_E} FROM ({candidates}) ranked JOIN entries e ON e.seq = ranked.seq "
+               f"ORDER BY ranked.score LIMIT ? OFFSET ?")
+        return self._select(sql, [expression, *params, window, *page])
+
+    def semantic_index(self, embedder=None):
+        """فهرس البحث الدلالي (يُنشأ عند أول استخدام، أو يُعاد إنشاؤه عند تغيير المُضمِّن)"""
+        with self.lock:
+            if self.semantic is None or (embedder is not None and embedder is not self.semantic.embedder):
+                path = os.path.join(os.path.dirname(self.path), VECTORS_FILENAME)
+                self.semantic = SemanticIndex(self, path, embedder)
+            return self.semantic
+
+    def close(self):
+        """إيقاف خيط الالتزام بعد تفريغ الطابور ثم لقطة أخيرة وإغلاق الاتصال"""
+        if self._committer is not None and self._committer.is_alive():
+            self._queue.put(None)
+            self._committer.join()
+        self.snapshot()
+        with self.lock:
+            self.conn.close()
+
+
+class HashingEmbedder:
+    """
+    مُضمِّن محلي حتمي بلا نموذج: تجزئة الكلمات وثلاثيات الحروف (بعد التطبيع) إلى متجه ثابت الطول.
+    أي مُضمِّن بديل يكفيه: name و dim و embed(texts) -> مصفوفة float32 بشكل (n, dim).
+    """
+
+    def __init__(self, dim=EMBEDDING_DIM):
+        self.dim = dim
+        self.name = f"hashing-v1-{dim}"
+
+    def embed(self, texts):
+        indexes, values, lengths = [], [], []
+        for text in texts:
+            count = 0
+            for word in _TOKEN_PATTERN.findall(normalize_text(text)):
+                word_indexes, word_values = _word_features(word.rstrip("*"), self.dim)
+                indexes.extend(word_indexes)
+                values.extend(word_values)
+                count += len(word_indexes)
+            lengths.append(count)
+        # كل الميزات في مصفوفة واحدة: الخانة + (رقم الصف × الأبعاد) ثم جمع بـ bincount
+        flat = np.asarray(indexes, dtype=np.int64)
+        flat += np.repeat(np.arange(len(texts), dtype=np.int64) * self.dim, lengths)
+        matrix = np.bincount(flat, weights=np.asarray(values, dtype=np.float64),
+                             minlength=len(texts) * self.dim).astype(np.float32).reshape(len(texts), self.dim)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _word_features(word, dim):
+    """
+    ميزات الكلمة (الكلمة نفسها بوزن 1 وثلاثيات حروفها بوزن 0.5) -> (الخانات، القيم الموقّعة).
+    crc32 ثابتة بين العمليات (hash() في بايثون عشوائية البذرة)
+    """
+    padded = f"#{word}#"
+    features = [(word, 1.0)] + [(padded[i:i + 3], 0.5) for i in range(len(padded) - 2)]
+    indexes, values = [], []
+    for feature, weight in features:
+        h = zlib.crc32(feature.encode("utf-8"))
+        indexes.append(h % dim)
+        values.append(weight if h & 0x80000000 else -weight)
+    return tuple(indexes), tuple(values)
+
+
+def _top_k(scores, k):
+    """أعلى k قيم في كل صف (مرتبة تنازلياً) -> (الأعمدة، القيم)"""
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64), np.empty((scores.shape[0], 0), dtype=np.float32)
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1)
+    return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_scores, order, axis=1)
+
+
+class IVFIndex:
+    """فهرس عناقيد مقلوب: k-means على المتجهات، والاستعلام يفحص أقرب nprobe عناقيد فقط"""
+
+    def __init__(self, matrix, nlist=None, iterations=8, sample=50_000, seed=0):
+        rows = matrix.shape[0]
+        self.nlist = nlist or max(1, int(rows ** 0.5))
+        rng = np.random.default_rng(seed)
+        train = np.asarray(matrix[np.sort(rng.choice(rows, min(sample, rows), replace=False))])
+        centroids = train[rng.choice(len(train), self.nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assign = np.argmax(train @ centroids.T, axis=1)
+            for c in range(self.nlist):
+                members = train[assign == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+            centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+        self.centroids = centroids
+        self.lists = [np.empty(0, dtype=np.int64) for _ in range(self.nlist)]
+        self.rows = 0
+        self.add(matrix, 0)
+
+    def add(self, matrix, start):
+        """إضافة الصفوف الجديدة [start, rows) إلى أقرب عنقود"""
+        for offset in range(start, matrix.shape[0], SCORE_CHUNK_ROWS):
+            chunk = np.asarray(matrix[offset:offset + SCORE_CHUNK_ROWS])
+            assign = np.argmax(chunk @ self.centroids.T, axis=1)
+            for c in np.unique(assign):
+                self.lists[c] = np.concatenate([self.lists[c], offset + np.flatnonzero(assign == c)])
+        self.rows = matrix.shape[0]
+
+    def search(self, matrix, query, k, nprobe=IVF_NPROBE):
+        probes = np.argsort(-(self.centroids @ query))[:nprobe]
+        candidates = np.concatenate([self.lists[c] for c in probes])
+        if not len(candidates):
+            return candidates, np.empty(0, dtype=np.float32)
+        scores = np.asarray(matrix[np.sort(candidates)]) @ query
+        cols, top = _top_k(scores[None, :], k)
+        return np.sort(candidates)[cols[0]], top[0]
+
+
+class SemanticIndex:
+    """
+    متجهات الإدخالات في ملف float32 متصل (صف لكل إدخال) مربوط بالذاكرة،
+    وجدول entry_vectors يربط رقم الصف بالإدخال. المتجهات بيانات مشتقة: تُحسب تدريجياً لكل
+    إدخال جديد قبل البحث، وأي صفوف لم تكتمل عند انهيار تُقتطع وتُعاد.
+    """
+
+    def __init__(self, store, path, embedder=None):
+        if np is None:
+            raise RuntimeError("Semantic search requires numpy")
+        self.store = store
+        self.path = path
+        self.embedder = embedder or HashingEmbedder()
+        self.lock = threading.RLock()
+        self.matrix = None
+        self.ivf = None
+        with store.lock:
+            stored = store.conn.execute("SELECT value FROM vector_meta WHERE key = 'embedder'").fetchone()
+        # مُضمِّن مختلف عن الذي بُنيت به المتجهات: إعادة البناء من الصفر
+        if stored is None or stored[0] != self.embedder.name:
+            self.reset()
+        self._reconcile()
+
+    @property
+    def row_bytes(self):
+        return self.embedder.dim * 4
+
+    def reset(self):
+        with self.lock, self.store.lock:
+            self.store.conn.execute("DELETE FROM entry_vectors")
+            self.store.conn.execute("INSERT OR REPLACE INTO vector_meta (key, value) VALUES ('embedder', ?)",
+                                    (self.embedder.name,))
+            open(self.path, "wb").close()
+            self.matrix = self.ivf = None
+
+    def _reconcile(self):
+        """مواءمة عدد صفوف الملف مع جدول الربط بعد انهيار محتمل"""
+        with self.lock, self.store.lock:
+            file_rows = os.path.getsize(self.path) // self.row_bytes if os.path.exists(self.path) else 0
+            self.store.conn.execute("DELETE FROM entry_vectors WHERE row >= ?", (file_rows,))
+            # أرقام الصفوف قد تحوي فجوات، فالطول المعتبر هو آخر صف مربوط + 1
+            mapped = self.store.conn.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM entry_vectors").fetchone()[0]
+            with open(self.path, "ab") as f:
+                f.truncate(mapped * self.row_bytes)
+
+    def rows(self):
+        return os.path.getsize(self.path) // self.row_bytes
+
+    def sync(self):
+        """حساب متجهات الإدخالات الجديدة (كل ما بعد آخر إدخال مُضمَّن) وإلحاقها بالملف"""
+        store = self.store
+        with self.lock:
+            with store._reader():
+                watermark = store.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM entry_vectors").fetchone()[0]
+            added = 0
+            while True:
+                with store._reader():
+                    rows = store.conn.execute("SELECT seq, content, tags, segment FROM entries WHERE seq > ? "
+                                              "ORDER BY seq LIMIT ?", (watermark, EMBED_BATCH_SIZE)).fetchall()
+                if not rows:
+                    break
+                texts = [f"{store._stored_content(seq, content, segment) or ''} "
+                         f"{' '.join(str(t) for t in json.loads(tags))}" for seq, content, tags, segment in rows]
+                vectors = np.ascontiguousarray(self.embedder.embed(texts), dtype=np.float32)
+                start_row = self.rows()
+                # الملف أولاً ثم جدول الربط: صفوف بلا ربط تُقتطع عند الفتح التالي
+                with open(self.path, "ab") as f:
+                    f.write(vectors.tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                store._run_transaction(lambda cursor: cursor.executemany(
+                    "INSERT INTO entry_vectors (row, seq) VALUES (?, ?)",
+                    [(start_row + i, row[0]) for i, row in enumerate(rows)]))
+                watermark = rows[-1][0]
+                added += len(rows)
+            if added or self.matrix is None:
+                self._remap()
+            return added
+
+    def _remap(self):
+        rows = self.rows()
+        self.matrix = (np.memmap(self.path, dtype=np.float32, mode="r", shape=(rows, self.embedder.dim))
+                       if rows else np.empty((0, self.embedder.dim), dtype=np.float32))
+        use_ivf = SEMANTIC_INDEX == "ivf" or (SEMANTIC_INDEX == "auto" and rows >= IVF_MIN_ROWS)
+        if not use_ivf or not rows:
+            self.ivf = None
+        elif self.ivf is None:
+            self.ivf = IVFIndex(self.matrix)
+        elif self.ivf.rows < rows:
+            self.ivf.add(self.matrix, self.ivf.rows)
+
+    def build_ivf(self, nlist=None):
+        """بناء فهرس العناقيد يدوياً (بغض النظر عن IVF_MIN_ROWS)"""
+        self.sync()
+        with self.lock:
+            self.ivf = IVFIndex(self.matrix, nlist=nlist) if len(self.matrix) else None
+        return self.ivf
+
+    def _candidates(self, queries, count, exact):
+        """أفضل count صفاً لكل استعلام -> قائمة (صفوف، درجات)"""
+        if self.ivf is not None and not exact:
+            return [self.ivf.search(self.matrix, q, count) for q in queries]
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        for offset in range(0, len(self.matrix), SCORE_CHUNK_ROWS):
+            scores = np.asarray(self.matrix[offset:offset + SCORE_CHUNK_ROWS]) @ queries.T
+            cols, top = _top_k(scores.T, count)
+            merged_rows = np.concatenate([best_rows, cols + offset], axis=1)
+            merged_scores = np.concatenate([best_scores, top], axis=1)
+            keep, best_scores = _top_k(merged_scores, count)
+            best_rows = np.take_along_axis(merged_rows, keep, axis=1)
+        return list(zip(best_rows, best_scores))
+
+    def search(self, queries, k=SEMANTIC_TOP_K, entry_type=None, tags=None, since=None, until=None, exact=False):
+        """
+        queries: نص أو قائمة نصوص (تُضمَّن وتُقارن دفعة واحدة).
+        تُرجع لكل استعلام أفضل k إدخالات غير محذوفة مع مفتاح score (تشابه جيب التمام).
+        exact=True يتجاوز فهرس العناقيد.
+        """
+        single = isinstance(queries, str)
+        texts = [queries] if single else list(queries)
+        self.sync()
+        with self.lock:
+            total = len(self.matrix)
+            vectors = self.embedder.embed(texts).astype(np.float32, copy=False)
+            conditions, params = self.store._filters(entry_type, tags, since, until)
+            results = [None] * len(texts)
+            pending = list(range(len(texts)))
+            count = k * SEMANTIC_OVERSAMPLE
+            while pending:
+                candidates = self._candidates(vectors[pending], min(count, total), exact)
+                retry = []
+                for index, (rows, scores) in zip(pending, candidates):
+                    found = self._resolve(rows, scores, conditions, params)[:k]
+                    # مرشحات ضيقة أو محذوف كثير: توسيع المرشحين حتى نغطي كل الصفوف
+                    if len(found) < k and count < total and not (self.ivf is not None and not exact):
+                        retry.append(index)
+                    results[index] = found
+                pending = retry
+                count *= SEMANTIC_OVERSAMPLE
+        return results[0] if single else results
+
+    def _resolve(self, rows, scores, conditions, params):
+        """تحويل صفوف المصفوفة إلى إدخالات مع تطبيق الحذف والمرشحات، بترتيب الدرجة"""
+        if not len(rows):
+            return []
+        score_by_row = dict(zip(rows.tolist(), scores.tolist()))
+        marks = ",".join("?" * len(score_by_row))
+        sql = (f"SELECT v.row, {_ENTRY_COLUMNS_E} FROM entry_vectors v JOIN entries e ON e.seq = v.seq "
+               f"WHERE v.row IN ({marks}) AND e.deleted = 0{''.join(' AND ' + c for c in conditions)}")
+        with self.store._reader():
+            fetched = self.store.conn.execute(sql, [*score_by_row, *params]).fetchall()
+        found = []
+        for row in fetched:
+            entry = self.store._row_to_entry(row[1:])
+            entry["score"] = round(score_by_row[row[0]], 6)
+            found.append(entry)
+        found.sort(key=lambda entry: entry["score"], reverse=True)
+        return found
+
+    def stats(self):
+        return {
+            "embedder": self.embedder.name,
+            "rows": len(self.matrix) if self.matrix is not None else self.rows(),
+            "file_mb": round(os.path.getsize(self.path) / 1024 ** 2, 2),
+            "index": "ivf" if self.ivf is not None else "flat",
+            "ivf_lists": self.ivf.nlist if self.ivf is not None else 0
+        }
+
+
+class MemoryView(Mapping):
+    """
+    عرض للقراءة فوق المخزن بنفس شكل القاموس القديم (id -> entry).
+    deleted=None: كل الإدخالات (memory_graph) | deleted=True: سلة الاسترجاع (recovery_bin).
+    القيم نسخ - تعديلها لا يُحفظ؛ التعديل يتم عبر log_entry / soft_delete / restore_entry.
+    """
+
+    def __init__(self, deleted=None):
+        self.deleted = deleted
+
+    def __getitem__(self, entry_id):
+        entry = get_store().get(entry_id, self.deleted)
+        if entry is None:
+            raise KeyError(entry_id)
+        return entry
+
+    def __contains__(self, entry_id):
+        return get_store().get(entry_id, self.deleted) is not None
+
+    def __iter__(self):
+        return (entry["id"] for entry in get_store().iter_entries(self.deleted))
+
+    def __len__(self):
+        return get_store().count(self.deleted)
+
+    def values(self):
+        return get_store().iter_entries(self.deleted)
+
+    def items(self):
+        return ((entry["id"], entry) for entry in get_store().iter_entries(self.deleted))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """فتح المخزن عند أول استخدام"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MemoryStore(os.path.join(STORAGE_PATH, DB_FILENAME))
+            atexit.register(close_store)
+        return _store
+
+
+def close_store():
+    """إغلاق المخزن (تفريغ الكتابات المعلقة + لقطة أخيرة) - يُستدعى تلقائياً عند الخروج"""
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
+
+
+def set_durability_mode(mode):
+    get_store().set_durability(mode)
+
+
+def get_commit_stats():
+    return get_store().get_commit_stats()
+
+
+def run_maintenance():
+    """نقل القديم إلى الطبقة الباردة وتطبيق سياسات الاحتفاظ"""
+    store = get_store()
+    archived = store.archive_cold()
+    retention = store.apply_retention()
+    if archived or retention["expired"] or retention["purged"]:
+        print(f"[🧊 LongMemory] Archived {archived} entries, expired {retention['expired']}, "
+              f"purged {retention['purged']} from recovery bin")
+    return {"archived": archived, **retention}
+
+
+def get_tier_stats():
+    return get_store().tier_stats()
+
+
+def set_embedder(embedder):
+    """استبدال المُضمِّن (أي كائن فيه name و dim و embed) - تغيير الاسم يعيد بناء المتجهات"""
+    return get_store().semantic_index(embedder)
+
+
+# ذاكرة طويلة الأمد - ذاكرة عصبية متكاملة (عرض فوق المخزن)
+memory_graph = MemoryView()
+
+# دعم استعادة المحذوف والتعويض
+recovery_bin = MemoryView(deleted=True)
+
 # تشفير بسيط باستخدام SHA256 لتأمين الهوية
 def secure_hash(data):
     return hashlib.sha256(data.encode()).hexdigest()
@@ -40,59 +1186,78 @@ def log_entry(entry_type, content, tags=[], metadata={}):
         "id": entry_id,
         "type": entry_type,
         "content": content,
-        "tags": tags,
-        "metadata": metadata,
+        "tags": list(tags),
+        "metadata": dict(metadata),
         "timestamp": timestamp,
         "deleted": False
     }
 
-    memory_graph[entry_id] = entry
+    get_store().insert(entry)
     print(f"[🧠 LongMemory] Logged entry: {entry_type} → {entry_id}")
     return entry_id
 
 # حذف آمن مع دعم الاسترجاع
 def soft_delete(entry_id):
-    if entry_id in memory_graph:
-        memory_graph[entry_id]["deleted"] = True
-        recovery_bin[entry_id] = memory_graph[entry_id]
+    # None في الوضع async: العملية في الطابور ولم تُلتزم بعد
+    if get_store().set_deleted(entry_id, True) is not False:
         print(f"[🧠 LongMemory] Entry {entry_id} moved to recovery bin.")
 
 # استعادة المحذوف
 def restore_entry(entry_id):
-    if entry_id in recovery_bin:
-        memory_graph[entry_id] = recovery_bin.pop(entry_id)
-        memory_graph[entry_id]["deleted"] = False
+    if get_store().set_deleted(entry_id, False) is not False:
         print(f"[🧠 LongMemory] Entry {entry_id} restored.")
 
 # البحث في الذاكرة
-def search_memory(keyword):
-    results = []
-    for entry in memory_graph.values():
-        if not entry["deleted"] and (keyword in entry["content"] or keyword in entry.get("tags", [])):
-            results.append(entry)
-    return results
+# افتراضياً بحث نصي مرتب (BM25) يدعم AND/OR والبادئة* والتطبيع العربي
+# substring=True يعيد البحث الجزئي القديم (مفيد لمقاطع الكود والرموز)
+# semantic=True بحث بالمعنى (تشابه المتجهات)، ويقبل قائمة استعلامات تُعالج دفعة واحدة
+def search_memory(keyword=None, entry_type=None, tags=None, since=None, until=None, limit=None, offset=0,
+                  substring=False, semantic=False):
+    store = get_store()
+    if semantic:
+        return store.semantic_index().search(keyword, k=limit or SEMANTIC_TOP_K, entry_type=entry_type,
+                                             tags=tags, since=since, until=until)
+    if keyword is None or substring:
+        return store.search(keyword, entry_type=entry_type, tags=tags, since=since, until=until,
+                            limit=limit, offset=offset)
+    return store.search_text(keyword, entry_type=entry_type, tags=tags, since=since, until=until,
+                             limit=limit, offset=offset)
 
-# الحفظ الدوري التلقائي
+# الصيانة واللقطة الدورية التلقائية
 def auto_save_loop():
     while True:
+        run_maintenance()
         save_memory()
         time.sleep(SAVE_INTERVAL)
 
-# حفظ الذاكرة إلى ملف
+# حفظ الذاكرة: كل عملية مسجلة مسبقاً في سجل WAL، هنا لقطة تدمج السجل في ملف القاعدة وتقتطعه
 def save_memory():
-    path = os.path.join(STORAGE_PATH, "long_term_memory.json")
-    with open(path, "w") as f:
-        json.dump(memory_graph, f, indent=2)
-    print(f"[💾 LongMemory] Memory saved to {path}")
+    return get_store().snapshot()
+
+# ترحيل ملف JSON القديم (إن وجد) إلى المخزن مرة واحدة
+def migrate_legacy_json():
+    path = os.path.join(STORAGE_PATH, LEGACY_JSON_FILENAME)
+    if not os.path.exists(path):
+        return 0
+    with open(path, "r") as f:
+        legacy = json.load(f)
+    get_store().insert_many(
+        {"id": entry_id, "type": entry["type"], "content": entry["content"], "tags": entry.get("tags", []),
+         "metadata": entry.get("metadata", {}), "timestamp": entry["timestamp"], "deleted": entry.get("deleted", False)}
+        for entry_id, entry in legacy.items())
+    os.replace(path, path + ".migrated")
+    print(f"[🔁 LongMemory] Migrated {len(legacy)} entries from {path}")
+    return len(legacy)
 
 # تحميل الذاكرة
 def load_memory():
-    global memory_graph
-    path = os.path.join(STORAGE_PATH, "long_term_memory.json")
-    if os.path.exists(path):
-        with open(path, "r") as f:
-            memory_graph = json.load(f)
-        print(f"[🔁 LongMemory] Loaded memory from {path}")
+    store = get_store()
+    if store.recovered_frames:
+        print(f"[🔁 LongMemory] Recovered {store.recovered_frames} frames from the write-ahead log")
+    migrate_legacy_json()
+    count = store.count()
+    if count:
+        print(f"[🔁 LongMemory] Loaded memory from {store.path} ({count} entries)")
     else:
         print("[🔁 LongMemory] No previous memory found.")
 
@@ -103,8 +1268,244 @@ def start_memory_engine():
     t = threading.Thread(target=auto_save_loop, daemon=True)
     t.start()
 
+# ==========================
+# قياس الأداء: المخزن المفهرس مقابل القاموس مع البحث الخطي
+# ==========================
+_BENCH_WORDS = ["ذاكرة", "نظام", "صوت", "ملف", "شبكة", "تشغيل", "memory", "system", "voice", "network",
+                "model", "cache", "kernel", "agent", "boot", "plugin"]
+_BENCH_RARE_TERMS = 20_000  # مفردات نادرة (term0..term19999) حتى تكون الاستعلامات انتقائية كالنصوص الحقيقية
+
+
+def _synthetic_entries(count, start=0):
+    rng = random.Random(42 + start)
+    base = datetime.datetime(2024, 1, 1)
+    for i in range(start, start + count):
+        words = rng.choices(_BENCH_WORDS, k=6)
+        rare = [f"term{rng.randrange(_BENCH_RARE_TERMS)}" for _ in range(2)]
+        yield {
+            "id": f"{i:016x}",
+            "type": SUPPORTED_TYPES[i % len(SUPPORTED_TYPES)],
+            "content": " ".join(words + rare) + f" #{i}",
+            "tags": [f"tag{rng.randrange(1000)}", words[0]],
+            "metadata": {"i": i},
+            "timestamp": (base + datetime.timedelta(seconds=i)).isoformat(),
+            "deleted": False
+        }
+
+
+def _time_query(func, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return round((time.perf_counter() - start) / repeat * 1000, 3), result
+
+
+def benchmark_storage(sizes=(10_000, 1_000_000, 10_000_000), legacy_max=1_000_000, chunk=50_000):
+    """
+    لكل حجم: زمن الإدراج، والبحث بالوسم، وبالنوع ضمن مدى زمني، وبالكلمة، والحذف/الاستعادة،
+    والبحث النصي المفهرس (كلمة / AND / OR / بادئة / كلمة شائعة) بأفضل 10 نتائج،
+    ومقارنة البحث الخطي القديم على قاموس (حتى legacy_max إدخال)
+    """
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as workdir:
+            store = MemoryStore(os.path.join(workdir, DB_FILENAME))
+            start = time.perf_counter()
+            for offset in range(0, size, chunk):
+                store.insert_many(_synthetic_entries(min(chunk, size - offset), offset))
+            insert_s = time.perf_counter() - start
+            mid = (datetime.datetime(2024, 1, 1) + datetime.timedelta(seconds=size // 2)).isoformat()
+            end = (datetime.datetime(2024, 1, 1) + datetime.timedelta(seconds=size // 2 + 3600)).isoformat()
+            row = {
+                "size": size,
+                "insert_per_s": round(size / insert_s),
+                "db_mb": round(sum(os.path.getsize(store.path + suffix) for suffix in ("", "-wal")
+                                   if os.path.exists(store.path + suffix)) / 1024 ** 2, 1),
+                "tag_ms": _time_query(lambda: store.search(tags=["tag7"], limit=100))[0],
+                "type_range_ms": _time_query(lambda: store.search(entry_type="code", since=mid, until=end))[0],
+                "keyword_ms": _time_query(lambda: store.search("kernel", limit=100))[0],
+                "keyword_full_ms": _time_query(lambda: store.search(f"#{size - 1}"), repeat=1)[0],
+                "fts_term_ms": _time_query(lambda: store.search_text("term123", limit=10))[0],
+                "fts_and_ms": _time_query(lambda: store.search_text("term123 الذاكرة", limit=10))[0],
+                "fts_or_ms": _time_query(lambda: store.search_text("term123 OR term4567", limit=10))[0],
+                "fts_prefix_ms": _time_query(lambda: store.search_text("term123*", limit=10))[0],
+                "fts_common_ms": _time_query(lambda: store.search_text("kernel", limit=10))[0],
+                "get_ms": _time_query(lambda: store.get(f"{size // 3:016x}"))[0],
+                "delete_restore_ms": _time_query(lambda: (store.set_deleted(f"{size // 3:016x}", True),
+                                                          store.set_deleted(f"{size // 3:016x}", False)))[0],
+            }
+            if size <= legacy_max:
+                graph = {entry["id"]: entry for entry in _synthetic_entries(size)}
+                keyword = f"#{size - 1}"
+                row["legacy_keyword_full_ms"] = _time_query(
+                    lambda: [e for e in graph.values() if not e["deleted"] and
+                             (keyword in e["content"] or keyword in e.get("tags", []))], repeat=1)[0]
+                del graph
+            store.close()
+        results.append(row)
+    return results
+
+
+def benchmark_durability(ops=2000, writers=(1, 8), modes=DURABILITY_MODES):
+    """
+    المتانة مقابل الإنتاجية: لكل وضع وعدد خيوط كتابة متزامنة - عمليات/ثانية، وزمن log_entry للمستدعي
+    (p50/p99)، وعدد معاملات الالتزام (كل معاملة = fsync واحد في sync/group)
+    """
+    results = []
+    for mode in modes:
+        for count in writers:
+            with tempfile.TemporaryDirectory() as workdir:
+                store = MemoryStore(os.path.join(workdir, DB_FILENAME), durability=mode)
+                per_writer = ops // count
+                latencies = [[] for _ in range(count)]
+
+                def writer(index):
+                    for entry in _synthetic_entries(per_writer, index * per_writer):
+                        start = time.perf_counter()
+                        store.insert(entry)
+                        latencies[index].append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                threads = [threading.Thread(target=writer, args=(i,)) for i in range(count)]
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+                store.flush()
+                elapsed = time.perf_counter() - start
+                samples = sorted(x for per_thread in latencies for x in per_thread)
+                stats = store.get_commit_stats()
+                store.close()
+            results.append({
+                "mode": mode,
+                "writers": count,
+                "ops_per_s": round(len(samples) / elapsed),
+                "p50_ms": round(samples[len(samples) // 2] * 1000, 3),
+                "p99_ms": round(samples[int(len(samples) * 0.99)] * 1000, 3),
+                "commits": stats["batches"] if mode != "sync" else len(samples),
+                "avg_batch": stats["avg_batch"] if mode != "sync" else 1.0
+            })
+    return results
+
+
+def benchmark_semantic(sizes=(10_000, 100_000, 1_000_000), queries=32, k=SEMANTIC_TOP_K, chunk=50_000):
+    """
+    لكل حجم: سرعة حساب المتجهات، وزمن الاستعلام الشامل (مفرد ودفعة)، وبناء فهرس العناقيد
+    وزمن استعلامه ونسبة الاستدعاء (recall@k) مقارنة بالبحث الشامل
+    """
+    rng = random.Random(7)
+    texts = [" ".join(rng.choices(_BENCH_WORDS, k=3) + [f"term{rng.randrange(_BENCH_RARE_TERMS)}"])
+             for _ in range(queries)]
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as workdir:
+            store = MemoryStore(os.path.join(workdir, DB_FILENAME))
+            for offset in range(0, size, chunk):
+                store.insert_many(_synthetic_entries(min(chunk, size - offset), offset))
+            index = store.semantic_index()
+            start = time.perf_counter()
+            index.sync()
+            embed_s = time.perf_counter() - start
+            index.ivf = None
+            single_ms, flat = _time_query(lambda: [index.search(text, k, exact=True) for text in texts], repeat=1)
+            batch_ms, _ = _time_query(lambda: index.search(texts, k, exact=True), repeat=1)
+            start = time.perf_counter()
+            index.build_ivf()
+            ivf_build_s = time.perf_counter() - start
+            ivf_ms, approx = _time_query(lambda: index.search(texts, k), repeat=1)
+            hits = sum(len({e["id"] for e in a} & {e["id"] for e in f}) for a, f in zip(approx, flat))
+            results.append({
+                "size": size,
+                "embed_per_s": round(size / embed_s),
+                "vectors_mb": index.stats()["file_mb"],
+                "flat_query_ms": round(single_ms / queries, 3),
+                "flat_batched_query_ms": round(batch_ms / queries, 3),
+                "ivf_build_s": round(ivf_build_s, 2),
+                "ivf_lists": index.ivf.nlist,
+                "ivf_query_ms": round(ivf_ms / queries, 3),
+                "ivf_recall": round(hits / max(1, sum(len(f) for f in flat)), 3)
+            })
+            store.close()
+    return results
+
+
+def _rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError):
+        return 0.0
+
+
+def benchmark_tiering(sizes=(100_000, 1_000_000), warm_fraction=0.1, chunk=50_000):
+    """
+    لكل حجم: نقل كل ما عدا أحدث warm_fraction إلى مقاطع باردة، ثم أحجام الطبقات ونسبة الضغط،
+    وزمن القراءة من كل طبقة، وذاكرة العملية (RSS) بعد المرور على كل الإدخالات - يجب أن تبقى ثابتة مع الحجم
+    """
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as workdir:
+            store = MemoryStore(os.path.join(workdir, DB_FILENAME))
+            for offset in range(0, size, chunk):
+                store.insert_many(_synthetic_entries(min(chunk, size - offset), offset))
+            warm_from = int(size * (1 - warm_fraction))
+            before = (datetime.datetime(2024, 1, 1) + datetime.timedelta(seconds=warm_from)).isoformat()
+            start = time.perf_counter()
+            store.archive_cold(before=before, force=True)
+            archive_s = time.perf_counter() - start
+
+            cold_id, warm_id = f"{size // 3:016x}", f"{size - 1:016x}"
+            store._segment_cache.clear()
+            cold_miss_ms = _time_query(lambda: store._get_row(cold_id), repeat=1)[0]
+            cold_hit_ms = _time_query(lambda: store._get_row(cold_id))[0]
+            warm_ms = _time_query(lambda: store._get_row(warm_id))[0]
+            store.get(warm_id)
+            hot_ms = _time_query(lambda: store.get(warm_id))[0]
+            for _ in store.iter_entries():
+                pass
+            stats = store.tier_stats()
+            results.append({
+                "size": size,
+                "archive_s": round(archive_s, 2),
+                "warm_entries": stats["warm"]["entries"],
+                "cold_entries": stats["cold"]["entries"],
+                "segments": stats["cold"]["segments"],
+                "cold_raw_mb": round(stats["cold"]["raw_bytes"] / 1024 ** 2, 1),
+                "cold_stored_mb": round(stats["cold"]["stored_bytes"] / 1024 ** 2, 1),
+                "compression_ratio": stats["cold"]["compression_ratio"],
+                "hot_get_ms": hot_ms,
+                "warm_get_ms": warm_ms,
+                "cold_get_miss_ms": cold_miss_ms,
+                "cold_get_hit_ms": cold_hit_ms,
+                "rss_after_full_scan_mb": round(_rss_mb(), 1)
+            })
+            store.close()
+    return results
+
+
 # مثال استخدام أولي (يمكن إزالة)
 if __name__ == "__main__":
+    import sys
+    if "--bench" in sys.argv:
+        sizes = [int(arg) for arg in sys.argv[sys.argv.index("--bench") + 1:]] or [10_000, 1_000_000, 10_000_000]
+        for row in benchmark_storage(sizes):
+            print(row)
+        sys.exit(0)
+    if "--bench-semantic" in sys.argv:
+        sizes = [int(arg) for arg in sys.argv[sys.argv.index("--bench-semantic") + 1:]] or [10_000, 100_000]
+        for row in benchmark_semantic(sizes):
+            print(row)
+        sys.exit(0)
+    if "--bench-tiering" in sys.argv:
+        sizes = [int(arg) for arg in sys.argv[sys.argv.index("--bench-tiering") + 1:]] or [100_000, 1_000_000]
+        for row in benchmark_tiering(sizes):
+            print(row)
+        sys.exit(0)
+    if "--bench-durability" in sys.argv:
+        args = sys.argv[sys.argv.index("--bench-durability") + 1:]
+        for row in benchmark_durability(int(args[0]) if args else 2000):
+            print(row)
+        sys.exit(0)
     start_memory_engine()
     log_entry("text", "بدأ نظام Super OS الذكي التخزين طويل الأمد", tags=["start", "super_os", "init"])
     log_entry("code", "def example(): return True", tags=["code", "example"])
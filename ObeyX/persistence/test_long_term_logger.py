@@ -0,0 +1,165 @@
+import datetime
+
+import pytest
+
+import long_term_logger as lt
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # مخزن معزول في مجلد مؤقت لكل اختبار
+    monkeypatch.setattr(lt, "STORAGE_PATH", str(tmp_path))
+    lt.close_store()
+    yield lt.get_store()
+    lt.close_store()
+
+
+def test_purge_then_reopen_keeps_semantic_index_usable(store):
+    ids = [lt.log_entry("text", f"entry number {i} about networks", tags=[]) for i in range(10)]
+    store.semantic_index().sync()
+    lt.soft_delete(ids[3])
+    result = store.apply_retention(now=datetime.datetime.utcnow() + datetime.timedelta(days=3650))
+    assert result["purged"] == 1
+
+    lt.close_store()
+    for i in range(3):
+        lt.log_entry("text", f"fresh entry {i} about storage", tags=[])
+    index = lt.get_store().semantic_index()
+    assert index.sync() == 3
+
+    found = lt.search_memory("fresh entry about storage", semantic=True, limit=20)
+    contents = [entry["content"] for entry in found]
+    assert "entry number 3 about networks" not in contents
+    assert {f"fresh entry {i} about storage" for i in range(3)} <= set(contents)
+    assert len(found) == 12
+
+
+def test_hashing_embedder_is_deterministic_and_normalized():
+    np = pytest.importorskip("numpy")
+    embedder = lt.HashingEmbedder(dim=64)
+    vectors = embedder.embed(["network timeout error", "network timeout error", ""])
+    assert vectors.shape == (3, 64) and vectors.dtype == np.float32
+    assert np.array_equal(vectors[0], vectors[1])
+    assert np.linalg.norm(vectors[0]) == pytest.approx(1.0, abs=1e-6)
+    assert not vectors[2].any()
+    # التطبيع: الهاء والتاء المربوطة متطابقتان
+    same, other = embedder.embed(["الشبكة", "الشبكه"]), embedder.embed(["ذكريات"])
+    assert float(same[0] @ same[1]) == pytest.approx(1.0, abs=1e-6)
+    assert float(same[0] @ other[0]) < 0.5
+
+
+SEMANTIC_TEXTS = {
+    "voice": "تشغيل نظام الصوت والميكروفون",
+    "network": "network connection timeout error",
+    "code": "def load_model(): return torch.load(path)",
+    "sea": "ذكريات عن رحلة البحر",
+}
+
+
+def _log_semantic_entries():
+    return {key: lt.log_entry("text", text, tags=[key]) for key, text in SEMANTIC_TEXTS.items()}
+
+
+def test_exact_search_returns_nearest_entry(store):
+    pytest.importorskip("numpy")
+    _log_semantic_entries()
+    index = store.semantic_index()
+    assert index.search("network connection error", k=1, exact=True)[0]["content"] == SEMANTIC_TEXTS["network"]
+    batch = index.search(["الميكروفون والصوت", "torch load model"], k=1, exact=True)
+    assert [found[0]["content"] for found in batch] == [SEMANTIC_TEXTS["voice"], SEMANTIC_TEXTS["code"]]
+    assert index.search("network", k=1, tags=["sea"], exact=True)[0]["content"] == SEMANTIC_TEXTS["sea"]
+
+
+def test_deleted_entries_are_filtered_and_restorable(store):
+    pytest.importorskip("numpy")
+    ids = _log_semantic_entries()
+    lt.soft_delete(ids["network"])
+    found = lt.search_memory("network connection error", semantic=True, limit=len(SEMANTIC_TEXTS))
+    assert SEMANTIC_TEXTS["network"] not in [entry["content"] for entry in found]
+    assert len(found) == len(SEMANTIC_TEXTS) - 1
+    lt.restore_entry(ids["network"])
+    assert lt.search_memory("network connection error", semantic=True, limit=1)[0]["id"] == ids["network"]
+
+
+def test_sync_embeds_only_new_entries(store):
+    pytest.importorskip("numpy")
+    _log_semantic_entries()
+    index = store.semantic_index()
+    assert index.sync() == len(SEMANTIC_TEXTS)
+    assert index.sync() == 0
+    lt.log_entry("text", "backup storage disk full", tags=[])
+    lt.log_entry("text", "disk quota warning", tags=[])
+    assert index.sync() == 2
+    assert index.rows() == len(SEMANTIC_TEXTS) + 2
+
+
+def test_truncated_vector_file_is_reconciled_on_open(store):
+    pytest.importorskip("numpy")
+    ids = _log_semantic_entries()
+    index = store.semantic_index()
+    index.sync()
+    path, row_bytes = index.path, index.row_bytes
+    lt.close_store()
+    # انهيار أثناء الكتابة: آخر صف ونصف مفقودان من الملف
+    with open(path, "r+b") as f:
+        f.truncate(row_bytes * (len(SEMANTIC_TEXTS) - 2) + row_bytes // 2)
+
+    index = lt.get_store().semantic_index()
+    assert index.rows() == len(SEMANTIC_TEXTS) - 2
+    assert index.sync() == 2
+    assert index.rows() == len(SEMANTIC_TEXTS)
+    assert lt.search_memory("ذكريات البحر", semantic=True, limit=1)[0]["id"] == ids["sea"]
+
+
+def test_ivf_recall_on_clustered_vectors():
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(7)
+    centers = rng.standard_normal((40, 32)).astype(np.float32)
+    matrix = centers[rng.integers(0, 40, 4000)] + 0.3 * rng.standard_normal((4000, 32)).astype(np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    ivf = lt.IVFIndex(matrix)
+
+    queries = matrix[rng.choice(len(matrix), 50, replace=False)]
+    hits = 0
+    for query in queries:
+        exact = set(np.argsort(-(matrix @ query))[:10].tolist())
+        rows, _ = ivf.search(matrix, query, 10)
+        hits += len(exact & set(rows.tolist()))
+    assert hits / (10 * len(queries)) >= 0.9
+
+
+def test_semantic_search_through_ivf_matches_exact(store, monkeypatch):
+    pytest.importorskip("numpy")
+    monkeypatch.setattr(lt, "SEMANTIC_INDEX", "ivf")
+    _log_semantic_entries()
+    index = store.semantic_index()
+    index.sync()
+    assert index.stats()["index"] == "ivf"
+    query = "network connection error"
+    assert index.search(query, k=1)[0]["id"] == index.search(query, k=1, exact=True)[0]["id"]
+
+
+def _log_ranking_entries():
+    # الإدخال الأقدم هو الأكثر صلة، ثم إدخالات أحدث يظهر فيها المصطلح مرة واحدة بين كلمات كثيرة
+    best = lt.log_entry("text", "kernel kernel kernel", tags=["kernel"])
+    filler = " ".join(f"word{i}" for i in range(30))
+    for i in range(20):
+        lt.log_entry("text", f"kernel {filler} {i}", tags=[])
+    return best
+
+
+def test_bm25_ranks_over_all_matches_by_default(store):
+    best = _log_ranking_entries()
+    assert lt.RANK_WINDOW is None
+    results = store.search_text("kernel", limit=3)
+    assert results[0]["id"] == best
+    assert len(store.search_text("kernel", limit=None)) == 21
+
+
+def test_rank_window_is_an_explicit_recency_cap(store, monkeypatch):
+    best = _log_ranking_entries()
+    monkeypatch.setattr(lt, "RANK_WINDOW", 5)
+    results = store.search_text("kernel", limit=3)
+    assert len(results) == 3 and best not in [entry["id"] for entry in results]
+    # limit=None يرتب كل التطابقات دائماً
+    assert store.search_text("kernel", limit=None)[0]["id"] == best
@@ -1,9 +1,18 @@
 import os
-import whisper
+import sys
 import wave
 import json
-import torch
-from vosk import Model, KaldiRecognizer
+
+try:
+    from ai_core.lazy_imports import lazy_import
+except ImportError:  # تشغيل الملف مباشرة من داخل مجلده
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+    from ai_core.lazy_imports import lazy_import
+
+# المكتبات الثقيلة تُستورد عند أول استخدام فقط
+whisper = lazy_import("whisper")
+torch = lazy_import("torch")
+vosk = lazy_import("vosk")
 
 def get_cpu_load():
     try:
@@ -26,8 +35,8 @@ def transcribe_with_vosk(filename):
         wf = wave.open(filename, "rb")
         if wf.getnchannels() != 1:
             return "[Vosk Error] Only mono audio supported"
-        model = Model(lang="ar")
-        rec = KaldiRecognizer(model, wf.getframerate())
+        model = vosk.Model(lang="ar")
+        rec = vosk.KaldiRecognizer(model, wf.getframerate())
         result = ""
 
         while True:
@@ -2,14 +2,21 @@ import os
 import sys
 import json
 import shutil
-import sounddevice as sd
 import queue
 import tempfile
-import numpy as np
 import threading
 
-from vosk import Model as VoskModel, KaldiRecognizer
-import whisper
+try:
+    from ai_core.lazy_imports import lazy_import
+except ImportError:  # تشغيل الملف مباشرة من داخل مجلده
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+    from ai_core.lazy_imports import lazy_import
+
+# المكتبات الثقيلة تُستورد عند أول استخدام فقط (محرك واحد يعمل في كل مرة)
+sd = lazy_import("sounddevice")
+np = lazy_import("numpy")
+vosk = lazy_import("vosk")
+whisper = lazy_import("whisper")
 
 USE_WHISPER = False  # سيتم ضبطه تلقائيًا حسب الأداء
 
@@ -41,8 +48,8 @@ def transcribe_with_vosk(audio_file):
         print("⚠️ حمّل النموذج يدويًا وضعه في:", model_path)
         return ""
 
-    model = VoskModel(model_path)
-    rec = KaldiRecognizer(model, 16000)
+    model = vosk.Model(model_path)
+    rec = vosk.KaldiRecognizer(model, 16000)
     with open(audio_file, "rb") as f:
         data = f.read()
         if rec.AcceptWaveform(data):
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ai_core/lazy_imports.py
+# تحميل كسول للمكتبات الثقيلة (torch / whisper / vosk ...) - الاستيراد الفعلي عند أول استخدام فقط
+
+import ast
+import importlib
+import importlib.util
+import os
+import subprocess
+import sys
+import threading
+import time
+import types
+from typing import Any, Dict, List
+
+# زمن الاستيراد الفعلي لكل مكتبة كسولة (بالثواني) - يُملأ عند أول استخدام
+lazy_import_times: Dict[str, float] = {}
+_import_lock = threading.RLock()
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_REPORT_MARKER = "--lazy-imports-report-start--"
+
+
+class LazyModule(types.ModuleType):
+    """وحدة وسيطة تستورد المكتبة الحقيقية عند أول وصول إلى أي خاصية"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_target'] = None
+
+    def _load(self) -> types.ModuleType:
+        target = self.__dict__['_lazy_target']
+        if target is None:
+            with _import_lock:
+                target = self.__dict__['_lazy_target']
+                if target is None:
+                    start = time.perf_counter()
+                    target = importlib.import_module(self.__name__)
+                    lazy_import_times[self.__name__] = time.perf_counter() - start
+                    self.__dict__['_lazy_target'] = target
+        return target
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self) -> List[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__['_lazy_target'] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """إرجاع الوحدة مباشرة إن كانت مستوردة مسبقاً، وإلا وحدة كسولة تستوردها عند أول استخدام"""
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+
+def is_loaded(name: str) -> bool:
+    """هل تم استيراد المكتبة فعلياً في هذه العملية؟"""
+    return name in sys.modules
+
+
+def is_available(name: str) -> bool:
+    """التحقق من وجود المكتبة دون استيرادها"""
+    if name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+# ===== تقرير زمن الاستيراد =====
+def _script_imports(path: str) -> List[str]:
+    """استخراج جمل الاستيراد على مستوى الملف من سكربت دون تشغيله"""
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def import_time_report(target: str) -> Dict[str, Any]:
+    """
+    قياس زمن الاستيراد التراكمي لكل وحدة عبر python -X importtime في عملية نظيفة.
+    target: اسم وحدة (ai_core.smart_loader) أو مسار سكربت (main.py) - للسكربت تُقاس جمل الاستيراد فقط.
+    """
+    if target.endswith(".py"):
+        script = os.path.abspath(target)
+        cwd = os.path.dirname(script)
+        statements = _script_imports(script)
+    else:
+        cwd = PROJECT_ROOT
+        statements = [f"import {target}"]
+
+    # علامة لفصل استيرادات بدء المفسر (site) عن استيرادات الهدف
+    # وكل جملة داخل try حتى لا يوقف فشل استيراد واحد بقية القياس
+    code = "\n".join([f"import sys; sys.stderr.write({_REPORT_MARKER!r} + '\\n')"] +
+                     [f"try:\n    {stmt}\nexcept Exception:\n    pass" for stmt in statements])
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [PROJECT_ROOT, env.get("PYTHONPATH")]))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=cwd, env=env, capture_output=True, text=True)
+
+    modules = []
+    lines = proc.stderr.splitlines()
+    if _REPORT_MARKER in lines:
+        lines = lines[lines.index(_REPORT_MARKER) + 1:]
+    for line in lines:
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000
+        })
+
+    return {
+        'target': target,
+        'total_ms': round(sum(m['cumulative_ms'] for m in modules if m['depth'] == 0), 2),
+        'modules': sorted(modules, key=lambda m: m['cumulative_ms'], reverse=True)
+    }
+
+
+def print_import_report(report: Dict[str, Any], top: int = 15) -> None:
+    """طباعة أثقل الوحدات حسب الزمن التراكمي"""
+    print(f"\n📦 Import time for {report['target']}: {report['total_ms']:.1f} ms")
+    print(f"{'cumulative (ms)':>16} {'self (ms)':>10}  module")
+    for m in report['modules'][:top]:
+        print(f"{m['cumulative_ms']:>16.1f} {m['self_ms']:>10.1f}  {'  ' * m['depth']}{m['module']}")
+
+
+if __name__ == "__main__":
+    targets = sys.argv[1:] or [os.path.join(PROJECT_ROOT, "main.py"), os.path.join(PROJECT_ROOT, "run_core.py")]
+    for target in targets:
+        print_import_report(import_time_report(target))
@@ -3,38 +3,87 @@
 # obeyx_ai_core/smart_loader_pro.py
 # نظام تحميل ذكي خارق - الإصدار الاحترافي
 
+import asyncio
 import os
 import sys
 import time
 import threading
 import importlib
+import types
 import shutil
-import psutil
 import platform
-import torch
 import gc
-import requests
 import concurrent.futures
 import json
+import math
+import struct
+import zlib
 import hashlib
-import asyncio
 import subprocess
 import logging
 import traceback
-import numpy as np
+from array import array
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple, Callable
 from collections import OrderedDict, deque
 from dataclasses import dataclass, field
 
+try:
+    from ai_core.lazy_imports import lazy_import, is_available, is_loaded
+    from ai_core import weight_store
+except ImportError:  # تشغيل الملف مباشرة من داخل ai_core
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from ai_core.lazy_imports import lazy_import, is_available, is_loaded
+    from ai_core import weight_store
+
+# المكتبات الثقيلة تُستورد عند أول استخدام فقط
+psutil = lazy_import('psutil')
+torch = lazy_import('torch')
+requests = lazy_import('requests')
+np = lazy_import('numpy')
+
 # ===== إعدادات متقدمة =====
 MAX_CONCURRENT_LOAD = 4  # أقصى عدد نماذج يتم تحميلها في نفس الوقت
-MODEL_CACHE_SIZE = 5     # عدد النماذج التي تبقى في الذاكرة
+MODEL_MEMORY_BUDGET_GB: Optional[float] = None  # ميزانية ذاكرة النماذج بالجيجابايت (None = نسبة من الذاكرة الكلية)
+MODEL_MEMORY_BUDGET_RATIO = 0.6  # نسبة الذاكرة الكلية المخصصة للنماذج عند عدم تحديد الميزانية
+MIN_FREE_RAM_GB = 1.0    # الحد الأدنى للذاكرة الحرة قبل الإخلاء القسري
+CACHE_RECENCY_HALF_LIFE = 600  # ثوانٍ حتى تنخفض قيمة الاحتفاظ بنموذج غير مستخدم إلى النصف
 LOW_POWER_THRESHOLD = 20 # نسبة البطارية المتبقية لتفعيل وضع التوفير
 HIGH_TEMP_THRESHOLD = 75 # درجة الحرارة العظمى (مئوية) قبل تفعيل التبريد
 PERFORMANCE_MODES = ['extreme', 'balanced', 'power_saver']
 DEFAULT_PERFORMANCE_MODE = 'balanced'
 MODEL_REPOSITORY = "https://models.obeyx.ai/v2/"
+DEFAULT_MODEL_DEPENDENCIES = ['torch', 'transformers', 'numpy']
+MODEL_DEPENDENCIES: Dict[str, List[str]] = {}  # تبعيات خاصة ببعض النماذج
+# بيانات المحمّل المشتقة (نسخ وأوزان ولقطات) - خارج مجلد العمل حتى لا تُترك في المستودع
+DATA_DIR = os.environ.get('SMART_LOADER_DATA_DIR', os.path.expanduser("~/.super_os/smart_loader"))
+VARIANT_CACHE_DIR = os.path.join(DATA_DIR, "model_variants")  # النسخ المحوّلة (int8 / fp16) المحفوظة لتفادي إعادة التحويل
+CONVERTED_VARIANTS = ('fp16', 'int8')
+WEIGHT_STORE_DIR = os.path.join(DATA_DIR, "model_weights")  # أوزان النسخة الكاملة بصيغة mmap مشتركة بين العمليات
+WARM_SNAPSHOT_PATH = os.path.join(DATA_DIR, "smart_loader.snapshot")  # لقطة حالة المحمّل لإقلاع دافئ
+DIAGNOSTICS_RETENTION = 600   # عدد العينات الحديثة المحفوظة بدقة كاملة لكل مقياس
+DIAGNOSTICS_DOWNSAMPLE = 10   # كل 10 عينات قديمة تُختصر إلى متوسطها
+DIAGNOSTICS_HISTORY = 720     # عدد العينات المختصرة المحفوظة للبيانات الأقدم
+DIAGNOSTICS_EWMA_SPAN = 10    # مدى المتوسط المتحرك الأسي (بعدد العينات)
+MAX_ANOMALIES = 500           # أقصى عدد حالات شذوذ محفوظة
+TELEMETRY_CADENCES = {        # الفاصل بالثواني بين قياسين لكل مجس
+    'cpu': 1.0,
+    'ram': 1.0,
+    'gpu': 2.0,
+    'power': 30.0,
+    'network': 300.0
+}
+NETWORK_SPEED_TEST_URL = "https://speedtest.obeyx.ai/100mb.test"
+NETWORK_SPEED_TEST_SECONDS = 5  # أقصى مدة لتنزيل ملف قياس السرعة
+NETWORK_LATENCY_TARGET = "8.8.8.8"
+MONITOR_MIN_INTERVAL = 0.5     # فاصل المراقبة عند التقلب أو اقتراب الحرارة من الحد (ثوانٍ)
+MONITOR_BASE_INTERVAL = 2.5    # الفاصل الاعتيادي
+MONITOR_MAX_INTERVAL = 10.0    # أقصى فاصل عند خمول النظام
+MONITOR_IDLE_CPU = 10.0        # استخدام معالج (%) يُعتبر خمولاً
+MONITOR_VOLATILITY_DELTA = 15.0  # انحراف آخر قراءة عن المتوسط الأسي (%) يُعتبر تقلباً
+MONITOR_TEMP_MARGIN = 5        # درجات قبل HIGH_TEMP_THRESHOLD لبدء المراقبة السريعة
+MONITOR_OVERHEAD_BUDGET = 0.01  # أقصى نسبة من معالج واحد تستهلكها المراقبة
+WARM_SNAPSHOT_INTERVAL = 300   # ثوانٍ بين حفظين دوريين للقطة الإقلاع الدافئ
 
 # ===== هياكل البيانات المتقدمة =====
 @dataclass
@@ -46,14 +95,192 @@ class ModelMetadata:
     priority: int = 5    # 1-10 (10 = الأهم)
     last_used: float = 0
     load_count: int = 0
+    variant: str = 'full'  # full | small | fp16 | int8
+    variant_stats: Dict[str, Dict[str, float]] = field(default_factory=dict)  # الذاكرة والزمن لكل نسخة
+
+class MetricRingBuffer:
+    """مخزن دائري ثابت السعة لسلسلة زمنية مع متوسط وتباين و EWMA ومئينات متحركة بكلفة O(1) لكل عينة"""
+    
+    def __init__(self, capacity: int = DIAGNOSTICS_RETENTION, downsample: int = DIAGNOSTICS_DOWNSAMPLE,
+                 history: int = DIAGNOSTICS_HISTORY, value_range: Tuple[float, float] = (0.0, 100.0),
+                 bins: int = 200, ewma_span: int = DIAGNOSTICS_EWMA_SPAN):
+        self.capacity = capacity
+        self._data = array('d', bytes(8 * capacity))
+        self._start = 0
+        self._count = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._since_resync = 0
+        self._lock = threading.Lock()
+        self.total_samples = 0
+        
+        # المتوسط المتحرك الأسي
+        self._alpha = 2.0 / (ewma_span + 1)
+        self.ewma: Optional[float] = None
+        self.prev_ewma: Optional[float] = None   # قيمة EWMA قبل آخر عينة (خط أساس لا يتضمنها)
+        
+        # مخطط تكراري للنافذة الحالية لتقدير المئينات دون فرز
+        self._lo, self._hi = value_range
+        self._bins = bins
+        self._bin_width = (self._hi - self._lo) / bins
+        self._hist = array('q', [0]) * bins
+        
+        # البيانات الأقدم تُختصر إلى متوسطات في مخزن ثانٍ
+        self.downsample = downsample
+        self.history = MetricRingBuffer(history, 0, 0, value_range, bins, ewma_span) if downsample and history else None
+        self._pending_sum = 0.0
+        self._pending_count = 0
+    
+    def _bin(self, value: float) -> int:
+        index = int((value - self._lo) / self._bin_width)
+        return min(max(index, 0), self._bins - 1)
+    
+    def append(self, value: float) -> None:
+        value = float(value)
+        with self._lock:
+            if self._count == self.capacity:
+                evicted = self._data[self._start]
+                self._data[self._start] = value
+                self._start = (self._start + 1) % self.capacity
+                self._sum -= evicted
+                self._sumsq -= evicted * evicted
+                self._hist[self._bin(evicted)] -= 1
+                self._downsample_evicted(evicted)
+                self._since_resync += 1
+            else:
+                self._data[(self._start + self._count) % self.capacity] = value
+                self._count += 1
+            
+            self._sum += value
+            self._sumsq += value * value
+            if self._since_resync >= self.capacity:
+                self._resync()
+            self._hist[self._bin(value)] += 1
+            self.prev_ewma = self.ewma
+            self.ewma = value if self.ewma is None else self.ewma + self._alpha * (value - self.ewma)
+            self.total_samples += 1
+    
+    def latest_sample(self) -> Tuple[int, Optional[float], Optional[float]]:
+        """(رقم آخر عينة، قيمتها، EWMA قبلها) بقراءة ذرية واحدة"""
+        with self._lock:
+            if not self._count:
+                return self.total_samples, None, self.prev_ewma
+            latest = self._data[(self._start + self._count - 1) % self.capacity]
+            return self.total_samples, latest, self.prev_ewma
+    
+    def _downsample_evicted(self, value: float) -> None:
+        if self.history is None:
+            return
+        self._pending_sum += value
+        self._pending_count += 1
+        if self._pending_count >= self.downsample:
+            self.history.append(self._pending_sum / self._pending_count)
+            self._pending_sum = 0.0
+            self._pending_count = 0
+    
+    def _resync(self) -> None:
+        """إعادة حساب المجاميع لتفادي تراكم أخطاء الفاصلة العائمة (كلفة O(1) مستهلكة)"""
+        values = self._ordered()
+        self._sum = sum(values)
+        self._sumsq = sum(v * v for v in values)
+        self._since_resync = 0
+    
+    def _ordered(self) -> List[float]:
+        end = self._start + self._count
+        if end <= self.capacity:
+            return self._data[self._start:end].tolist()
+        return self._data[self._start:].tolist() + self._data[:end - self.capacity].tolist()
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.to_list()[index]
+        with self._lock:
+            return self._item(index)
+    
+    def _item(self, index: int) -> float:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("MetricRingBuffer index out of range")
+        return self._data[(self._start + index) % self.capacity]
+    
+    def __iter__(self):
+        return iter(self.to_list())
+    
+    def to_list(self) -> List[float]:
+        with self._lock:
+            return self._ordered()
+    
+    # الدوال ذات الشرطة السفلية تفترض أن القفل محجوز، والعامة تحجزه (append يعدل المجاميع من خيط آخر)
+    def _mean(self) -> float:
+        return self._sum / self._count if self._count else 0.0
+    
+    def _variance(self) -> float:
+        if not self._count:
+            return 0.0
+        mean = self._sum / self._count
+        return max(self._sumsq / self._count - mean * mean, 0.0)
+    
+    def _percentile(self, q: float) -> float:
+        if not self._count:
+            return 0.0
+        target = q / 100 * self._count
+        cumulative = 0
+        for index, count in enumerate(self._hist):
+            if count and cumulative + count >= target:
+                fraction = (target - cumulative) / count
+                return self._lo + (index + fraction) * self._bin_width
+            cumulative += count
+        return self._hi
+    
+    def mean(self) -> float:
+        with self._lock:
+            return self._mean()
+    
+    def variance(self) -> float:
+        with self._lock:
+            return self._variance()
+    
+    def percentile(self, q: float) -> float:
+        """تقدير المئين q (0-100) من المخطط التكراري مع استيفاء خطي داخل الخانة"""
+        with self._lock:
+            return self._percentile(q)
+    
+    def stats(self) -> Dict[str, float]:
+        """كل القيم من لقطة واحدة متسقة"""
+        with self._lock:
+            return {
+                'count': self._count,
+                'latest': self._item(-1) if self._count else 0.0,
+                'mean': round(self._mean(), 3),
+                'std': round(math.sqrt(self._variance()), 3),
+                'ewma': round(self.ewma, 3) if self.ewma is not None else 0.0,
+                'p50': round(self._percentile(50), 3),
+                'p95': round(self._percentile(95), 3),
+                'p99': round(self._percentile(99), 3)
+            }
 
 @dataclass
 class SystemDiagnostics:
-    cpu_usage: List[float] = field(default_factory=list)
-    ram_usage: List[float] = field(default_factory=list)
-    gpu_usage: List[float] = field(default_factory=list)
-    network_usage: List[float] = field(default_factory=list)
-    anomalies: List[Dict] = field(default_factory=list)
+    cpu_usage: MetricRingBuffer = field(default_factory=MetricRingBuffer)
+    ram_usage: MetricRingBuffer = field(default_factory=MetricRingBuffer)
+    gpu_usage: MetricRingBuffer = field(default_factory=MetricRingBuffer)
+    network_usage: MetricRingBuffer = field(default_factory=lambda: MetricRingBuffer(value_range=(0.0, 1000.0)))  # MB/s
+    anomalies: deque = field(default_factory=lambda: deque(maxlen=MAX_ANOMALIES))
+    
+    def metrics(self) -> Dict[str, MetricRingBuffer]:
+        return {'cpu': self.cpu_usage, 'ram': self.ram_usage, 'gpu': self.gpu_usage, 'network': self.network_usage}
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    evicted_gb: float = 0.0
+    coalesced: int = 0  # طلبات انتظرت تحميلاً جارياً بدلاً من تكراره
 
 # ===== حالة النظام =====
 loaded_models: Dict[str, Any] = OrderedDict()
@@ -66,7 +293,10 @@ model_response_times: Dict[str, float] = {}
 live_status: Dict[str, Any] = {}
 diagnostics_data = SystemDiagnostics()
 performance_mode: str = DEFAULT_PERFORMANCE_MODE
-model_cache = OrderedDict()  # LRU Cache للنماذج
+model_cache = OrderedDict()  # ذاكرة النماذج المحكومة بميزانية الذاكرة
+cache_stats = CacheStats()
+state_lock = threading.RLock()  # يحمي loaded_models و model_cache و model_metadata
+inflight_loads: Dict[str, concurrent.futures.Future] = {}  # تحميل واحد جارٍ لكل نموذج
 adaptive_learning = {
     'model_usage_patterns': {},
     'system_behavior': {}
@@ -112,84 +342,247 @@ class SmartLogger:
 logger = SmartLogger()
 
 # ===== فحص بيئة النظام المتقدم =====
-def scan_system() -> Dict[str, Any]:
-    """فحص شامل للنظام مع جمع بيانات متقدمة"""
+# ----- المجسات (كل مجس قراءة واحدة غير حاجبة قدر الإمكان) -----
+def sample_cpu() -> Dict[str, Any]:
+    """قراءة المعالج: الاستخدام منذ القراءة السابقة (دون انتظار) والتردد والحرارة"""
+    freq = psutil.cpu_freq() if hasattr(psutil, 'cpu_freq') else None
+    cpu_info = {
+        'cores': psutil.cpu_count(logical=False),
+        'logical_cores': psutil.cpu_count(logical=True),
+        'usage': psutil.cpu_percent(interval=None),
+        'freq': freq.current if freq else None
+    }
+    temps = psutil.sensors_temperatures() if hasattr(psutil, 'sensors_temperatures') else {}
+    readings = [t.current for group in (temps or {}).values() for t in group if t.current]
+    if readings:
+        cpu_info['temp'] = max(readings)
+    return cpu_info
+
+def sample_ram() -> Dict[str, Any]:
+    """قراءة الذاكرة"""
+    mem = psutil.virtual_memory()
+    return {
+        'total': round(mem.total / (1024**3), 2),
+        'available': round(mem.available / (1024**3), 2),
+        'used': round(mem.used / (1024**3), 2),
+        'percent': mem.percent
+    }
+
+def sample_gpu() -> Dict[str, Any]:
+    """قراءة GPU - فقط بعد أن يستورد أحد النماذج torch (لا نستورده من أجل القياس)"""
+    if not is_loaded('torch') or not torch.cuda.is_available():
+        return {}
+    gpu_info = {
+        'name': torch.cuda.get_device_name(0),
+        'memory_total': round(torch.cuda.get_device_properties(0).total_memory / (1024**3), 2),
+        'memory_allocated': round(torch.cuda.memory_allocated(0) / (1024**3), 2),
+        'memory_cached': round(torch.cuda.memory_reserved(0) / (1024**3), 2)
+    }
     try:
-        # معلومات المعالج
-        cpu_info = {
-            'cores': psutil.cpu_count(logical=False),
-            'logical_cores': psutil.cpu_count(logical=True),
-            'usage': psutil.cpu_percent(interval=0.5),
-            'freq': psutil.cpu_freq().current if hasattr(psutil, 'cpu_freq') else None
-        }
-        
-        # معلومات الذاكرة
-        mem = psutil.virtual_memory()
-        ram_info = {
-            'total': round(mem.total / (1024**3), 2),
-            'available': round(mem.available / (1024**3), 2),
-            'used': round(mem.used / (1024**3), 2),
-            'percent': mem.percent
-        }
-        
-        # معلومات GPU
-        gpu_info = {}
-        if torch.cuda.is_available():
-            gpu_info = {
-                'name': torch.cuda.get_device_name(0),
-                'memory_total': round(torch.cuda.get_device_properties(0).total_memory / (1024**3), 2),
-                'memory_allocated': round(torch.cuda.memory_allocated(0) / (1024**3), 2),
-                'memory_cached': round(torch.cuda.memory_reserved(0) / (1024**3), 2)
-            }
-        
-        # معلومات النظام
-        os_info = {
-            'system': platform.system(),
-            'release': platform.release(),
-            'version': platform.version(),
-            'machine': platform.machine()
-        }
-        
-        # معلومات الشبكة
-        net_info = {
-            'speed': get_network_speed(),
-            'latency': get_network_latency()
+        gpu_info['utilization'] = torch.cuda.utilization()
+    except Exception:
+        pass  # يتطلب pynvml
+    return gpu_info
+
+def _library_version(name: str) -> Optional[str]:
+    """إصدار المكتبة من بيانات التثبيت دون استيرادها"""
+    try:
+        from importlib.metadata import version
+        return version(name)
+    except Exception:
+        return None
+
+_TORCH_VERSION = _library_version('torch')
+
+OS_INFO = {
+    'system': platform.system(),
+    'release': platform.release(),
+    'version': platform.version(),
+    'machine': platform.machine()
+}
+
+class TelemetrySampler:
+    """
+    جمع قياسات النظام في خيط خلفي، لكل مجس وتيرته المستقلة.
+    آخر القيم تُحفظ في لقطة مشتركة فتصبح قراءتها O(1).
+    المجسات الحاجبة (مثل الشبكة) تعمل في خيط مستقل حتى لا تؤخر بقية المجسات.
+    """
+    
+    def __init__(self, cadences: Optional[Dict[str, float]] = None,
+                 probes: Optional[Dict[str, Callable[[], Any]]] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 blocking_probes: Tuple[str, ...] = ('network',)):
+        self.probes = probes if probes is not None else {
+            'cpu': sample_cpu,
+            'ram': sample_ram,
+            'gpu': sample_gpu,
+            'power': get_power_status,
+            'network': probe_network
         }
-        
-        # معلومات الطاقة
-        power_info = get_power_status()
+        self.cadences = {name: TELEMETRY_CADENCES.get(name, 5.0) for name in self.probes}
+        self.cadences.update(cadences or {})
+        self.clock = clock
+        self.blocking_probes = set(blocking_probes)
+        self._latest: Dict[str, Any] = {}
+        self._sampled_at: Dict[str, float] = {}
+        self._next_due: Dict[str, float] = {name: 0.0 for name in self.probes}
+        self._in_flight: set = set()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.sample_counts: Dict[str, int] = {name: 0 for name in self.probes}
+    
+    def sample(self, name: str) -> None:
+        """تشغيل مجس واحد وتخزين نتيجته"""
+        try:
+            value = self.probes[name]()
+        except Exception as e:
+            logger.log(f"Telemetry probe '{name}' failed: {e}", 'warning')
+            value = None
+        finally:
+            with self._lock:
+                self._in_flight.discard(name)
+        if value is None:
+            return
+        with self._lock:
+            self._latest[name] = value
+            self._sampled_at[name] = self.clock()
+            self.sample_counts[name] += 1
+        record_telemetry(name, value)
+    
+    def run_due(self, now: Optional[float] = None) -> List[str]:
+        """تشغيل المجسات المستحقة - يستدعيها الخيط الخلفي، أو الاختبارات مباشرة بساعة وهمية"""
+        now = self.clock() if now is None else now
+        started = []
+        for name, due in self._next_due.items():
+            if due > now:
+                continue
+            self._next_due[name] = now + self.cadences[name]
+            with self._lock:
+                if name in self._in_flight:  # القياس السابق لم ينته بعد
+                    continue
+                self._in_flight.add(name)
+            if name in self.blocking_probes:
+                threading.Thread(target=self.sample, args=(name,), name=f"telemetry-{name}", daemon=True).start()
+            else:
+                self.sample(name)
+            started.append(name)
+        return started
+    
+    def seconds_until_next(self, now: Optional[float] = None) -> float:
+        now = self.clock() if now is None else now
+        return max(0.0, min(self._next_due.values()) - now)
+    
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self.run_due()
+            self._stop_event.wait(max(0.05, self.seconds_until_next()))
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='telemetry-sampler', daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """أحدث القيم لكل مجس (نسخة سطحية)"""
+        with self._lock:
+            return dict(self._latest)
+    
+    def ages(self) -> Dict[str, float]:
+        """عمر آخر قياس لكل مجس بالثواني"""
+        now = self.clock()
+        with self._lock:
+            return {name: round(now - at, 3) for name, at in self._sampled_at.items()}
+
+def record_telemetry(name: str, value: Any) -> None:
+    """إضافة القياس إلى سلاسل التشخيص الزمنية"""
+    if name == 'cpu' and value.get('usage') is not None:
+        diagnostics_data.cpu_usage.append(value['usage'])
+    elif name == 'ram':
+        diagnostics_data.ram_usage.append(value['percent'])
+    elif name == 'gpu' and 'utilization' in value:
+        diagnostics_data.gpu_usage.append(value['utilization'])
+    elif name == 'network':
+        diagnostics_data.network_usage.append(value['speed'])
+
+telemetry_sampler: Optional[TelemetrySampler] = None
+_telemetry_lock = threading.Lock()
+
+def ensure_telemetry_sampler() -> TelemetrySampler:
+    """تشغيل جامع القياسات مرة واحدة مع قراءة أولية سريعة للمجسات غير الحاجبة"""
+    global telemetry_sampler
+    with _telemetry_lock:
+        if telemetry_sampler is None:
+            telemetry_sampler = TelemetrySampler()
+        if not telemetry_sampler.running:
+            telemetry_sampler.run_due()
+            telemetry_sampler.start()
+        return telemetry_sampler
+
+def stop_telemetry_sampler() -> None:
+    """إيقاف جامع القياسات"""
+    if telemetry_sampler is not None:
+        telemetry_sampler.stop()
+
+def scan_system() -> Dict[str, Any]:
+    """تقرير النظام من أحدث القياسات التي جمعها الخيط الخلفي - قراءة فورية دون انتظار أي مجس"""
+    try:
+        sampler = ensure_telemetry_sampler()
+        latest = sampler.snapshot()
+        cpu_info = latest.get('cpu', {})
+        ram_info = latest.get('ram', {})
+        gpu_info = latest.get('gpu', {})
         
         # تحديث تقرير النظام
         system_report.update({
             'cpu': cpu_info,
             'ram': ram_info,
             'gpu': gpu_info,
-            'os': os_info,
-            'torch_version': torch.__version__,
+            'os': OS_INFO,
+            'torch_version': _TORCH_VERSION,
             'python_version': platform.python_version(),
-            'network': net_info,
-            'power': power_info,
+            'network': latest.get('network', {}),
+            'power': latest.get('power', {}),
+            'telemetry_age': sampler.ages(),
             'timestamp': time.time(),
             'performance_mode': performance_mode
         })
         
-        logger.log(f"✅ System Scan: CPU={cpu_info['usage']}% | RAM={ram_info['used']}/{ram_info['total']}GB | GPU={gpu_info.get('name', 'None')}", 'info')
+        logger.log(f"✅ System Scan: CPU={cpu_info.get('usage')}% | RAM={ram_info.get('used')}/{ram_info.get('total')}GB | GPU={gpu_info.get('name', 'None')}", 'debug')
         return system_report
     except Exception as e:
         logger.log(f"System scan failed: {traceback.format_exc()}", 'error')
         return {}
 
+def probe_network() -> Dict[str, float]:
+    """قياس سرعة الشبكة وزمن الوصول (مجس حاجب - يعمل في خيط جامع القياسات)"""
+    return {
+        'speed': get_network_speed(),
+        'latency': get_network_latency()
+    }
+
 def get_network_speed() -> float:
     """قياس سرعة الشبكة بدقة عالية"""
     try:
-        test_file = "https://speedtest.obeyx.ai/100mb.test"
         start = time.perf_counter()
-        with requests.get(test_file, stream=True, timeout=10) as r:
+        with requests.get(NETWORK_SPEED_TEST_URL, stream=True, timeout=10) as r:
             r.raise_for_status()
             total_bytes = 0
             for chunk in r.iter_content(chunk_size=8192):
                 total_bytes += len(chunk)
-                if time.perf_counter() - start > 5:  # الحد الأقصى 5 ثوان
+                if time.perf_counter() - start > NETWORK_SPEED_TEST_SECONDS:
                     break
         elapsed = time.perf_counter() - start
         speed = (total_bytes / (1024**2)) / elapsed  # MB/s
@@ -200,9 +593,8 @@ def get_network_speed() -> float:
 def get_network_latency() -> float:
     """قياس زمن الوصول للشبكة"""
     try:
-        target = "8.8.8.8"
         start = time.perf_counter()
-        subprocess.run(["ping", "-c", "1", target], stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=2)
+        subprocess.run(["ping", "-c", "1", NETWORK_LATENCY_TARGET], stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=2)
         return round((time.perf_counter() - start) * 1000, 2)  # مللي ثانية
     except:
         return -1.0
@@ -222,16 +614,47 @@ def get_power_status() -> Dict[str, Any]:
 
 # ===== نظام تحميل النماذج المتقدم =====
 def load_model(name: str, priority: int = 5, preload_only: bool = False) -> Any:
-    """تحميل النموذج مع إدارة ذكية للذاكرة"""
-    start_time = time.perf_counter()
+    """تحميل النموذج مع إدارة ذكية للذاكرة - الطلبات المتزامنة لنفس النموذج تنتظر تحميلاً واحداً"""
+    with state_lock:
+        # التحقق من وجود النموذج في ذاكرة التخزين المؤقت
+        if name in model_cache:
+            model = model_cache[name]
+            model_metadata[name].last_used = time.time()
+            model_metadata[name].load_count += 1
+            cache_stats.hits += 1
+            logger.log(f"⚡️ Model '{name}' served from cache (Priority: {priority})", 'info')
+            return model
+        
+        # الانضمام إلى تحميل جارٍ لنفس النموذج بدلاً من تكراره
+        future = inflight_loads.get(name)
+        is_owner = future is None
+        if is_owner:
+            cache_stats.misses += 1
+            future = concurrent.futures.Future()
+            inflight_loads[name] = future
+        else:
+            cache_stats.coalesced += 1
     
-    # التحقق من وجود النموذج في ذاكرة التخزين المؤقت
-    if name in model_cache:
-        model = model_cache[name]
-        model_metadata[name].last_used = time.time()
-        model_metadata[name].load_count += 1
-        logger.log(f"⚡️ Model '{name}' served from cache (Priority: {priority})", 'info')
-        return model
+    if not is_owner:
+        logger.log(f"⏳ Model '{name}' is already loading - waiting for it", 'debug')
+        model = future.result()
+        return model if not preload_only else None
+    
+    try:
+        model = _load_model_uncached(name, priority)
+        future.set_result(model)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with state_lock:
+            inflight_loads.pop(name, None)
+    
+    return model if not preload_only else None
+
+def _load_model_uncached(name: str, priority: int) -> Any:
+    """تحميل النموذج فعلياً وتسجيله (يُستدعى من مالك التحميل فقط)"""
+    start_time = time.perf_counter()
     
     # التحقق من التبعيات
     if not check_dependencies(name):
@@ -244,39 +667,72 @@ def load_model(name: str, priority: int = 5, preload_only: bool = False) -> Any:
         module_name = f"models.{name}_loader"
         model_module = importlib.import_module(module_name)
         
-        # استدعاء دالة التحميل
-        loader_func = getattr(model_module, f"load_{name}")
-        
-        # تحميل النموذج مع معلمات الأداء
-        model = loader_func(performance_mode=performance_mode)
+        # اختيار النسخة المناسبة لوضع الأداء (كاملة / أصغر / fp16 / int8)
+        variant = select_model_variant(name)
         
-        # تسجيل النموذج
-        loaded_models[name] = model
-        model_cache[name] = model
-        model_cache.move_to_end(name)  # تحديث الترتيب في ذاكرة التخزين المؤقت
+        # تحميل النموذج (مع قياس الذاكرة المقيمة قبل وبعد)
+        rss_before = get_process_rss()
+        model = load_cached_variant(name, variant, model_module)
+        source = 'cache'
+        if model is None and variant == 'full':
+            model = load_mapped_model(name, model_module)
+            source = 'mmap'
+        if model is None:
+            source = 'loader'
+            loader_func = getattr(model_module, f"load_{name}_small" if variant == 'small' else f"load_{name}")
+            model = loader_func(performance_mode=performance_mode)
+            if variant in CONVERTED_VARIANTS:
+                model, converted = convert_model_variant(model, variant)
+                if converted:
+                    save_variant_artifact(name, variant, model, model_module)
+                else:
+                    variant = 'full'
+            if variant == 'full':
+                save_mapped_weights(name, model_module, model)
+        rss_delta = get_process_rss() - rss_before
+        memory_usage = estimate_model_memory(name, model, rss_delta)
         
-        # تحديث البيانات الوصفية
-        if name not in model_metadata:
-            model_metadata[name] = ModelMetadata(
-                name=name,
-                version=get_model_version(name),
-                dependencies=get_model_dependencies(name),
-                memory_usage=estimate_model_memory(name, model),
-                priority=priority
-            )
-        
-        model_metadata[name].last_used = time.time()
-        model_metadata[name].load_count += 1
-        
-        # تسجيل زمن التحميل
-        elapsed = round(time.perf_counter() - start_time, 2)
-        model_response_times[name] = elapsed
-        logger.log(f"🔁 Model '{name}' loaded in {elapsed}s (Priority: {priority})", 'info')
-        
-        # التكيف مع نمط الاستخدام
-        adaptive_learning['model_usage_patterns'][name] = adaptive_learning['model_usage_patterns'].get(name, 0) + 1
+        with state_lock:
+            # تسجيل النموذج
+            loaded_models[name] = model
+            model_cache[name] = model
+            model_cache.move_to_end(name)  # تحديث الترتيب في ذاكرة التخزين المؤقت
+            
+            # تحديث البيانات الوصفية
+            if name not in model_metadata:
+                model_metadata[name] = ModelMetadata(
+                    name=name,
+                    version=get_model_version(name),
+                    dependencies=get_model_dependencies(name),
+                    memory_usage=0.0,
+                    priority=priority
+                )
+            
+            metadata = model_metadata[name]
+            metadata.memory_usage = memory_usage
+            metadata.last_used = time.time()
+            metadata.load_count += 1
+            
+            # تسجيل زمن التحميل
+            elapsed = round(time.perf_counter() - start_time, 2)
+            model_response_times[name] = elapsed
+            
+            # قياسات النسخة المحمّلة
+            metadata.variant = variant
+            metadata.variant_stats.setdefault(variant, {}).update({
+                'memory_gb': memory_usage,
+                'load_time': elapsed,
+                'source': source  # loader | cache | mmap
+            })
+            
+            # التكيف مع نمط الاستخدام
+            adaptive_learning['model_usage_patterns'][name] = adaptive_learning['model_usage_patterns'].get(name, 0) + 1
+            
+            # احترام ميزانية الذاكرة بعد إضافة النموذج الجديد
+            manage_model_cache(protect=name)
         
-        return model if not preload_only else None
+        logger.log(f"🔁 Model '{name}' [{variant}] loaded in {elapsed}s (Priority: {priority})", 'info')
+        return model
         
     except Exception as e:
         logger.log(f"Failed to load model '{name}': {traceback.format_exc()}", 'error')
@@ -285,48 +741,95 @@ def load_model(name: str, priority: int = 5, preload_only: bool = False) -> Any:
 def unload_model(name: str) -> bool:
     """تفريغ النموذج من الذاكرة"""
     try:
-        if name in loaded_models:
-            # تنظيف النموذج إذا كان يدعم ذلك
-            if hasattr(loaded_models[name], 'cleanup'):
-                loaded_models[name].cleanup()
-            
-            # حذف النموذج
-            del loaded_models[name]
-            
-            # حذف من ذاكرة التخزين المؤقت
-            if name in model_cache:
-                del model_cache[name]
-            
-            logger.log(f"♻️ Unloaded model '{name}' to free memory", 'info')
-            return True
-        return False
+        with state_lock:
+            if name in loaded_models:
+                # تنظيف النموذج إذا كان يدعم ذلك
+                if hasattr(loaded_models[name], 'cleanup'):
+                    loaded_models[name].cleanup()
+                
+                # حذف النموذج
+                del loaded_models[name]
+                
+                # حذف من ذاكرة التخزين المؤقت
+                if name in model_cache:
+                    del model_cache[name]
+                
+                logger.log(f"♻️ Unloaded model '{name}' to free memory", 'info')
+                return True
+            return False
     except Exception as e:
         logger.log(f"Failed to unload model '{name}': {e}", 'error')
         return False
 
-def manage_model_cache() -> None:
-    """إدارة ذاكرة التخزين المؤقت للنماذج بناءً على الاستخدام والذاكرة المتاحة"""
-    # تفريغ النماذج الأقل استخدامًا عند الحاجة
-    while len(model_cache) > MODEL_CACHE_SIZE:
-        name, _ = model_cache.popitem(last=False)
-        unload_model(name)
-    
-    # تفريغ إضافي عند انخفاض الذاكرة
-    mem_available = system_report.get('ram', {}).get('available', 0)
-    if mem_available < 1.0:  # أقل من 1GB متاحة
-        logger.log("⚠️ Low memory detected - freeing model cache", 'warning')
-        for name in list(model_cache.keys())[:-2]:  # الاحتفاظ بنموذجين فقط
-            if name in model_cache:
-                unload_model(name)
+def get_model_memory_budget() -> float:
+    """ميزانية الذاكرة المتاحة للنماذج بالجيجابايت"""
+    if MODEL_MEMORY_BUDGET_GB is not None:
+        return MODEL_MEMORY_BUDGET_GB
+    total = system_report.get('ram', {}).get('total') or psutil.virtual_memory().total / (1024**3)
+    return round(total * MODEL_MEMORY_BUDGET_RATIO, 2)
+
+def cached_models_memory() -> float:
+    """إجمالي الذاكرة المقاسة للنماذج الموجودة في ذاكرة التخزين المؤقت"""
+    return sum(model_metadata[name].memory_usage for name in model_cache if name in model_metadata)
+
+def model_retention_score(name: str, now: Optional[float] = None) -> float:
+    """قيمة الاحتفاظ بالنموذج لكل جيجابايت - النماذج ذات القيمة الأقل تُخلى أولاً"""
+    metadata = model_metadata.get(name)
+    if metadata is None:
+        return 0.0
+    age = max(0.0, (now or time.time()) - metadata.last_used)
+    recency = 0.5 ** (age / CACHE_RECENCY_HALF_LIFE)
+    reload_cost = model_response_times.get(name, 0.0) + 0.1  # ثوانٍ لإعادة التحميل
+    return (metadata.priority / 10) * reload_cost * recency / max(metadata.memory_usage, 0.01)
+
+def manage_model_cache(protect: Optional[str] = None) -> None:
+    """إخلاء النماذج حسب ميزانية الذاكرة وكلفة إعادة تحميلها"""
+    with state_lock:
+        budget = get_model_memory_budget()
+        used = cached_models_memory()
+        
+        # تقليص الميزانية عند انخفاض الذاكرة الحرة في النظام
+        mem_available = system_report.get('ram', {}).get('available')
+        if mem_available is not None and mem_available < MIN_FREE_RAM_GB:
+            logger.log("⚠️ Low memory detected - shrinking model cache", 'warning')
+            budget = min(budget, used - (MIN_FREE_RAM_GB - mem_available))
+        
+        if used <= budget:
+            return
+        
+        now = time.time()
+        candidates = sorted((name for name in model_cache if name != protect),
+                            key=lambda name: model_retention_score(name, now))
+        for name in candidates:
+            if used <= budget:
+                break
+            size = model_metadata[name].memory_usage if name in model_metadata else 0.0
+            if unload_model(name):
+                used -= size
+                cache_stats.evictions += 1
+                cache_stats.evicted_gb += size
+                logger.log(f"📉 Evicted '{name}' ({size:.2f}GB) - cache at {used:.2f}/{budget:.2f}GB", 'info')
+
+def get_cache_stats() -> Dict[str, Any]:
+    """إحصائيات ذاكرة النماذج (إصابات، إخفاقات، إخلاءات)"""
+    with state_lock:
+        lookups = cache_stats.hits + cache_stats.misses
+        return {
+            'hits': cache_stats.hits,
+            'misses': cache_stats.misses,
+            'coalesced': cache_stats.coalesced,
+            'evictions': cache_stats.evictions,
+            'evicted_gb': round(cache_stats.evicted_gb, 3),
+            'hit_rate': round(cache_stats.hits / lookups, 3) if lookups else 0.0,
+            'used_gb': round(cached_models_memory(), 3),
+            'budget_gb': get_model_memory_budget()
+        }
 
 def check_dependencies(model_name: str) -> bool:
     """التحقق من تبعيات النموذج"""
-    # محاكاة للتبعيات - في التنفيذ الحقيقي سيتم التحقق من التبعيات الفعلية
-    required_deps = ['torch', 'transformers', 'numpy']
+    required_deps = MODEL_DEPENDENCIES.get(model_name, DEFAULT_MODEL_DEPENDENCIES)
     for dep in required_deps:
-        try:
-            importlib.import_module(dep)
-        except ImportError:
+        if not is_available(dep):  # التحقق دون استيراد المكتبة
             logger.log(f"❌ Missing dependency '{dep}' for model '{model_name}'", 'error')
             return False
     return True
@@ -339,14 +842,253 @@ def get_model_dependencies(model_name: str) -> List[str]:
     """الحصول على تبعيات النموذج (محاكاة)"""
     return ['torch>=1.10', 'transformers>=4.18']  # في التنفيذ الحقيقي سيتم قراءة من ملف تعريف
 
-def estimate_model_memory(model_name: str, model_obj: Any) -> float:
-    """تقدير استخدام الذاكرة للنموذج"""
-    # محاكاة - في التنفيذ الحقيقي سيتم قياس الذاكرة الفعلية
-    if 'llm' in model_name:
-        return 3.2
-    elif 'vision' in model_name:
-        return 1.8
-    return 0.5
+def get_process_rss() -> float:
+    """الذاكرة المقيمة للعملية الحالية بالجيجابايت"""
+    try:
+        return psutil.Process().memory_info().rss / (1024**3)
+    except Exception:
+        return 0.0
+
+def measure_tensor_memory(model_obj: Any) -> float:
+    """قياس حجم الأوزان الفعلي (معاملات ومخازن Torch أو مصفوفات NumPy) بالجيجابايت"""
+    if hasattr(model_obj, 'get_memory_footprint'):  # نماذج transformers
+        try:
+            return model_obj.get_memory_footprint() / (1024**3)
+        except Exception:
+            pass
+    
+    # مكتبة لم تُستورد بعد لا يمكن أن تكون قد أنشأت أوزان النموذج - لا داعي لاستيرادها للفحص
+    torch_loaded, numpy_loaded = is_loaded('torch'), is_loaded('numpy')
+    array_types = ((torch.Tensor,) if torch_loaded else ()) + ((np.ndarray,) if numpy_loaded else ())
+    
+    tensors = []
+    if torch_loaded and isinstance(model_obj, torch.nn.Module):
+        tensors = list(model_obj.parameters()) + list(model_obj.buffers())
+        # الأوزان المكممة (int8) محفوظة كمعاملات معبأة داخل state_dict وليست ضمن parameters()
+        for value in model_obj.state_dict().values():
+            values = value if isinstance(value, tuple) else (value,)
+            tensors.extend(v for v in values if isinstance(v, torch.Tensor))
+    elif array_types and isinstance(model_obj, array_types):
+        tensors = [model_obj]
+    elif isinstance(model_obj, dict):
+        tensors = [v for v in model_obj.values() if array_types and isinstance(v, array_types)]
+    elif hasattr(model_obj, 'model') and model_obj.model is not model_obj:
+        return measure_tensor_memory(model_obj.model)
+    
+    total_bytes = 0
+    seen = set()
+    for tensor in tensors:
+        if numpy_loaded and isinstance(tensor, np.ndarray):
+            total_bytes += tensor.nbytes
+            continue
+        key = (tensor.device, tensor.data_ptr())
+        if key in seen:  # أوزان مشتركة بين طبقات
+            continue
+        seen.add(key)
+        total_bytes += tensor.numel() * tensor.element_size()
+    return total_bytes / (1024**3)
+
+def estimate_model_memory(model_name: str, model_obj: Any, rss_delta: float = 0.0) -> float:
+    """قياس استخدام الذاكرة الفعلي للنموذج (الأوزان أولاً ثم فرق الذاكرة المقيمة)"""
+    tensor_memory = measure_tensor_memory(model_obj)
+    if tensor_memory > 0:
+        return round(tensor_memory, 4)
+    return round(max(rss_delta, 0.0), 4)
+
+# ===== النسخ الخفيفة للنماذج (تكميم / دقة أقل / نقاط حفظ أصغر) =====
+def select_model_variant(name: str) -> str:
+    """اختيار نسخة النموذج: كاملة عادةً، وأخف في وضع توفير الطاقة أو عند ارتفاع الحرارة"""
+    overheated = (system_report.get('cpu', {}).get('temp', 0) or 0) > HIGH_TEMP_THRESHOLD
+    if performance_mode != 'power_saver' and not overheated:
+        return 'full'
+    
+    # نقطة حفظ أصغر يوفرها ملف التحميل نفسه لها الأولوية
+    try:
+        if hasattr(importlib.import_module(f"models.{name}_loader"), f"load_{name}_small"):
+            return 'small'
+    except ImportError:
+        pass
+    
+    # fp16 على GPU، وتكميم int8 ديناميكي على المعالج
+    if is_loaded('torch') and torch.cuda.is_available():
+        return 'fp16'
+    return 'int8'
+
+def variant_cache_path(name: str, variant: str) -> str:
+    """مسار النسخة المحوّلة - مرتبط بإصدار النموذج وإصدار torch"""
+    return os.path.join(VARIANT_CACHE_DIR,
+                        f"{name}-{get_model_version(name)}-{variant}-torch{_TORCH_VERSION}.safetensors")
+
+def convert_model_variant(model: Any, variant: str) -> Tuple[Any, bool]:
+    """تحويل نموذج torch إلى fp16 أو int8 - النماذج غير torch تُعاد كما هي"""
+    if not (is_loaded('torch') and isinstance(model, torch.nn.Module)):
+        return model, False
+    try:
+        if variant == 'fp16':
+            return model.half(), True
+        if variant == 'int8':
+            model = model.cpu().eval()  # التكميم الديناميكي يعمل على المعالج فقط
+            # quantize_dynamic يستبدل الوحدات الفرعية فقط، لذا تُغلّف الوحدة الجذرية
+            quantized = torch.ao.quantization.quantize_dynamic(
+                torch.nn.Sequential(model), {torch.nn.Linear, torch.nn.LSTM, torch.nn.GRU}, dtype=torch.qint8)
+            return quantized[0], True
+    except Exception as e:
+        logger.log(f"Variant conversion to {variant} failed: {e}", 'warning')
+    return model, False
+
+# النسخ المحوّلة تُحفظ كموترات عادية في مخزن الأوزان (بلا pickle) وتُعاد بناؤها من build_<name>:
+# fp16 = state_dict كما هو. int8 = لكل Linear مكمّم: الأوزان int8 + المقياس ونقطة الصفر + bias
+_INT8_SUFFIXES = ('weight_int8', 'weight_scale', 'weight_zero_point', 'weight_axis')
+
+def _key(prefix: str, name: str) -> str:
+    return f"{prefix}.{name}" if prefix else name
+
+def _int8_state(model: Any) -> Optional[Dict[str, Any]]:
+    """تفكيك نموذج مكمّم ديناميكياً إلى موترات عادية - None إذا احتوى وحدات لا يمكن تفكيكها (LSTM / GRU)"""
+    dynamic = torch.ao.nn.quantized.dynamic
+    state: Dict[str, Any] = {}
+    quantized = []
+    for prefix, module in model.named_modules():
+        if isinstance(module, (dynamic.LSTM, dynamic.GRU)):
+            return None
+        if not isinstance(module, dynamic.Linear):
+            continue
+        quantized.append(prefix)
+        weight, bias = module.weight(), module.bias()
+        state[_key(prefix, 'weight_int8')] = weight.int_repr()
+        if weight.qscheme() == torch.per_tensor_affine:
+            state[_key(prefix, 'weight_scale')] = torch.tensor(weight.q_scale(), dtype=torch.float64)
+            state[_key(prefix, 'weight_zero_point')] = torch.tensor(weight.q_zero_point(), dtype=torch.int64)
+        else:
+            state[_key(prefix, 'weight_scale')] = weight.q_per_channel_scales().to(torch.float64)
+            state[_key(prefix, 'weight_zero_point')] = weight.q_per_channel_zero_points().to(torch.int64)
+            state[_key(prefix, 'weight_axis')] = torch.tensor(weight.q_per_channel_axis(), dtype=torch.int64)
+        if bias is not None:
+            state[_key(prefix, 'bias')] = bias.detach()
+    # بقية الموترات (طبقات غير مكمّمة) كما هي، دون حالة الوحدات المكمّمة
+    for key, value in model.state_dict().items():
+        owned = any(not prefix or key.startswith(prefix + '.') for prefix in quantized)
+        if isinstance(value, torch.Tensor) and not owned:
+            state[key] = value
+    return state
+
+def _rebuild_int8(model: Any, weights: Dict[str, Any]) -> Any:
+    """استبدال كل Linear مذكور في الملف بنسخته المكمّمة من الموترات المحفوظة ثم تحميل الباقي"""
+    dynamic = torch.ao.nn.quantized.dynamic
+    prefixes = sorted({key[:-len('weight_int8')].rstrip('.') for key in weights if key.endswith('weight_int8')})
+    for prefix in prefixes:
+        values = weights[_key(prefix, 'weight_int8')]
+        scale, zero_point = weights[_key(prefix, 'weight_scale')], weights[_key(prefix, 'weight_zero_point')]
+        axis = weights.get(_key(prefix, 'weight_axis'))
+        if axis is None:
+            qweight = torch._make_per_tensor_quantized_tensor(values, float(scale), int(zero_point))
+        else:
+            qweight = torch._make_per_channel_quantized_tensor(values, scale, zero_point, int(axis))
+        bias = weights.get(_key(prefix, 'bias'))
+        qlinear = dynamic.Linear(values.shape[1], values.shape[0], bias_=bias is not None, dtype=torch.qint8)
+        qlinear.set_weight_bias(qweight, None if bias is None else bias.clone())
+        if not prefix:
+            model = qlinear
+        else:
+            parent, _, child = prefix.rpartition('.')
+            setattr(model.get_submodule(parent), child, qlinear)
+    owned = {_key(prefix, suffix) for prefix in prefixes for suffix in _INT8_SUFFIXES + ('bias',)}
+    # الوحدات المكمّمة تقرأ حالتها (scale / _packed_params) من state_dict نفسه، فتُدمج حالتها الحالية
+    state = model.state_dict()
+    state.update((key, value) for key, value in weights.items() if key not in owned)
+    model.load_state_dict(state, assign=True)
+    return model
+
+def load_cached_variant(name: str, variant: str, model_module: types.ModuleType) -> Any:
+    """تحميل نسخة محوّلة محفوظة مسبقاً: بناء البنية على جهاز meta ثم ربطها بموترات الملف (بلا pickle)"""
+    builder = getattr(model_module, f"build_{name}", None)
+    path = variant_cache_path(name, variant)
+    if variant not in CONVERTED_VARIANTS or builder is None or not os.path.exists(path):
+        return None
+    try:
+        weights = weight_store.load_weights(path)
+        with torch.device('meta'):
+            model = builder(performance_mode=performance_mode)
+        if variant == 'int8':
+            model = _rebuild_int8(model, weights)
+        else:
+            model.load_state_dict(weights, assign=True)
+        if any(t.is_meta for t in list(model.parameters()) + list(model.buffers())):
+            raise ValueError("model has tensors missing from the variant file")
+        if variant == 'fp16' and torch.cuda.is_available():
+            model = model.cuda()
+        return model.eval()
+    except Exception as e:
+        logger.log(f"Cached variant '{path}' unusable ({e}) - converting again", 'warning')
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+def save_variant_artifact(name: str, variant: str, model: Any, model_module: types.ModuleType) -> None:
+    """حفظ النسخة المحوّلة في مخزن الأوزان (يتطلب build_<name> لإعادة البناء عند التحميل)"""
+    if not hasattr(model_module, f"build_{name}"):
+        return
+    path = variant_cache_path(name, variant)
+    try:
+        state = _int8_state(model) if variant == 'int8' else model.state_dict()
+        if state is None:
+            logger.log(f"{variant} variant of '{name}' has modules that cannot be stored - not cached", 'info')
+            return
+        os.makedirs(VARIANT_CACHE_DIR, exist_ok=True)
+        weight_store.save_weights(path, state, {'model': name, 'version': get_model_version(name), 'variant': variant})
+        logger.log(f"💾 Cached {variant} variant of '{name}' at {path}", 'info')
+    except Exception as e:
+        logger.log(f"Failed to cache {variant} variant of '{name}': {e}", 'warning')
+
+# ===== أوزان مربوطة بالذاكرة (mmap) مشتركة بين العمليات =====
+# يتطلب أن يوفر ملف التحميل build_<name>(performance_mode) تُرجع بنية النموذج دون أوزان
+def weight_store_path(name: str) -> str:
+    return os.path.join(WEIGHT_STORE_DIR, f"{name}-{get_model_version(name)}.safetensors")
+
+def load_mapped_model(name: str, model_module: types.ModuleType) -> Any:
+    """بناء النموذج على جهاز meta ثم ربط أوزانه مباشرة بملف mmap (بدون نسخ)"""
+    builder = getattr(model_module, f"build_{name}", None)
+    path = weight_store_path(name)
+    if builder is None or not os.path.exists(path):
+        return None
+    try:
+        weights = weight_store.load_weights(path)
+        with torch.device('meta'):
+            model = builder(performance_mode=performance_mode)
+        model.load_state_dict(weights, assign=True)
+        if any(t.is_meta for t in list(model.parameters()) + list(model.buffers())):
+            raise ValueError("model has tensors missing from the weight file")
+        return model
+    except Exception as e:
+        logger.log(f"Mapped weights for '{name}' unusable ({e}) - using loader", 'warning')
+        return None
+
+def save_mapped_weights(name: str, model_module: types.ModuleType, model: Any) -> None:
+    """تصدير أوزان النموذج الكامل إلى مخزن mmap عند أول تحميل"""
+    if not hasattr(model_module, f"build_{name}") or not isinstance(model, torch.nn.Module):
+        return
+    path = weight_store_path(name)
+    if os.path.exists(path):
+        return
+    try:
+        os.makedirs(WEIGHT_STORE_DIR, exist_ok=True)
+        size = weight_store.save_weights(path, model.state_dict(), {'model': name, 'version': get_model_version(name)})
+        logger.log(f"💾 Exported '{name}' weights for shared mmap loading ({size / 1024**2:.1f} MB)", 'info')
+    except Exception as e:
+        logger.log(f"Failed to export mapped weights for '{name}': {e}", 'warning')
+
+def record_inference_latency(name: str, seconds: float) -> None:
+    """تسجيل زمن استدلال النموذج للنسخة المحمّلة حالياً (متوسط أسي)"""
+    with state_lock:
+        metadata = model_metadata.get(name)
+        if metadata is None:
+            return
+        stats = metadata.variant_stats.setdefault(metadata.variant, {})
+        latency_ms = seconds * 1000
+        previous = stats.get('latency_ms')
+        stats['latency_ms'] = round(latency_ms if previous is None else previous + 0.2 * (latency_ms - previous), 3)
 
 # ===== نظام التحميل المتوازي الذكي =====
 def parallel_model_loader(model_list: List[Tuple[str, int]]) -> Dict[str, Any]:
@@ -373,6 +1115,57 @@ def parallel_model_loader(model_list: List[Tuple[str, int]]) -> Dict[str, Any]:
     
     return results
 
+def benchmark_load_contention(threads: int = 16, load_delay: float = 0.5) -> Dict[str, Any]:
+    """قياس طلب نفس النموذج من عدة خيوط في آن واحد (يجب أن يُبنى النموذج مرة واحدة فقط)"""
+    name = "contention_bench"
+    constructions = []
+    
+    def load_contention_bench(performance_mode: str = DEFAULT_PERFORMANCE_MODE) -> Dict[str, Any]:
+        constructions.append(threading.get_ident())
+        time.sleep(load_delay)  # محاكاة استيراد وبناء نموذج ثقيل
+        return {'weights': np.zeros(1024 * 1024, dtype=np.float32)}
+    
+    # تسجيل وحدة تحميل اصطناعية دون الحاجة إلى ملف في models/
+    bench_module = types.ModuleType(f"models.{name}_loader")
+    setattr(bench_module, f"load_{name}", load_contention_bench)
+    sys.modules[bench_module.__name__] = bench_module
+    MODEL_DEPENDENCIES[name] = []
+    
+    barrier = threading.Barrier(threads)
+    waits: List[float] = []
+    
+    def request_model() -> Any:
+        barrier.wait()
+        started = time.perf_counter()
+        model = load_model(name)
+        waits.append(time.perf_counter() - started)
+        return model
+    
+    try:
+        wall_start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+            models = list(executor.map(lambda _: request_model(), range(threads)))
+        wall_time = time.perf_counter() - wall_start
+    finally:
+        unload_model(name)
+        with state_lock:
+            model_metadata.pop(name, None)
+            model_response_times.pop(name, None)
+            adaptive_learning['model_usage_patterns'].pop(name, None)
+        MODEL_DEPENDENCIES.pop(name, None)
+        sys.modules.pop(bench_module.__name__, None)
+    
+    report = {
+        'threads': threads,
+        'constructions': len(constructions),
+        'distinct_models': len({id(model) for model in models}),
+        'wall_time': round(wall_time, 3),
+        'mean_wait': round(sum(waits) / len(waits), 3),
+        'max_wait': round(max(waits), 3)
+    }
+    logger.log(f"🏁 Load contention: {threads} threads → {report['constructions']} construction(s) in {report['wall_time']}s", 'info')
+    return report
+
 # ===== التحسينات التلقائية المتقدمة =====
 def auto_optimize_system() -> None:
     """التحسين التلقائي للنظام بناءً على الظروف الحالية"""
@@ -403,17 +1196,30 @@ def auto_optimize_system() -> None:
     except Exception as e:
         logger.log(f"Auto-optimization failed: {e}", 'error')
 
+def variant_change_needed(name: str) -> bool:
+    """هل تختلف النسخة المناسبة لوضع الأداء الحالي عن النسخة المحمّلة؟"""
+    target = select_model_variant(name)
+    current = model_metadata[name].variant
+    if target == current:
+        return False
+    # نموذج غير torch لا يمكن تحويله: إعادة تحميله لن تغير شيئاً
+    if target in CONVERTED_VARIANTS and current == 'full':
+        return is_loaded('torch') and isinstance(model_cache.get(name), torch.nn.Module)
+    return True
+
 def set_performance_mode(mode: str) -> None:
     """تغيير وضع الأداء للنظام"""
     global performance_mode
+    if mode == performance_mode:
+        return
     if mode in PERFORMANCE_MODES:
         performance_mode = mode
         system_report['performance_mode'] = mode
         logger.log(f"⚙️ Performance mode changed to '{mode}'", 'info')
         
-        # إعادة تحميل النماذج المتأثرة
+        # إعادة تحميل كل نموذج تغيرت نسخته المناسبة (النسخ المحوّلة تُقرأ من القرص دون إعادة تحويل)
         for model_name in list(model_cache.keys()):
-            if model_metadata[model_name].priority >= 7:  # إعادة تحميل النماذج عالية الأولوية فقط
+            if variant_change_needed(model_name):
                 unload_model(model_name)
                 load_model(model_name, model_metadata[model_name].priority)
     else:
@@ -499,48 +1305,213 @@ def estimate_intelligence_level() -> None:
         logger.log(f"Intelligence estimation failed: {e}", 'error')
 
 # ===== المراقبة والتحليل المتقدم =====
-async def realtime_monitor() -> None:
-    """مراقبة النظام في الوقت الحقيقي"""
-    while True:
-        try:
-            # تحديث حالة النظام
-            scan_system()
-            
-            # جمع بيانات التشخيص
-            diagnostics_data.cpu_usage.append(psutil.cpu_percent())
-            diagnostics_data.ram_usage.append(psutil.virtual_memory().percent)
-            
-            if torch.cuda.is_available():
-                diagnostics_data.gpu_usage.append(torch.cuda.utilization())
-            
-            # الكشف عن الشذوذ
-            detect_anomalies()
-            
-            # تحديث حالة النظام الحي
-            update_live_status()
+@dataclass
+class MonitorStats:
+    cycles: int = 0
+    errors: int = 0
+    cpu_time: float = 0.0         # زمن المعالج المستهلك في دورات المراقبة (ثوانٍ)
+    wall_time: float = 0.0        # الزمن الفعلي لدورات المراقبة (ثوانٍ)
+    started_at: float = 0.0
+    last_cycle_cpu: float = 0.0
+    interval: float = MONITOR_BASE_INTERVAL
+    throttled_cycles: int = 0     # دورات أُبطئت لاحترام ميزانية الكلفة
+    last_snapshot_save: float = 0.0
+
+monitor_stats = MonitorStats()
+
+def choose_monitor_interval() -> float:
+    """اختيار فاصل المراقبة: سريع عند التقلب أو اقتراب الحرارة من الحد، بطيء تدريجياً عند الخمول"""
+    cpu = diagnostics_data.cpu_usage
+    temp = system_report.get('cpu', {}).get('temp', 0) or 0
+    volatile = len(cpu) > 1 and cpu.ewma is not None and abs(cpu[-1] - cpu.ewma) >= MONITOR_VOLATILITY_DELTA
+    
+    if temp >= HIGH_TEMP_THRESHOLD - MONITOR_TEMP_MARGIN or volatile:
+        interval = MONITOR_MIN_INTERVAL
+    elif cpu.ewma is not None and cpu.ewma < MONITOR_IDLE_CPU:
+        interval = min(max(monitor_stats.interval, MONITOR_BASE_INTERVAL) * 1.5, MONITOR_MAX_INTERVAL)
+    else:
+        interval = MONITOR_BASE_INTERVAL
+    
+    # ميزانية الكلفة: لا تتجاوز دورة المراقبة نسبة MONITOR_OVERHEAD_BUDGET من معالج واحد
+    min_for_budget = monitor_stats.last_cycle_cpu / MONITOR_OVERHEAD_BUDGET
+    if min_for_budget > interval:
+        monitor_stats.throttled_cycles += 1
+        interval = min_for_budget
+    return interval
+
+def run_monitor_cycle() -> None:
+    """دورة مراقبة واحدة مع قياس كلفتها"""
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    try:
+        # تحديث حالة النظام (القياسات يجمعها TelemetrySampler في الخلفية)
+        scan_system()
+        
+        # الكشف عن الشذوذ
+        detect_anomalies()
+        
+        # احترام ميزانية ذاكرة النماذج
+        manage_model_cache()
+        
+        # تحديث حالة النظام الحي
+        update_live_status()
+    except Exception as e:
+        monitor_stats.errors += 1
+        logger.log(f"Realtime monitor error: {e}", 'error')
+    finally:
+        monitor_stats.last_cycle_cpu = time.thread_time() - cpu_start
+        monitor_stats.cpu_time += monitor_stats.last_cycle_cpu
+        monitor_stats.wall_time += time.perf_counter() - wall_start
+        monitor_stats.cycles += 1
+
+async def realtime_monitor(stop_event: Optional["asyncio.Event"] = None) -> None:
+    """مراقبة النظام في الوقت الحقيقي بفاصل متكيف حتى ضبط stop_event"""
+    global monitor_stats
+    stop_event = stop_event or asyncio.Event()
+    monitor_stats = MonitorStats(started_at=time.perf_counter(), last_snapshot_save=time.time())
+    snapshot_task: Optional["asyncio.Future"] = None
+    try:
+        while not stop_event.is_set():
+            # الدورة تقرأ المجسات وتدير الكاش، فتعمل في خيط منفصل ولا تحجز حلقة المستدعي
+            await asyncio.to_thread(run_monitor_cycle)
+            monitor_stats.interval = choose_monitor_interval()
             
-            # الانتظار للدورة التالية
-            await asyncio.sleep(2.5)
+            # حفظ دوري للقطة الإقلاع الدافئ في خيط منفصل (الكتابة تنتهي بـ fsync فلا تُنفذ على حلقة الأحداث)
+            if ((snapshot_task is None or snapshot_task.done())
+                    and time.time() - monitor_stats.last_snapshot_save >= WARM_SNAPSHOT_INTERVAL):
+                monitor_stats.last_snapshot_save = time.time()
+                snapshot_task = asyncio.ensure_future(asyncio.to_thread(save_warm_snapshot))
             
-        except Exception as e:
-            logger.log(f"Realtime monitor error: {e}", 'error')
-            await asyncio.sleep(5)
+            # الانتظار للدورة التالية (أو الخروج فوراً عند طلب الإيقاف)
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=monitor_stats.interval)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        # انتظار اللقطة الجارية قبل الخروج حتى لا يُغلق المحمّل أثناء كتابتها
+        if snapshot_task is not None:
+            await asyncio.shield(snapshot_task)
+
+def get_monitor_report() -> Dict[str, Any]:
+    """تقرير كلفة المراقبة مقارنة بالميزانية"""
+    elapsed = time.perf_counter() - monitor_stats.started_at if monitor_stats.started_at else 0.0
+    overhead = monitor_stats.cpu_time / elapsed if elapsed else 0.0
+    return {
+        'running': realtime_monitor_runner.running,
+        'cycles': monitor_stats.cycles,
+        'errors': monitor_stats.errors,
+        'interval': round(monitor_stats.interval, 3),
+        'mean_cycle_ms': round(monitor_stats.wall_time / monitor_stats.cycles * 1000, 3) if monitor_stats.cycles else 0.0,
+        'cpu_overhead_pct': round(overhead * 100, 4),
+        'budget_pct': MONITOR_OVERHEAD_BUDGET * 100,
+        'within_budget': overhead <= MONITOR_OVERHEAD_BUDGET,
+        'throttled_cycles': monitor_stats.throttled_cycles
+    }
+
+class RealtimeMonitorRunner:
+    """تشغيل وإيقاف المراقبة: داخل حلقة asyncio الجارية إن وجدت، وإلا في خيط خلفي بحلقته الخاصة"""
+    
+    def __init__(self):
+        self._loop = None
+        self._stop_event = None
+        self._task = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+    
+    @property
+    def running(self) -> bool:
+        if self._thread is not None:
+            return self._thread.is_alive()
+        return self._task is not None and not self._task.done()
+    
+    def start(self) -> None:
+        if self.running:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        
+        if loop is not None:
+            self._loop = loop
+            self._thread = None
+            self._stop_event = asyncio.Event()
+            self._task = loop.create_task(realtime_monitor(self._stop_event))
+        else:
+            self._started.clear()
+            self._thread = threading.Thread(target=self._run_in_thread, name='realtime-monitor', daemon=True)
+            self._thread.start()
+            self._started.wait()
+        logger.log("📡 Realtime monitor started", 'info')
+    
+    def _run_in_thread(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._stop_event = asyncio.Event()
+        self._started.set()
+        try:
+            self._loop.run_until_complete(realtime_monitor(self._stop_event))
+        finally:
+            self._loop.run_until_complete(self._loop.shutdown_default_executor())  # خيوط لقطات الإقلاع الدافئ
+            self._loop.close()
+    
+    def stop(self, timeout: float = 5.0) -> Optional["asyncio.Task"]:
+        """
+        طلب الإيقاف. في وضع الخيط الخلفي ينتظر انتهاءه حتى timeout.
+        داخل حلقة جارية تُرجع المهمة لانتظارها (await stop_realtime_monitor())،
+        و running يبقى True حتى تنتهي الدورة الأخيرة فعلاً.
+        """
+        if not self.running:
+            return None
+        self._loop.call_soon_threadsafe(self._stop_event.set)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.log(f"📡 Realtime monitor still finishing its last cycle after {timeout}s", 'warning')
+            else:
+                self._log_stopped()
+            return None
+        self._task.add_done_callback(lambda _: self._log_stopped())
+        return self._task
+    
+    def _log_stopped(self) -> None:
+        report = get_monitor_report()
+        logger.log(f"📡 Realtime monitor stopped after {report['cycles']} cycles "
+                   f"(CPU overhead {report['cpu_overhead_pct']}% / budget {report['budget_pct']}%)", 'info')
+
+realtime_monitor_runner = RealtimeMonitorRunner()
+
+def start_realtime_monitor() -> None:
+    """بدء المراقبة في الوقت الحقيقي"""
+    realtime_monitor_runner.start()
+
+def stop_realtime_monitor(timeout: float = 5.0) -> Optional["asyncio.Task"]:
+    """إيقاف المراقبة في الوقت الحقيقي (داخل حلقة جارية: تُرجع مهمة يمكن انتظارها)"""
+    return realtime_monitor_runner.stop(timeout)
+
+# رقم آخر عينة معالج فُحصت في detect_anomalies
+_last_checked_cpu_sample = 0
 
 def detect_anomalies() -> None:
     """الكشف عن السلوك غير الطبيعي في النظام"""
+    global _last_checked_cpu_sample
     try:
         # الكشف عن ارتفاع غير طبيعي في استخدام وحدة المعالجة المركزية
-        if len(diagnostics_data.cpu_usage) > 10:
-            last_10 = diagnostics_data.cpu_usage[-10:]
-            avg = sum(last_10) / len(last_10)
-            if diagnostics_data.cpu_usage[-1] > avg * 1.5:
+        # (مقارنة آخر قيمة بالمتوسط الأسي لما قبلها - O(1) دون إعادة تقطيع السلسلة)
+        # المراقبة أسرع من جمع العينات، فلا تُفحص العينة نفسها أكثر من مرة
+        cpu = diagnostics_data.cpu_usage
+        sample_id, latest, baseline = cpu.latest_sample()
+        if sample_id != _last_checked_cpu_sample:
+            _last_checked_cpu_sample = sample_id
+            if len(cpu) > DIAGNOSTICS_EWMA_SPAN and baseline is not None and latest > baseline * 1.5:
                 anomaly = {
                     'type': 'high_cpu',
-                    'value': diagnostics_data.cpu_usage[-1],
+                    'value': latest,
+                    'baseline': round(baseline, 2),
                     'timestamp': time.time()
                 }
                 diagnostics_data.anomalies.append(anomaly)
-                logger.log(f"⚠️ CPU spike detected: {diagnostics_data.cpu_usage[-1]}%", 'warning')
+                logger.log(f"⚠️ CPU spike detected: {latest}%", 'warning')
         
         # الكشف عن ارتفاع غير طبيعي في درجة الحرارة
         if system_report.get('cpu', {}).get('temp', 0) > HIGH_TEMP_THRESHOLD:
@@ -556,13 +1527,18 @@ def detect_anomalies() -> None:
 
 def update_live_status() -> None:
     """تحديث حالة النظام الحي"""
+    with state_lock:
+        models_loaded = list(model_cache.keys())
     live_status.update({
         'timestamp': time.time(),
-        'models_loaded': list(model_cache.keys()),
-        'model_count': len(model_cache),
-        'memory_usage': psutil.virtual_memory().percent,
-        'cpu_usage': psutil.cpu_percent(),
+        'models_loaded': models_loaded,
+        'model_count': len(models_loaded),
+        'memory_usage': system_report.get('ram', {}).get('percent'),
+        'cpu_usage': system_report.get('cpu', {}).get('usage'),
         'performance_mode': performance_mode,
+        'model_cache': get_cache_stats(),
+        'monitor': get_monitor_report(),
+        'metrics': {name: buffer.stats() for name, buffer in diagnostics_data.metrics().items() if len(buffer)},
         'last_anomaly': diagnostics_data.anomalies[-1] if diagnostics_data.anomalies else None
     })
 
@@ -570,17 +1546,26 @@ def update_live_status() -> None:
 def export_diagnostics(filename: str = "system_diagnostics.json") -> bool:
     """تصدير بيانات التشخيص إلى ملف"""
     try:
+        with state_lock:
+            models_loaded = list(model_cache.keys())
+            metadata = {name: dict(vars(md)) for name, md in model_metadata.items()}
         data = {
             'system_report': system_report,
-            'loaded_models': list(model_cache.keys()),
-            'model_metadata': {name: vars(md) for name, md in model_metadata.items()},
+            'loaded_models': models_loaded,
+            'model_metadata': metadata,
+            'cache_stats': get_cache_stats(),
+            'monitor': get_monitor_report(),
             'performance_mode': performance_mode,
             'intelligence_level': system_report.get('intelligence_level', 'N/A'),
             'diagnostics': {
-                'cpu_usage': diagnostics_data.cpu_usage,
-                'ram_usage': diagnostics_data.ram_usage,
-                'anomalies': diagnostics_data.anomalies
+                'cpu_usage': diagnostics_data.cpu_usage.to_list(),
+                'ram_usage': diagnostics_data.ram_usage.to_list(),
+                'history': {name: buffer.history.to_list() for name, buffer in diagnostics_data.metrics().items()
+                            if buffer.history is not None},
+                'stats': {name: buffer.stats() for name, buffer in diagnostics_data.metrics().items()},
+                'anomalies': list(diagnostics_data.anomalies)
             },
+            'boot_timeline': boot_scheduler.timeline() if boot_scheduler else [],
             'logs': list(load_log),
             'errors': list(error_log),
             'export_time': datetime.now().isoformat()
@@ -653,32 +1638,328 @@ def generate_recommendations(health_score: int) -> List[str]:
     
     return recommendations
 
+# ===== لقطة الإقلاع الدافئ =====
+# الصيغة: رأس (MAGIC, الإصدار, عدد النماذج) ثم سجل ثنائي لكل نموذج ثم CRC32 للمحتوى كاملاً
+SNAPSHOT_MAGIC = b'OBXW'
+SNAPSHOT_VERSION = 2  # v2: نسخة النموذج المحمّلة وقياسات كل نسخة
+_SNAPSHOT_HEADER = struct.Struct('<4sHI')
+_SNAPSHOT_RECORD = struct.Struct('<BBdIddI')  # لديه_بيانات، الأولوية، آخر_استخدام، مرات_التحميل، الذاكرة، زمن_التحميل، مرات_الاستخدام
+_SNAPSHOT_VARIANT = struct.Struct('<ddd')  # الذاكرة، زمن_التحميل، زمن_الاستدلال (-1 = غير مقاس)
+_SNAPSHOT_STR_LEN = struct.Struct('<H')
+_SNAPSHOT_CRC = struct.Struct('<I')
+
+def _pack_str(value: str) -> bytes:
+    data = value.encode('utf-8')
+    return _SNAPSHOT_STR_LEN.pack(len(data)) + data
+
+def _unpack_str(buffer: bytes, offset: int) -> Tuple[str, int]:
+    (length,) = _SNAPSHOT_STR_LEN.unpack_from(buffer, offset)
+    offset += _SNAPSHOT_STR_LEN.size
+    return buffer[offset:offset + length].decode('utf-8'), offset + length
+
+def save_warm_snapshot(path: Optional[str] = None) -> bool:
+    """حفظ أنماط الاستخدام وأزمنة التحميل والبيانات الوصفية بصيغة ثنائية مضغوطة وكتابة ذرية"""
+    path = path or WARM_SNAPSHOT_PATH
+    try:
+        with state_lock:
+            usage = dict(adaptive_learning['model_usage_patterns'])
+            names = sorted(set(model_metadata) | set(model_response_times) | set(usage))
+            parts = [_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(names))]
+            for name in names:
+                md = model_metadata.get(name)
+                parts.append(_pack_str(name))
+                parts.append(_SNAPSHOT_RECORD.pack(
+                    md is not None,
+                    md.priority if md else 0,
+                    md.last_used if md else 0.0,
+                    md.load_count if md else 0,
+                    md.memory_usage if md else 0.0,
+                    model_response_times.get(name, -1.0),
+                    usage.get(name, 0)
+                ))
+                parts.append(_pack_str(md.version if md else ''))
+                deps = md.dependencies if md else []
+                parts.append(_SNAPSHOT_STR_LEN.pack(len(deps)))
+                parts.extend(_pack_str(dep) for dep in deps)
+                parts.append(_pack_str(md.variant if md else 'full'))
+                variant_stats = md.variant_stats if md else {}
+                parts.append(_SNAPSHOT_STR_LEN.pack(len(variant_stats)))
+                for variant, stats in variant_stats.items():
+                    parts.append(_pack_str(variant))
+                    parts.append(_SNAPSHOT_VARIANT.pack(stats.get('memory_gb', 0.0), stats.get('load_time', -1.0),
+                                                        stats.get('latency_ms', -1.0)))
+        payload = b''.join(parts)
+        payload += _SNAPSHOT_CRC.pack(zlib.crc32(payload))
+        
+        # كتابة ذرية: ملف مؤقت في نفس المجلد ثم استبدال
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        logger.log(f"💾 Saved warm-start snapshot ({len(names)} models, {len(payload)} bytes)", 'info')
+        return True
+    except Exception as e:
+        logger.log(f"Warm-start snapshot save failed: {e}", 'error')
+        return False
+
+def restore_warm_snapshot(path: Optional[str] = None) -> int:
+    """استعادة لقطة الإقلاع الدافئ - لا تستبدل أي قيمة حية مسجلة مسبقاً"""
+    path = path or WARM_SNAPSHOT_PATH
+    if not os.path.exists(path):
+        return 0
+    try:
+        with open(path, 'rb') as f:
+            payload = f.read()
+        body, (crc,) = payload[:-_SNAPSHOT_CRC.size], _SNAPSHOT_CRC.unpack(payload[-_SNAPSHOT_CRC.size:])
+        if zlib.crc32(body) != crc:
+            raise ValueError("checksum mismatch")
+        magic, version, count = _SNAPSHOT_HEADER.unpack_from(body, 0)
+        if magic != SNAPSHOT_MAGIC or version not in (1, SNAPSHOT_VERSION):
+            raise ValueError(f"unsupported snapshot format {magic!r} v{version}")
+        
+        offset = _SNAPSHOT_HEADER.size
+        with state_lock:
+            usage = adaptive_learning['model_usage_patterns']
+            for _ in range(count):
+                name, offset = _unpack_str(body, offset)
+                has_md, priority, last_used, load_count, memory_usage, response_time, usage_count = \
+                    _SNAPSHOT_RECORD.unpack_from(body, offset)
+                offset += _SNAPSHOT_RECORD.size
+                version_str, offset = _unpack_str(body, offset)
+                (dep_count,) = _SNAPSHOT_STR_LEN.unpack_from(body, offset)
+                offset += _SNAPSHOT_STR_LEN.size
+                deps = []
+                for _ in range(dep_count):
+                    dep, offset = _unpack_str(body, offset)
+                    deps.append(dep)
+                variant, variant_stats = 'full', {}
+                if version >= 2:
+                    variant, offset = _unpack_str(body, offset)
+                    (variant_count,) = _SNAPSHOT_STR_LEN.unpack_from(body, offset)
+                    offset += _SNAPSHOT_STR_LEN.size
+                    for _ in range(variant_count):
+                        variant_name, offset = _unpack_str(body, offset)
+                        memory_gb, variant_load_time, latency_ms = _SNAPSHOT_VARIANT.unpack_from(body, offset)
+                        offset += _SNAPSHOT_VARIANT.size
+                        stats = {'memory_gb': memory_gb}
+                        if variant_load_time >= 0:
+                            stats['load_time'] = variant_load_time
+                        if latency_ms >= 0:
+                            stats['latency_ms'] = latency_ms
+                        variant_stats[variant_name] = stats
+                
+                if has_md and name not in model_metadata:
+                    model_metadata[name] = ModelMetadata(name=name, version=version_str, dependencies=deps,
+                                                         memory_usage=memory_usage, priority=priority,
+                                                         last_used=last_used, load_count=load_count,
+                                                         variant=variant, variant_stats=variant_stats)
+                if response_time >= 0:
+                    model_response_times.setdefault(name, response_time)
+                if usage_count:
+                    usage.setdefault(name, usage_count)
+        
+        logger.log(f"♨️ Restored warm-start snapshot ({count} models)", 'info')
+        return count
+    except Exception as e:
+        logger.log(f"Warm-start snapshot restore failed: {e}", 'warning')
+        return 0
+
+# ===== جدولة الإقلاع حسب التبعيات =====
+@dataclass
+class BootStage:
+    name: str
+    func: Callable[[], Any]
+    dependencies: List[str] = field(default_factory=list)
+    deferred: bool = False  # خارج المسار الحرج - الإقلاع لا ينتظره
+    status: str = 'pending'  # pending | running | done | failed | skipped
+    start: float = 0.0
+    end: float = 0.0
+    error: Optional[str] = None
+
+class BootScheduler:
+    """تشغيل مراحل الإقلاع كرسم بياني موجه: كل مرحلة تبدأ فور اكتمال تبعياتها"""
+    
+    FINAL_STATES = ('done', 'failed', 'skipped')
+    
+    def __init__(self, max_workers: int = MAX_CONCURRENT_LOAD):
+        self.max_workers = max_workers
+        self.stages: Dict[str, BootStage] = OrderedDict()
+        self.boot_start = 0.0
+        self._condition = threading.Condition(threading.RLock())
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._pending_deps: Dict[str, int] = {}
+    
+    def add_stage(self, name: str, func: Callable[[], Any], dependencies: Optional[List[str]] = None,
+                  deferred: bool = False) -> None:
+        """إضافة مرحلة مع تبعياتها"""
+        if name in self.stages:
+            raise ValueError(f"Duplicate boot stage: {name}")
+        self.stages[name] = BootStage(name=name, func=func, dependencies=list(dependencies or []), deferred=deferred)
+    
+    def _validate(self) -> None:
+        """التحقق من التبعيات وعدم وجود حلقات"""
+        for stage in self.stages.values():
+            for dep in stage.dependencies:
+                if dep not in self.stages:
+                    raise ValueError(f"Boot stage '{stage.name}' depends on unknown stage '{dep}'")
+                if self.stages[dep].deferred and not stage.deferred:
+                    raise ValueError(f"Critical stage '{stage.name}' cannot depend on deferred stage '{dep}'")
+        
+        visiting, visited = set(), set()
+        def visit(name: str) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Boot stage dependency cycle at '{name}'")
+            visiting.add(name)
+            for dep in self.stages[name].dependencies:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+        for name in self.stages:
+            visit(name)
+    
+    def _dependents(self, name: str) -> List[BootStage]:
+        return [stage for stage in self.stages.values() if name in stage.dependencies]
+    
+    def _run_stage(self, stage: BootStage) -> None:
+        stage.status = 'running'
+        stage.start = time.perf_counter() - self.boot_start
+        try:
+            stage.func()
+            stage.status = 'done'
+        except Exception:
+            stage.error = traceback.format_exc()
+            stage.status = 'failed'
+            logger.log(f"Boot stage '{stage.name}' failed: {stage.error}", 'error')
+        finally:
+            stage.end = time.perf_counter() - self.boot_start
+    
+    def _submit(self, stage: BootStage) -> None:
+        future = self._executor.submit(self._run_stage, stage)
+        future.add_done_callback(lambda _, done_stage=stage: self._on_stage_done(done_stage))
+    
+    def _skip(self, stage: BootStage) -> None:
+        stage.status = 'skipped'
+        for dependent in self._dependents(stage.name):
+            if dependent.status == 'pending':
+                self._skip(dependent)
+    
+    def _on_stage_done(self, stage: BootStage) -> None:
+        with self._condition:
+            for dependent in self._dependents(stage.name):
+                if dependent.status != 'pending':
+                    continue
+                if stage.status != 'done':
+                    self._skip(dependent)
+                    continue
+                self._pending_deps[dependent.name] -= 1
+                if self._pending_deps[dependent.name] == 0:
+                    self._submit(dependent)
+            
+            if all(s.status in self.FINAL_STATES for s in self.stages.values()):
+                self._executor.shutdown(wait=False)
+            self._condition.notify_all()
+    
+    def run(self) -> List[Dict[str, Any]]:
+        """تشغيل المراحل والعودة عند اكتمال كل المراحل غير المؤجلة"""
+        self._validate()
+        self.boot_start = time.perf_counter()
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers,
+                                                               thread_name_prefix='boot')
+        with self._condition:
+            self._pending_deps = {name: len(stage.dependencies) for name, stage in self.stages.items()}
+            for stage in self.stages.values():
+                if not stage.dependencies:
+                    self._submit(stage)
+            self._condition.wait_for(lambda: all(
+                s.status in self.FINAL_STATES for s in self.stages.values() if not s.deferred))
+        return self.timeline()
+    
+    def failed_stages(self) -> List[str]:
+        """المراحل غير المؤجلة التي فشلت أو تم تخطيها"""
+        return [s.name for s in self.stages.values()
+                if not s.deferred and s.status in ('failed', 'skipped')]
+    
+    def critical_path(self) -> List[str]:
+        """سلسلة المراحل التي حددت زمن الإقلاع (من الأولى إلى الأخيرة)"""
+        finished = [s for s in self.stages.values() if not s.deferred and s.status in self.FINAL_STATES]
+        if not finished:
+            return []
+        path = []
+        stage = max(finished, key=lambda s: s.end)
+        while stage is not None:
+            path.append(stage.name)
+            deps = [self.stages[dep] for dep in stage.dependencies]
+            stage = max(deps, key=lambda s: s.end) if deps else None
+        return list(reversed(path))
+    
+    def timeline(self) -> List[Dict[str, Any]]:
+        """الخط الزمني لكل مرحلة (بالثواني منذ بداية الإقلاع)"""
+        critical = set(self.critical_path())
+        return [{
+            'stage': stage.name,
+            'status': stage.status,
+            'start': round(stage.start, 3),
+            'end': round(stage.end, 3),
+            'duration': round(max(0.0, stage.end - stage.start), 3),
+            'dependencies': stage.dependencies,
+            'deferred': stage.deferred,
+            'critical': stage.name in critical
+        } for stage in self.stages.values()]
+    
+    def log_timeline(self) -> None:
+        """طباعة الخط الزمني للإقلاع في السجل"""
+        for entry in self.timeline():
+            marker = '★' if entry['critical'] else ('⏳' if entry['deferred'] else ' ')
+            logger.log(f"⏱️ {marker} {entry['stage']:<24} {entry['start']:>7.3f}s → {entry['end']:>7.3f}s "
+                       f"({entry['duration']:.3f}s) [{entry['status']}]", 'info')
+        logger.log(f"🧭 Boot critical path: {' → '.join(self.critical_path())}", 'info')
+
+boot_scheduler: Optional[BootScheduler] = None
+
 # ===== التهيئة والتشغيل =====
+ESSENTIAL_MODELS = [
+    ('whisper', 9),
+    ('llm_core', 10),
+    ('vision_base', 8),
+    ('audio_processor', 7)
+]
+
+def build_boot_scheduler() -> BootScheduler:
+    """بناء رسم مراحل الإقلاع - الفحص يقرأ لقطة القياسات والشبكة تُقاس في الخلفية"""
+    scheduler = BootScheduler()
+    scheduler.add_stage('scan_system', scan_system)
+    scheduler.add_stage('restore_snapshot', restore_warm_snapshot)
+    scheduler.add_stage('auto_optimize', auto_optimize_system, ['scan_system', 'restore_snapshot'])
+    scheduler.add_stage('load_essential_models', lambda: parallel_model_loader(ESSENTIAL_MODELS), ['auto_optimize'])
+    scheduler.add_stage('smart_cleanup', smart_cleanup, ['load_essential_models'])
+    scheduler.add_stage('save_snapshot', save_warm_snapshot, ['load_essential_models'], deferred=True)
+    return scheduler
+
 def initialize_system() -> None:
     """تهيئة النظام الذكي"""
+    global boot_scheduler
     try:
         logger.log("🚀 Starting SmartLoader Pro - Advanced AI Loading System", 'info')
         
-        # الفحص الأولي للنظام
-        scan_system()
-        
-        # التحسين التلقائي الأولي
-        auto_optimize_system()
-        
-        # تحميل النماذج الأساسية
-        essential_models = [
-            ('whisper', 9),
-            ('llm_core', 10),
-            ('vision_base', 8),
-            ('audio_processor', 7)
-        ]
-        parallel_model_loader(essential_models)
+        # تشغيل مراحل الإقلاع بالتوازي حسب تبعياتها
+        boot_scheduler = build_boot_scheduler()
+        timeline = boot_scheduler.run()
+        boot_scheduler.log_timeline()
+        system_report['boot'] = {
+            'duration': max((entry['end'] for entry in timeline if not entry['deferred']), default=0.0),
+            'critical_path': boot_scheduler.critical_path()
+        }
+        failed = boot_scheduler.failed_stages()
+        if failed:
+            raise RuntimeError(f"Boot stages failed: {', '.join(failed)}")
         
         # بدء المراقبة في الوقت الحقيقي
-        asyncio.create_task(realtime_monitor())
-        
-        # تنظيف الذاكرة الأولي
-        smart_cleanup()
+        start_realtime_monitor()
         
         logger.log("✅ SmartLoader Pro initialized successfully. System is operational 🔥", 'info')
         
@@ -713,13 +1994,22 @@ def smart_cleanup(full: bool = False) -> None:
 
 # ===== الواجهة الرئيسية =====
 if __name__ == "__main__":
+    # قياس التحميل المتزامن فقط
+    if "--bench-contention" in sys.argv:
+        print(json.dumps(benchmark_load_contention(), indent=2))
+        sys.exit(0)
+    
     # تهيئة النظام
     initialize_system()
     
-    # استمرار التشغيل للحفاظ على المهام الخلفية
+    # استمرار التشغيل للحفاظ على المهام الخلفية (المراقبة تعمل في خيطها الخاص)
     try:
-        asyncio.get_event_loop().run_forever()
+        while realtime_monitor_runner.running:
+            time.sleep(1)
     except KeyboardInterrupt:
         logger.log("🛑 SmartLoader Pro stopped by user", 'info')
+        stop_realtime_monitor()
+        stop_telemetry_sampler()
+        save_warm_snapshot()
         export_diagnostics()
         sys.exit(0)
@@ -0,0 +1,204 @@
+import asyncio
+import http.server
+import threading
+import time
+import types
+
+import pytest
+
+from ai_core import smart_loader as sl
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def counting_probes(*names):
+    calls = {name: 0 for name in names}
+
+    def probe(name):
+        def run():
+            calls[name] += 1
+            return {'value': calls[name]}
+        return run
+
+    return calls, {name: probe(name) for name in names}
+
+
+@pytest.fixture
+def speed_test_server(monkeypatch):
+    # خادم محلي بديل لملف قياس السرعة
+    payload = b'x' * (256 * 1024)
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(sl, 'NETWORK_SPEED_TEST_URL', f'http://127.0.0.1:{server.server_address[1]}/100mb.test')
+    monkeypatch.setattr(sl, 'NETWORK_LATENCY_TARGET', '127.0.0.1')
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_run_due_follows_each_probe_cadence():
+    clock = FakeClock()
+    calls, probes = counting_probes('fast', 'slow')
+    sampler = sl.TelemetrySampler(cadences={'fast': 1.0, 'slow': 3.0}, probes=probes,
+                                  clock=clock, blocking_probes=())
+
+    assert sorted(sampler.run_due()) == ['fast', 'slow']
+    clock.now = 0.5
+    assert sampler.run_due() == []
+    assert sampler.seconds_until_next() == pytest.approx(0.5)
+    clock.now = 1.0
+    assert sampler.run_due() == ['fast']
+    clock.now = 3.0
+    assert sorted(sampler.run_due()) == ['fast', 'slow']
+    assert calls == {'fast': 3, 'slow': 2}
+    assert sampler.snapshot() == {'fast': {'value': 3}, 'slow': {'value': 2}}
+    clock.now = 3.25
+    assert sampler.ages() == {'fast': 0.25, 'slow': 0.25}
+
+
+def test_failing_probe_keeps_previous_value():
+    clock = FakeClock()
+    results = iter([{'value': 1}, RuntimeError('probe down')])
+
+    def flaky():
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    sampler = sl.TelemetrySampler(cadences={'flaky': 1.0}, probes={'flaky': flaky},
+                                  clock=clock, blocking_probes=())
+    sampler.run_due()
+    clock.now = 1.0
+    sampler.run_due()
+    assert sampler.snapshot() == {'flaky': {'value': 1}}
+    assert sampler.sample_counts == {'flaky': 1}
+
+
+def test_blocking_probe_is_not_started_twice_while_in_flight():
+    clock = FakeClock()
+    release = threading.Event()
+    started = []
+
+    def slow_probe():
+        started.append(clock())
+        release.wait(5)
+        return {'speed': 1.0, 'latency': 1.0}
+
+    sampler = sl.TelemetrySampler(cadences={'network': 1.0}, probes={'network': slow_probe}, clock=clock)
+    assert sampler.run_due() == ['network']
+    clock.now = 2.0
+    assert sampler.run_due() == []
+    release.set()
+    deadline = time.monotonic() + 5
+    while not sampler.sample_counts['network'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert started == [0.0]
+    assert sampler.sample_counts['network'] == 1
+
+
+def test_network_speed_against_local_server(speed_test_server):
+    assert sl.get_network_speed() > 0
+
+
+def test_network_probe_runs_in_background_thread(speed_test_server):
+    sampler = sl.TelemetrySampler(cadences={'network': 300.0}, probes={'network': sl.probe_network},
+                                  clock=FakeClock())
+    assert sampler.run_due() == ['network']
+    deadline = time.monotonic() + 10
+    while 'network' not in sampler.snapshot() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert sampler.snapshot()['network']['speed'] > 0
+
+
+def test_scan_system_does_not_wait_for_blocking_probe(monkeypatch):
+    release = threading.Event()
+
+    def stalled_network():
+        release.wait(5)
+        return {'speed': 0.0, 'latency': -1.0}
+
+    sampler = sl.TelemetrySampler(probes={'cpu': lambda: {'usage': 12.5}, 'network': stalled_network})
+    monkeypatch.setattr(sl, 'telemetry_sampler', sampler)
+    try:
+        started = time.perf_counter()
+        report = sl.scan_system()
+        elapsed = time.perf_counter() - started
+        assert elapsed < 0.5
+        assert report['cpu'] == {'usage': 12.5}
+        assert report['network'] == {}
+    finally:
+        release.set()
+        sampler.stop()
+
+
+def test_in_loop_monitor_stays_running_until_last_cycle_finishes(monkeypatch):
+    cycle_threads = []
+
+    def fake_cycle():
+        cycle_threads.append(threading.current_thread())
+        time.sleep(0.1)
+
+    monkeypatch.setattr(sl, 'run_monitor_cycle', fake_cycle)
+    monkeypatch.setattr(sl, 'choose_monitor_interval', lambda: 0.01)
+    monkeypatch.setattr(sl, 'WARM_SNAPSHOT_INTERVAL', 3600)
+    runner = sl.RealtimeMonitorRunner()
+
+    async def scenario():
+        runner.start()
+        await asyncio.sleep(0.05)
+        task = runner.stop()
+        assert task is not None and runner.running
+        await task
+        assert not runner.running
+
+    asyncio.run(scenario())
+    assert cycle_threads and threading.main_thread() not in cycle_threads
+
+
+def test_int8_variant_round_trips_without_pickle(tmp_path, monkeypatch):
+    torch = pytest.importorskip('torch')
+
+    class Net(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.encoder = torch.nn.Sequential(torch.nn.Linear(16, 32), torch.nn.ReLU())
+            self.norm = torch.nn.LayerNorm(32)
+            self.head = torch.nn.Linear(32, 4, bias=False)
+
+        def forward(self, x):
+            return self.head(self.norm(self.encoder(x)))
+
+    monkeypatch.setattr(sl, 'VARIANT_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(sl, 'get_model_version', lambda name: '1.0')
+    monkeypatch.setattr(torch, 'load', None)  # أي محاولة لفك pickle تفشل
+    module = types.ModuleType('models.net_loader')
+    module.build_net = lambda performance_mode='balanced': Net()
+
+    quantized, converted = sl.convert_model_variant(Net().eval(), 'int8')
+    assert converted
+    sl.save_variant_artifact('net', 'int8', quantized, module)
+    assert sl.variant_cache_path('net', 'int8').endswith('.safetensors')
+
+    restored = sl.load_cached_variant('net', 'int8', module)
+    x = torch.randn(3, 16)
+    assert isinstance(restored.head, torch.ao.nn.quantized.dynamic.Linear)
+    assert torch.equal(restored(x), quantized(x))
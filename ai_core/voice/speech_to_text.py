@@ -1,12 +1,21 @@
 # speech_to_text.py
 import os
+import sys
 import platform
 import psutil
-import whisper
-import vosk
 import wave
 import json
 
+try:
+    from ai_core.lazy_imports import lazy_import
+except ImportError:  # تشغيل الملف مباشرة من داخل مجلده
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+    from ai_core.lazy_imports import lazy_import
+
+# محركات التعرف الثقيلة تُستورد فقط عند استخدام المحرك المختار
+whisper = lazy_import("whisper")
+vosk = lazy_import("vosk")
+
 def get_system_capability():
     try:
         ram_gb = psutil.virtual_memory().total / (1024 ** 3)
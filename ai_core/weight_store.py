@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ai_core/weight_store.py
+# مخزن أوزان بصيغة متوافقة مع safetensors - التحميل عبر mmap بدون نسخ
+# العمليات المتعددة على نفس الجهاز تتشارك صفحات الذاكرة نفسها من ذاكرة الملفات المؤقتة (page cache)
+
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    from ai_core.lazy_imports import lazy_import
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from ai_core.lazy_imports import lazy_import
+
+torch = lazy_import('torch')
+
+# الصيغة: طول الرأس (8 بايت little-endian) ثم رأس JSON ثم البيانات الخام
+# الرأس: {اسم_الموتر: {dtype, shape, data_offsets: [بداية, نهاية]}, "__metadata__": {...}}
+# كما تشترط safetensors: المدى متصل بلا فجوات ولا تداخل ويغطي البيانات كلها
+_HEADER_LEN = struct.Struct('<Q')
+DATA_ALIGNMENT = 64  # محاذاة بداية البيانات (الحشو بمسافات في الرأس فقط)
+# الأوزان المربوطة تُكتب مرة واحدة، والأسماء الأخرى تُحفظ في __metadata__ كـ {الاسم: الاسم_المخزن}
+TIED_METADATA_KEY = '__tied__'
+
+# أسماء الأنواع كما في safetensors حتى تبقى الملفات قابلة للقراءة بأدواتها
+_DTYPE_NAMES = {
+    'float64': 'F64', 'float32': 'F32', 'float16': 'F16', 'bfloat16': 'BF16',
+    'int64': 'I64', 'int32': 'I32', 'int16': 'I16', 'int8': 'I8', 'uint8': 'U8', 'bool': 'BOOL'
+}
+
+
+def _torch_dtype(code: str) -> Any:
+    for name, dtype_code in _DTYPE_NAMES.items():
+        if dtype_code == code:
+            return getattr(torch, name)
+    raise ValueError(f"Unsupported dtype in weight file: {code}")
+
+
+def _align(offset: int) -> int:
+    return (offset + DATA_ALIGNMENT - 1) // DATA_ALIGNMENT * DATA_ALIGNMENT
+
+
+def save_weights(path: str, state_dict: Dict[str, Any], metadata: Optional[Dict[str, str]] = None) -> int:
+    """
+    حفظ state_dict بصيغة safetensors قابلة للتحميل عبر mmap (كتابة ذرية).
+    الموترات مرتبة حسب حجم العنصر تنازلياً فيبقى كل موتر محاذياً لنوعه دون حشو بين الموترات.
+    الموترات المشتركة (أوزان مربوطة) تُكتب مرة واحدة وتُسجل بقية أسمائها في __metadata__.
+    تُرجع حجم الملف بالبايت.
+    """
+    header: Dict[str, Any] = {'__metadata__': {key: str(value) for key, value in (metadata or {}).items()}}
+    tensors = []
+    tied: Dict[str, str] = {}
+    seen: Dict[Tuple, str] = {}
+    for key, tensor in state_dict.items():
+        if not isinstance(tensor, torch.Tensor) or tensor.is_quantized:
+            raise ValueError(f"'{key}' is not a plain tensor and cannot be stored")
+        dtype_name = str(tensor.dtype).replace('torch.', '')
+        if dtype_name not in _DTYPE_NAMES:
+            raise ValueError(f"'{key}' has unsupported dtype {tensor.dtype}")
+        identity = (tensor.data_ptr(), tensor.dtype, tuple(tensor.shape), tensor.stride())
+        if tensor.numel() and identity in seen:
+            tied[key] = seen[identity]
+            continue
+        seen[identity] = key
+        tensors.append((key, dtype_name, tensor))
+    if tied:
+        header['__metadata__'][TIED_METADATA_KEY] = json.dumps(tied, separators=(',', ':'))
+
+    blobs = []
+    offset = 0
+    for key, dtype_name, tensor in sorted(tensors, key=lambda item: -item[2].element_size()):
+        data = tensor.detach().cpu().contiguous().reshape(-1).view(torch.uint8).numpy().tobytes()
+        header[key] = {'dtype': _DTYPE_NAMES[dtype_name], 'shape': list(tensor.shape),
+                       'data_offsets': [offset, offset + len(data)]}
+        blobs.append(data)
+        offset += len(data)
+
+    # حشو الرأس بمسافات حتى تبدأ البيانات على حد المحاذاة (تسمح به safetensors)
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    header_bytes += b' ' * (_align(_HEADER_LEN.size + len(header_bytes)) - _HEADER_LEN.size - len(header_bytes))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER_LEN.pack(len(header_bytes)))
+        f.write(header_bytes)
+        for data in blobs:
+            f.write(data)
+        size = f.tell()
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return size
+
+
+def read_header(path: str) -> Dict[str, Any]:
+    """قراءة رأس الملف فقط (الأسماء والأنواع والأشكال) دون لمس البيانات"""
+    with open(path, 'rb') as f:
+        (length,) = _HEADER_LEN.unpack(f.read(_HEADER_LEN.size))
+        return json.loads(f.read(length))
+
+
+def load_weights(path: str) -> Dict[str, Any]:
+    """
+    تحميل الأوزان كموترات تشير مباشرة إلى ملف مربوط بالذاكرة (بدون نسخ).
+    الربط بوضع ACCESS_COPY: الصفحات مشتركة بين العمليات ما لم تُعدَّل (نسخ عند الكتابة).
+    """
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    (length,) = _HEADER_LEN.unpack_from(mapped, 0)
+    header = json.loads(mapped[_HEADER_LEN.size:_HEADER_LEN.size + length])
+    data_start = _HEADER_LEN.size + length
+
+    tensors = {}
+    for key, info in header.items():
+        if key == '__metadata__':
+            continue
+        dtype = _torch_dtype(info['dtype'])
+        start, end = info['data_offsets']
+        if end == start:
+            tensors[key] = torch.empty(info['shape'], dtype=dtype)
+            continue
+        tensors[key] = torch.frombuffer(mapped, dtype=dtype, count=(end - start) // dtype.itemsize,
+                                        offset=data_start + start).view(info['shape'])
+    # الأسماء المربوطة تحصل على نفس الموتر (تبقى الأوزان مربوطة)
+    tied = json.loads(header.get('__metadata__', {}).get(TIED_METADATA_KEY, '{}'))
+    for alias, source in tied.items():
+        tensors[alias] = tensors[source]
+    return tensors
+
+
+# ===== قياس الذاكرة المشتركة بين العمليات =====
+def _memory_footprint() -> Dict[str, float]:
+    """الذاكرة المقيمة (RSS) والحصة التناسبية (PSS) للعملية الحالية بالميجابايت"""
+    usage = {'rss_mb': 0.0, 'pss_mb': 0.0}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                field_name, value = line.split(':', 1)
+                if field_name in ('Rss', 'Pss'):
+                    usage[f"{field_name.lower()}_mb"] = int(value.split()[0]) / 1024
+    except OSError:
+        import psutil
+        usage['rss_mb'] = usage['pss_mb'] = psutil.Process().memory_info().rss / 1024 ** 2
+    return usage
+
+
+def _benchmark_worker(path: str, mode: str, barrier: Any, results: Any) -> None:
+    torch.zeros(1)  # استيراد torch خارج القياس
+    baseline = _memory_footprint()
+    start = time.perf_counter()
+    if mode == 'mmap':
+        weights = load_weights(path)
+    else:
+        weights = torch.load(path, map_location='cpu')
+    checksum = sum(float(t.sum()) for t in weights.values())  # لمس كل الصفحات
+    elapsed = time.perf_counter() - start
+    barrier.wait()  # القياس بينما كل العمليات حية حتى تظهر المشاركة في PSS
+    usage = _memory_footprint()
+    results.put({'load_time': elapsed, 'checksum': checksum,
+                 **{key: usage[key] - baseline[key] for key in usage}})
+    barrier.wait()
+
+
+def benchmark_shared_weights(processes: int = 4, size_mb: int = 256, workdir: str = '.') -> Dict[str, Any]:
+    """
+    مقارنة الذاكرة وزمن التحميل لعملية واحدة مقابل N عمليات: torch.load (نسخة لكل عملية) مقابل mmap.
+    الذاكرة المُبلّغ عنها هي الزيادة بعد تحميل الأوزان فقط (بدون ذاكرة torch نفسها).
+    """
+    import multiprocessing
+
+    numel = size_mb * 1024 ** 2 // 4
+    state_dict = {f"layer{i}.weight": torch.randn(numel // 8) for i in range(8)}
+    files = {'copy': os.path.join(workdir, 'bench_weights.pt'),
+             'mmap': os.path.join(workdir, 'bench_weights.safetensors')}
+    torch.save(state_dict, files['copy'])
+    save_weights(files['mmap'], state_dict)
+    del state_dict
+
+    ctx = multiprocessing.get_context('spawn')
+    report: Dict[str, Any] = {'size_mb': size_mb, 'runs': []}
+    try:
+        for mode in ('copy', 'mmap'):
+            for count in sorted({1, processes}):
+                barrier, results = ctx.Barrier(count), ctx.Queue()
+                workers = [ctx.Process(target=_benchmark_worker, args=(files[mode], mode, barrier, results))
+                           for _ in range(count)]
+                for w in workers:
+                    w.start()
+                samples = [results.get() for _ in workers]
+                for w in workers:
+                    w.join()
+                report['runs'].append({
+                    'mode': mode,
+                    'processes': count,
+                    'avg_load_time': round(sum(s['load_time'] for s in samples) / count, 4),
+                    'total_rss_mb': round(sum(s['rss_mb'] for s in samples), 1),
+                    'total_pss_mb': round(sum(s['pss_mb'] for s in samples), 1)
+                })
+    finally:
+        for path in files.values():
+            if os.path.exists(path):
+                os.remove(path)
+    return report
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+    result = benchmark_shared_weights(processes=n, size_mb=size)
+    print(f"\n📦 Shared weight benchmark ({result['size_mb']} MB of weights)")
+    print(f"{'mode':>6} {'procs':>6} {'load (s)':>10} {'RSS added (MB)':>16} {'PSS added (MB)':>16}")
+    for run in result['runs']:
+        print(f"{run['mode']:>6} {run['processes']:>6} {run['avg_load_time']:>10.3f} "
+              f"{run['total_rss_mb']:>16.1f} {run['total_pss_mb']:>16.1f}")